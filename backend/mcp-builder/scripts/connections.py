@@ -1,13 +1,21 @@
 """Lightweight connection handling for MCP servers."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from contextlib import AsyncExitStack
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import timedelta
 from typing import Any
 
+import anyio
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, CallToolResult
+
+DEFAULT_CALL_TIMEOUT = 300.0
 
 
 class MCPConnection(ABC):
@@ -16,6 +24,8 @@ class MCPConnection(ABC):
     def __init__(self):
         self.session = None
         self._stack = None
+        # Upper bound for one tool call, so a call left on a dead session fails instead of hanging.
+        self.call_timeout: float | None = DEFAULT_CALL_TIMEOUT
 
     @abstractmethod
     def _create_context(self):
@@ -66,9 +76,14 @@ class MCPConnection(ABC):
 
     async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
         """Call a tool on the MCP server with provided arguments."""
-        result = await self.session.call_tool(tool_name, arguments=arguments)
+        result = await self.call_tool_result(tool_name, arguments)
         return result.content
 
+    async def call_tool_result(self, tool_name: str, arguments: dict[str, Any]) -> CallToolResult:
+        """Call a tool and return the full result, including its `isError` flag."""
+        timeout = timedelta(seconds=self.call_timeout) if self.call_timeout else None
+        return await self.session.call_tool(tool_name, arguments=arguments, read_timeout_seconds=timeout)
+
 
 class MCPConnectionStdio(MCPConnection):
     """MCP connection using standard input/output."""
@@ -116,6 +131,7 @@ def create_connection(
     env: dict[str, str] = None,
     url: str = None,
     headers: dict[str, str] = None,
+    call_timeout: float | None = DEFAULT_CALL_TIMEOUT,
 ) -> MCPConnection:
     """Factory function to create the appropriate MCP connection.
 
@@ -126,6 +142,7 @@ def create_connection(
         env: Environment variables (stdio only)
         url: Server URL (sse and http only)
         headers: HTTP headers (sse and http only)
+        call_timeout: Seconds before a tool call fails (None waits forever)
 
     Returns:
         MCPConnection instance
@@ -135,17 +152,234 @@ def create_connection(
     if transport == "stdio":
         if not command:
             raise ValueError("Command is required for stdio transport")
-        return MCPConnectionStdio(command=command, args=args, env=env)
+        connection = MCPConnectionStdio(command=command, args=args, env=env)
 
     elif transport == "sse":
         if not url:
             raise ValueError("URL is required for sse transport")
-        return MCPConnectionSSE(url=url, headers=headers)
+        connection = MCPConnectionSSE(url=url, headers=headers)
 
     elif transport in ["http", "streamable_http", "streamable-http"]:
         if not url:
             raise ValueError("URL is required for http transport")
-        return MCPConnectionHTTP(url=url, headers=headers)
+        connection = MCPConnectionHTTP(url=url, headers=headers)
 
     else:
         raise ValueError(f"Unsupported transport type: {transport}. Use 'stdio', 'sse', or 'http'")
+
+    connection.call_timeout = call_timeout
+    return connection
+
+
+def _is_closed_error(error: BaseException) -> bool:
+    """Whether `error` means the transport is gone (as opposed to a slow or failing request)."""
+    if isinstance(error, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)):
+        return True
+    return isinstance(error, McpError) and error.error.code == CONNECTION_CLOSED
+
+
+class _PooledConnection:
+    """One opened connection and the task that owns its lifetime."""
+
+    def __init__(self):
+        self.connection: MCPConnection | None = None
+        self.error: BaseException | None = None
+        self.task: asyncio.Task | None = None
+        self.ready = asyncio.Event()
+        self.stop = asyncio.Event()
+        self.users = 0
+        self.retired = False
+
+
+class _PoolSlot:
+    """A pool position: the connection new checkouts get, replaced when it dies."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.current: _PooledConnection | None = None
+        self.lock = asyncio.Lock()
+        self.users = 0
+        self.reconnects = 0
+
+
+class MCPConnectionPool:
+    """A fixed-size pool of independent connections to the same MCP server.
+
+    Each slot is a separate session: a separate subprocess for stdio, a
+    separate HTTP/SSE session otherwise. `acquire()` hands out the least busy
+    slot after a health check. A connection is only replaced when its
+    transport is actually dead (its owner task ended or a ping reports the
+    connection closed); a ping that merely times out means the server is
+    busy, so the connection is kept. A replaced connection keeps serving the
+    tasks still holding it and is closed once the last of them releases it,
+    so one crashed server process does not take the whole run down.
+
+    Every connection is entered and exited by a dedicated owner task, because
+    the underlying transport contexts must be closed by the task that opened
+    them.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], MCPConnection],
+        size: int = 1,
+        connect_timeout: float = 30.0,
+        ping_timeout: float = 5.0,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self.ping_timeout = ping_timeout
+        self._slots: list[_PoolSlot] = []
+        self._retired: set[_PooledConnection] = set()
+
+    @property
+    def reconnects(self) -> int:
+        """Number of times a slot had to be reconnected."""
+        return sum(slot.reconnects for slot in self._slots)
+
+    async def __aenter__(self):
+        """Start all connections concurrently."""
+        self._slots = [_PoolSlot(i) for i in range(self.size)]
+        results = await asyncio.gather(*(self._open_slot(slot) for slot in self._slots), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            await self._close_all()
+            raise errors[0]
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close all connections."""
+        await self._close_all()
+
+    async def _hold(self, pooled: _PooledConnection) -> None:
+        try:
+            async with self.factory() as connection:
+                pooled.connection = connection
+                pooled.ready.set()
+                await pooled.stop.wait()
+        except Exception as e:
+            pooled.error = e
+        finally:
+            pooled.connection = None
+            pooled.ready.set()
+
+    async def _open(self, index: int) -> _PooledConnection:
+        pooled = _PooledConnection()
+        pooled.task = asyncio.create_task(self._hold(pooled))
+        try:
+            await asyncio.wait_for(pooled.ready.wait(), self.connect_timeout)
+        except asyncio.TimeoutError:
+            await self._close(pooled)
+            raise ConnectionError(f"Connection {index} timed out after {self.connect_timeout}s")
+        if pooled.connection is None:
+            await self._close(pooled)
+            raise ConnectionError(f"Connection {index} failed: {pooled.error}") from pooled.error
+        return pooled
+
+    async def _open_slot(self, slot: _PoolSlot) -> None:
+        slot.current = await self._open(slot.index)
+
+    async def _close(self, pooled: _PooledConnection) -> None:
+        task, pooled.task = pooled.task, None
+        self._retired.discard(pooled)
+        if task is None:
+            return
+        pooled.stop.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(task), self.connect_timeout)
+        except Exception:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        pooled.connection = None
+
+    async def _retire(self, pooled: _PooledConnection) -> None:
+        """Stop handing out `pooled`; close it now if unused, else when its last user releases it."""
+        pooled.retired = True
+        if pooled.users == 0:
+            await self._close(pooled)
+        else:
+            self._retired.add(pooled)
+
+    async def _close_all(self) -> None:
+        pooled = [slot.current for slot in self._slots if slot.current is not None] + list(self._retired)
+        for slot in self._slots:
+            slot.current = None
+        await asyncio.gather(*(self._close(p) for p in pooled))
+
+    async def _is_dead(self, pooled: _PooledConnection) -> bool:
+        if pooled.connection is None or pooled.task is None or pooled.task.done():
+            return True
+        try:
+            await asyncio.wait_for(pooled.connection.session.send_ping(), self.ping_timeout)
+        except asyncio.TimeoutError:
+            return False  # busy (e.g. a long synchronous tool), not dead
+        except Exception as e:
+            return _is_closed_error(e)
+        return False
+
+    async def _checkout(self, slot: _PoolSlot) -> _PooledConnection:
+        async with slot.lock:
+            pooled = slot.current
+            if pooled is None or await self._is_dead(pooled):
+                if pooled is not None:
+                    slot.current = None
+                    await self._retire(pooled)
+                slot.reconnects += 1
+                pooled = slot.current = await self._open(slot.index)
+            pooled.users += 1
+            return pooled
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[MCPConnection]:
+        """Check out the least busy healthy connection for the duration of the block."""
+        slot = min(self._slots, key=lambda s: s.users)
+        slot.users += 1
+        try:
+            pooled = await self._checkout(slot)
+            try:
+                yield pooled.connection
+            finally:
+                pooled.users -= 1
+                if pooled.retired and pooled.users == 0:
+                    await self._close(pooled)
+        finally:
+            slot.users -= 1
+
+    async def list_tools(self) -> list[dict[str, Any]]:
+        """Retrieve available tools from the MCP server."""
+        async with self.acquire() as connection:
+            return await connection.list_tools()
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
+        """Call a tool on any pooled connection."""
+        async with self.acquire() as connection:
+            return await connection.call_tool(tool_name, arguments)
+
+    async def call_tool_result(self, tool_name: str, arguments: dict[str, Any]) -> CallToolResult:
+        """Call a tool on any pooled connection and return the full result."""
+        async with self.acquire() as connection:
+            return await connection.call_tool_result(tool_name, arguments)
+
+
+def create_connection_pool(
+    size: int,
+    transport: str,
+    command: str = None,
+    args: list[str] = None,
+    env: dict[str, str] = None,
+    url: str = None,
+    headers: dict[str, str] = None,
+    call_timeout: float | None = DEFAULT_CALL_TIMEOUT,
+) -> MCPConnectionPool:
+    """Factory function to create a pool of `size` connections to one MCP server.
+
+    Arguments are the same as `create_connection` and are validated up front.
+    """
+    options = dict(
+        transport=transport, command=command, args=args, env=env, url=url, headers=headers, call_timeout=call_timeout
+    )
+    create_connection(**options)
+    return MCPConnectionPool(lambda: create_connection(**options), size=size)
@@ -6,17 +6,21 @@ This script evaluates MCP servers by running test questions against them using C
 import argparse
 import asyncio
 import json
+import math
 import re
 import sys
 import time
 import traceback
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
 from anthropic import Anthropic
 
-from connections import create_connection
+from connections import MCPConnectionPool, create_connection_pool
 
 EVALUATION_PROMPT = """You are an AI assistant with access to tools.
 
@@ -53,29 +57,66 @@ Response Requirements:
 - Your response should go last"""
 
 
-def parse_evaluation_file(file_path: Path) -> list[dict[str, Any]]:
-    """Parse XML evaluation file with qa_pair elements."""
-    try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        evaluations = []
-
-        for qa_pair in root.findall(".//qa_pair"):
-            question_elem = qa_pair.find("question")
-            answer_elem = qa_pair.find("answer")
-
-            if question_elem is not None and answer_elem is not None:
-                evaluations.append({
+def iter_evaluation_file(
+    file_path: Path,
+    shard: tuple[int, int] | None = None,
+) -> Iterator[tuple[int, dict[str, str]]]:
+    """Stream (index, qa_pair) from an XML evaluation file.
+
+    The file is read with iterparse and each qa_pair element is dropped from
+    the tree once yielded, so memory stays flat however many pairs the file
+    holds. `index` counts valid pairs in file order. With `shard=(i, n)`, only
+    pairs whose index is congruent to i - 1 modulo n are yielded.
+
+    Parse errors are raised, not swallowed: pairs before a malformed or
+    truncated section may already have been yielded, so callers must treat
+    the error as a failed run.
+    """
+    stack = []
+    index = 0
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag != "qa_pair":
+            continue
+
+        question_elem = elem.find("question")
+        answer_elem = elem.find("answer")
+        if question_elem is not None and answer_elem is not None:
+            if shard is None or index % shard[1] == shard[0] - 1:
+                yield index, {
                     "question": (question_elem.text or "").strip(),
                     "answer": (answer_elem.text or "").strip(),
-                })
+                }
+            index += 1
+
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
 
-        return evaluations
+
+def parse_evaluation_file(file_path: Path) -> list[dict[str, Any]]:
+    """Parse XML evaluation file with qa_pair elements."""
+    try:
+        return [qa_pair for _, qa_pair in iter_evaluation_file(file_path)]
     except Exception as e:
         print(f"Error parsing evaluation file {file_path}: {e}")
         return []
 
 
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse an `i/n` shard spec (1 <= i <= n)."""
+    try:
+        i, n = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/n, got {value!r}")
+    if not 1 <= i <= n:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {n}, got {i}")
+    return i, n
+
+
 def extract_xml_content(text: str, tag: str) -> str | None:
     """Extract content from XML tags."""
     pattern = rf"<{tag}>(.*?)</{tag}>"
@@ -83,16 +124,109 @@ def extract_xml_content(text: str, tag: str) -> str | None:
     return matches[-1].strip() if matches else None
 
 
-async def agent_loop(
+def _content_to_json(value: Any) -> Any:
+    """JSON fallback for MCP content blocks (pydantic models)."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    return str(value)
+
+
+async def execute_tool(connection: Any, tool_name: str, tool_input: dict[str, Any]) -> tuple[str, float, bool]:
+    """Call one MCP tool and return (response text, duration in seconds, whether it errored)."""
+    tool_start_ts = time.perf_counter()
+    try:
+        result = await connection.call_tool_result(tool_name, tool_input)
+        tool_result = result.content
+        tool_response = json.dumps(tool_result, default=_content_to_json) if isinstance(tool_result, (dict, list)) else str(tool_result)
+        is_error = bool(result.isError)
+    except Exception as e:
+        tool_response = f"Error executing tool {tool_name}: {str(e)}\n"
+        tool_response += traceback.format_exc()
+        is_error = True
+    return tool_response, time.perf_counter() - tool_start_ts, is_error
+
+
+class ToolResultCache:
+    """Per-run LRU cache of results from tools known to be idempotent.
+
+    Entries are keyed on (tool name, canonical JSON of the arguments) and hold
+    futures, so identical calls that are in flight at the same time share one
+    server call. Error results are never kept.
+    """
+
+    def __init__(self, tool_names: list[str], max_entries: int = 1024):
+        self.tool_names = set(tool_names)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], asyncio.Future] = OrderedDict()
+
+    def covers(self, tool_name: str) -> bool:
+        return tool_name in self.tool_names
+
+    @staticmethod
+    def key(tool_name: str, tool_input: dict[str, Any]) -> tuple[str, str]:
+        return tool_name, json.dumps(tool_input, sort_keys=True, separators=(",", ":"), default=str)
+
+    async def execute(
+        self, connection: Any, tool_name: str, tool_input: dict[str, Any]
+    ) -> tuple[str, float, bool, bool]:
+        """Like `execute_tool`, plus whether the result came from the cache."""
+        key = self.key(tool_name, tool_input)
+        future = self._entries.get(key)
+        if future is not None:
+            self._entries.move_to_end(key)
+            try:
+                tool_response, _, is_error = await asyncio.shield(future)
+                return tool_response, 0.0, is_error, True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = future
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        try:
+            outcome = await execute_tool(connection, tool_name, tool_input)
+        except BaseException:
+            self._discard(key, future)
+            future.cancel()
+            raise
+        future.set_result(outcome)
+        if outcome[2]:
+            self._discard(key, future)
+        return (*outcome, False)
+
+    def _discard(self, key: tuple[str, str], future: asyncio.Future) -> None:
+        if self._entries.get(key) is future:
+            del self._entries[key]
+
+
+TOKEN_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+
+def _usage_dict(response: Any) -> dict[str, int] | None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return {field: getattr(usage, field, None) or 0 for field in TOKEN_FIELDS}
+
+
+def _prompt_tokens(usage: dict[str, int] | None) -> int | None:
+    """All input tokens of a request, whether or not they were served from the prompt cache."""
+    if usage is None:
+        return None
+    return usage["input_tokens"] + usage["cache_creation_input_tokens"] + usage["cache_read_input_tokens"]
+
+
+async def create_message(
     client: Anthropic,
     model: str,
-    question: str,
+    messages: list[dict[str, Any]],
     tools: list[dict[str, Any]],
-    connection: Any,
-) -> tuple[str, dict[str, Any]]:
-    """Run the agent loop with MCP tools."""
-    messages = [{"role": "user", "content": question}]
-
+    model_metrics: dict[str, Any],
+) -> Any:
+    """Send one model request and record its round-trip time and token usage in `model_metrics`."""
+    start_ts = time.perf_counter()
     response = await asyncio.to_thread(
         client.messages.create,
         model=model,
@@ -101,54 +235,147 @@ async def agent_loop(
         messages=messages,
         tools=tools,
     )
+    model_metrics["count"] += 1
+    model_metrics["durations"].append(time.perf_counter() - start_ts)
+    for field, value in (_usage_dict(response) or {}).items():
+        model_metrics[field] += value
+    return response
+
+
+async def agent_loop(
+    client: Anthropic,
+    model: str,
+    question: str,
+    tools: list[dict[str, Any]],
+    connection: Any,
+    cache: ToolResultCache | None = None,
+    transcript: list[dict[str, Any]] | None = None,
+) -> tuple[str, dict[str, Any], dict[str, Any]]:
+    """Run the agent loop with MCP tools.
+
+    All tool_use blocks of a model turn are executed concurrently and their
+    tool_result blocks are returned together in a single user message. Calls
+    to tools covered by `cache` may be answered from it; those count towards
+    `cache_hits` but add no duration.
+
+    When `transcript` is given, every model request and response and every
+    tool call (arguments, result and timing) is appended to it as a record.
+
+    Tool result sizes are tracked per tool. Their token cost is estimated from
+    how much each request's input grew, split across the previous turn's
+    results by byte size (`result_tokens`); `context_tokens` also counts each
+    later request that carried those results again.
+
+    Returns the final response text, per-tool metrics and model metrics.
+    """
+    messages = [{"role": "user", "content": question}]
+    model_metrics = {"count": 0, "durations": [], **{field: 0 for field in TOKEN_FIELDS}}
+    turn = 0
+    carried_tokens: dict[str, int] = {}
+
+    def record(record_type: str, **fields: Any) -> None:
+        if transcript is not None:
+            transcript.append({"type": record_type, "turn": turn, **fields})
+
+    def record_response(response: Any) -> None:
+        record(
+            "model_response",
+            stop_reason=response.stop_reason,
+            content=[_content_to_json(block) for block in response.content],
+            usage=_usage_dict(response),
+            duration=model_metrics["durations"][-1],
+        )
+
+    def account_tokens(previous: Any, response: Any, turn_results: list[tuple[str, int]]) -> None:
+        previous_usage, usage = _usage_dict(previous), _usage_dict(response)
+        total_bytes = sum(size for _, size in turn_results)
+        if previous_usage and usage:
+            added = _prompt_tokens(usage) - _prompt_tokens(previous_usage) - previous_usage["output_tokens"]
+            added = max(0, added)
+        else:
+            added = total_bytes // 4
+        for name, size in turn_results:
+            tokens = round(added * size / total_bytes) if total_bytes else 0
+            tool_metrics[name]["result_tokens"] += tokens
+            carried_tokens[name] = carried_tokens.get(name, 0) + tokens
+        for name, tokens in carried_tokens.items():
+            tool_metrics[name]["context_tokens"] += tokens
+
+    record("model_request", model=model, system=EVALUATION_PROMPT, messages=messages[:])
+    response = await create_message(client, model, messages, tools, model_metrics)
+    record_response(response)
 
     messages.append({"role": "assistant", "content": response.content})
 
     tool_metrics = {}
 
-    while response.stop_reason == "tool_use":
-        tool_use = next(block for block in response.content if block.type == "tool_use")
-        tool_name = tool_use.name
-        tool_input = tool_use.input
+    async def run_tool(tool_use: Any) -> tuple[str, float, bool, bool]:
+        if cache is not None and cache.covers(tool_use.name):
+            return await cache.execute(connection, tool_use.name, tool_use.input)
+        return (*await execute_tool(connection, tool_use.name, tool_use.input), False)
 
-        tool_start_ts = time.time()
-        try:
-            tool_result = await connection.call_tool(tool_name, tool_input)
-            tool_response = json.dumps(tool_result) if isinstance(tool_result, (dict, list)) else str(tool_result)
-        except Exception as e:
-            tool_response = f"Error executing tool {tool_name}: {str(e)}\n"
-            tool_response += traceback.format_exc()
-        tool_duration = time.time() - tool_start_ts
-
-        if tool_name not in tool_metrics:
-            tool_metrics[tool_name] = {"count": 0, "durations": []}
-        tool_metrics[tool_name]["count"] += 1
-        tool_metrics[tool_name]["durations"].append(tool_duration)
-
-        messages.append({
-            "role": "user",
-            "content": [{
+    while response.stop_reason == "tool_use":
+        tool_uses = [block for block in response.content if block.type == "tool_use"]
+        outcomes = await asyncio.gather(*(run_tool(tool_use) for tool_use in tool_uses))
+
+        tool_results = []
+        turn_results = []
+        for tool_use, (tool_response, tool_duration, is_error, cached) in zip(tool_uses, outcomes):
+            if tool_use.name not in tool_metrics:
+                tool_metrics[tool_use.name] = {
+                    "count": 0,
+                    "errors": 0,
+                    "cache_hits": 0,
+                    "durations": [],
+                    "result_bytes": 0,
+                    "max_result_bytes": 0,
+                    "result_tokens": 0,
+                    "context_tokens": 0,
+                }
+            result_bytes = len(tool_response.encode("utf-8"))
+            tool_metrics[tool_use.name]["count"] += 1
+            tool_metrics[tool_use.name]["result_bytes"] += result_bytes
+            tool_metrics[tool_use.name]["max_result_bytes"] = max(
+                tool_metrics[tool_use.name]["max_result_bytes"], result_bytes
+            )
+            turn_results.append((tool_use.name, result_bytes))
+            tool_metrics[tool_use.name]["errors"] += int(is_error)
+            if cached:
+                tool_metrics[tool_use.name]["cache_hits"] += 1
+            else:
+                tool_metrics[tool_use.name]["durations"].append(tool_duration)
+            record(
+                "tool_call",
+                tool_use_id=tool_use.id,
+                tool=tool_use.name,
+                arguments=tool_use.input,
+                result=tool_response,
+                is_error=is_error,
+                duration=tool_duration,
+                cached=cached,
+            )
+
+            tool_results.append({
                 "type": "tool_result",
                 "tool_use_id": tool_use.id,
                 "content": tool_response,
-            }]
-        })
-
-        response = await asyncio.to_thread(
-            client.messages.create,
-            model=model,
-            max_tokens=4096,
-            system=EVALUATION_PROMPT,
-            messages=messages,
-            tools=tools,
-        )
+            })
+
+        messages.append({"role": "user", "content": tool_results})
+
+        turn += 1
+        record("model_request", tool_results=[result["tool_use_id"] for result in tool_results])
+        previous = response
+        response = await create_message(client, model, messages, tools, model_metrics)
+        account_tokens(previous, response, turn_results)
+        record_response(response)
         messages.append({"role": "assistant", "content": response.content})
 
     response_text = next(
         (block.text for block in response.content if hasattr(block, "text")),
         None,
     )
-    return response_text, tool_metrics
+    return response_text, tool_metrics, model_metrics
 
 
 async def evaluate_single_task(
@@ -158,32 +385,253 @@ async def evaluate_single_task(
     tools: list[dict[str, Any]],
     connection: Any,
     task_index: int,
+    cache: ToolResultCache | None = None,
+    transcript_path: Path | None = None,
 ) -> dict[str, Any]:
-    """Evaluate a single QA pair with the given tools."""
+    """Evaluate a single QA pair with the given tools.
+
+    With `transcript_path`, the task's full transcript is written there as JSONL.
+    """
     start_time = time.time()
+    transcript = [] if transcript_path else None
 
     print(f"Task {task_index + 1}: Running task with question: {qa_pair['question']}")
-    response, tool_metrics = await agent_loop(client, model, qa_pair["question"], tools, connection)
+    response, tool_metrics, model_metrics = await agent_loop(
+        client, model, qa_pair["question"], tools, connection, cache, transcript
+    )
 
     response_value = extract_xml_content(response, "response")
     summary = extract_xml_content(response, "summary")
     feedback = extract_xml_content(response, "feedback")
 
     duration_seconds = time.time() - start_time
+    score = int(response_value == qa_pair["answer"]) if response_value else 0
+
+    if transcript_path:
+        records = [
+            {"type": "task", "task": task_index + 1, "question": qa_pair["question"], "expected": qa_pair["answer"]},
+            *transcript,
+            {"type": "result", "actual": response_value, "score": score, "total_duration": duration_seconds},
+        ]
+        transcript_path.write_text(
+            "".join(json.dumps(r, default=_content_to_json, ensure_ascii=False) + "\n" for r in records),
+            encoding="utf-8",
+        )
 
     return {
+        "task": task_index + 1,
         "question": qa_pair["question"],
         "expected": qa_pair["answer"],
         "actual": response_value,
-        "score": int(response_value == qa_pair["answer"]) if response_value else 0,
+        "score": score,
         "total_duration": duration_seconds,
         "tool_calls": tool_metrics,
-        "num_tool_calls": sum(len(metrics["durations"]) for metrics in tool_metrics.values()),
+        "num_tool_calls": sum(metrics["count"] for metrics in tool_metrics.values()),
+        "model_calls": model_metrics,
         "summary": summary,
         "feedback": feedback,
     }
 
 
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of `values` (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_stats(durations: list[float]) -> dict[str, Any]:
+    """Count, mean, p50/p90/p99 and max of a list of durations in seconds."""
+    return {
+        "count": len(durations),
+        "mean": sum(durations) / len(durations) if durations else None,
+        "p50": percentile(durations, 50),
+        "p90": percentile(durations, 90),
+        "p99": percentile(durations, 99),
+        "max": max(durations) if durations else None,
+    }
+
+
+def aggregate_metrics(
+    results: list[dict[str, Any]],
+    cache: ToolResultCache | None = None,
+    context_share: float = 0.25,
+) -> dict[str, Any]:
+    """Aggregate per-task metrics into run-wide latency, token and per-tool statistics.
+
+    Tools whose results account for at least `context_share` of all input
+    tokens of the run are flagged as dominating context.
+    """
+    tool_durations: dict[str, list[float]] = {}
+    tool_counters: dict[str, dict[str, int]] = {}
+    for result in results:
+        for name, metrics in result["tool_calls"].items():
+            tool_durations.setdefault(name, []).extend(metrics["durations"])
+            counters = tool_counters.setdefault(name, {
+                "calls": 0,
+                "errors": 0,
+                "cache_hits": 0,
+                "result_bytes": 0,
+                "max_result_bytes": 0,
+                "result_tokens": 0,
+                "context_tokens": 0,
+            })
+            counters["calls"] += metrics["count"]
+            for counter in ("errors", "cache_hits", "result_bytes", "result_tokens", "context_tokens"):
+                counters[counter] += metrics.get(counter, 0)
+            counters["max_result_bytes"] = max(counters["max_result_bytes"], metrics.get("max_result_bytes", 0))
+
+    # "count" and the percentiles cover calls that reached the server; "calls"
+    # also includes those answered from the tool result cache.
+    tools = {}
+    for name in sorted(tool_durations):
+        stats = latency_stats(tool_durations[name])
+        stats.update(tool_counters[name])
+        stats["error_rate"] = stats["errors"] / stats["calls"] if stats["calls"] else 0.0
+        tools[name] = stats
+
+    tokens = {field: sum(r["model_calls"].get(field, 0) for r in results) for field in TOKEN_FIELDS}
+    prompt_tokens = _prompt_tokens(tokens)
+    for stats in tools.values():
+        stats["mean_result_bytes"] = stats["result_bytes"] / stats["calls"] if stats["calls"] else 0.0
+        stats["context_share"] = stats["context_tokens"] / prompt_tokens if prompt_tokens else 0.0
+        stats["dominates_context"] = stats["context_share"] >= context_share
+
+    correct = sum(r["score"] for r in results)
+    metrics = {
+        "tasks": len(results),
+        "correct": correct,
+        "accuracy": correct / len(results) if results else 0.0,
+        "task_duration": latency_stats([r["total_duration"] for r in results]),
+        "model_latency": latency_stats([d for r in results for d in r["model_calls"]["durations"]]),
+        "tool_latency": latency_stats([d for durations in tool_durations.values() for d in durations]),
+        "tools": tools,
+        "tokens": {
+            **tokens,
+            "prompt_tokens": prompt_tokens,
+            "mean_input_per_task": prompt_tokens / len(results) if results else 0.0,
+            "mean_output_per_task": tokens["output_tokens"] / len(results) if results else 0.0,
+            "context_share_threshold": context_share,
+            "context_dominating_tools": [name for name, t in tools.items() if t["dominates_context"]],
+        },
+    }
+    if cache is not None:
+        cached_calls = sum(t["calls"] for name, t in tools.items() if cache.covers(name))
+        cache_hits = sum(t["cache_hits"] for t in tools.values())
+        metrics["cache"] = {
+            "tools": sorted(cache.tool_names),
+            "max_entries": cache.max_entries,
+            "calls": cached_calls,
+            "hits": cache_hits,
+            "hit_rate": cache_hits / cached_calls if cached_calls else 0.0,
+        }
+    return metrics
+
+
+def _fmt_sec(value: float | None) -> str:
+    return "-" if value is None else f"{value:.3f}s"
+
+
+def _fmt_bytes(value: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if value < 1024 or unit == "MB":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+
+
+def format_context_section(metrics: dict[str, Any]) -> str:
+    """Render token usage and per-tool result sizes of a run as a Markdown section."""
+    tokens = metrics["tokens"]
+    lines = [
+        "",
+        "## Context and Tokens",
+        "",
+        f"- **Input Tokens**: {tokens['prompt_tokens']:,} ({tokens['mean_input_per_task']:,.0f} per task; "
+        f"{tokens['cache_read_input_tokens']:,} read from prompt cache)",
+        f"- **Output Tokens**: {tokens['output_tokens']:,} ({tokens['mean_output_per_task']:,.0f} per task)",
+    ]
+    dominating = tokens["context_dominating_tools"]
+    if dominating:
+        lines.append(
+            f"- **⚠️ Tools dominating context** (≥ {tokens['context_share_threshold']:.0%} of input tokens): "
+            + ", ".join(f"`{name}` ({metrics['tools'][name]['context_share']:.0%})" for name in dominating)
+        )
+    lines.extend([
+        "",
+        "Result tokens are estimated from the growth of each request's input; context tokens also count every later "
+        "request in the task that carried the result again.",
+        "",
+        "| Tool | Calls | Result size | Mean | Max | Result tokens | Context tokens | Share of input |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|",
+    ])
+    for name, stats in sorted(metrics["tools"].items(), key=lambda item: -item[1]["context_tokens"]):
+        flag = " ⚠️" if stats["dominates_context"] else ""
+        lines.append(
+            f"| `{name}`{flag} | {stats['calls']} | {_fmt_bytes(stats['result_bytes'])} "
+            f"| {_fmt_bytes(stats['mean_result_bytes'])} | {_fmt_bytes(stats['max_result_bytes'])} "
+            f"| {stats['result_tokens']:,} | {stats['context_tokens']:,} | {stats['context_share']:.0%} |"
+        )
+    lines.extend(["", "---", ""])
+    return "\n".join(lines)
+
+
+def format_latency_section(metrics: dict[str, Any]) -> str:
+    """Render the latency percentiles (and tool result cache hits, if any) of a run as Markdown."""
+    lines = [
+        "",
+        "## Latency",
+        "",
+        "| Source | Calls | Errors | p50 | p90 | p99 | Max |",
+        "|---|---:|---:|---:|---:|---:|---:|",
+    ]
+
+    def row(label: str, stats: dict[str, Any], calls: int, errors: str) -> str:
+        return (
+            f"| {label} | {calls} | {errors} | {_fmt_sec(stats['p50'])} | {_fmt_sec(stats['p90'])} "
+            f"| {_fmt_sec(stats['p99'])} | {_fmt_sec(stats['max'])} |"
+        )
+
+    tools = metrics["tools"].values()
+    lines.append(row("Model round-trip", metrics["model_latency"], metrics["model_latency"]["count"], "-"))
+    lines.append(row(
+        "All tools", metrics["tool_latency"], sum(t["calls"] for t in tools), str(sum(t["errors"] for t in tools))
+    ))
+    for name, stats in metrics["tools"].items():
+        lines.append(row(f"`{name}`", stats, stats["calls"], f"{stats['errors']} ({stats['error_rate']:.0%})"))
+    lines.extend(["", "---", ""])
+
+    cache = metrics.get("cache")
+    if cache:
+        lines.extend([
+            "## Tool Result Cache",
+            "",
+            f"- **Cached Tools**: {', '.join(f'`{name}`' for name in cache['tools'])}",
+            f"- **Hits**: {cache['hits']}/{cache['calls']} calls ({cache['hit_rate']:.1%})",
+            "",
+            "| Tool | Calls | Cache hits | Hit rate |",
+            "|---|---:|---:|---:|",
+        ])
+        for name, stats in metrics["tools"].items():
+            if name in cache["tools"]:
+                lines.append(
+                    f"| `{name}` | {stats['calls']} | {stats['cache_hits']} | {stats['cache_hits'] / stats['calls']:.0%} |"
+                )
+        lines.extend(["", "---", ""])
+    return "\n".join(lines)
+
+
+@asynccontextmanager
+async def checkout(connection: Any):
+    """Yield a connection for one task: a pooled connection, or `connection` itself."""
+    if isinstance(connection, MCPConnectionPool):
+        async with connection.acquire() as pooled:
+            yield pooled
+    else:
+        yield connection
+
+
 REPORT_HEADER = """
 # Evaluation Report
 
@@ -192,7 +640,7 @@ REPORT_HEADER = """
 - **Accuracy**: {correct}/{total} ({accuracy:.1f}%)
 - **Average Task Duration**: {average_duration_s:.2f}s
 - **Average Tool Calls per Task**: {average_tool_calls:.2f}
-- **Total Tool Calls**: {total_tool_calls}
+- **Total Tool Calls**: {total_tool_calls}{shard}
 
 ---
 """
@@ -205,6 +653,7 @@ TASK_TEMPLATE = """
 **Actual Answer**: `{actual_answer}`
 **Correct**: {correct_indicator}
 **Duration**: {total_duration:.2f}s
+**Tokens**: {input_tokens:,} input / {output_tokens:,} output
 **Tool Calls**: {tool_calls}
 
 **Summary**
@@ -221,8 +670,27 @@ async def run_evaluation(
     eval_path: Path,
     connection: Any,
     model: str = "claude-3-7-sonnet-20250219",
+    concurrency: int = 1,
+    metrics_output: Path | None = None,
+    cache_tools: list[str] | None = None,
+    cache_size: int = 1024,
+    transcript_dir: Path | None = None,
+    context_share: float = 0.25,
+    shard: tuple[int, int] | None = None,
 ) -> str:
-    """Run evaluation with MCP server tools."""
+    """Run evaluation with MCP server tools.
+
+    QA pairs are streamed from the evaluation file and started as they are
+    read, with up to `concurrency` running at once; results keep the order of
+    the evaluation file regardless of which task finishes first. `shard=(i, n)`
+    runs only every n-th pair, keeping task numbers from the full file. `connection` may
+    be an MCPConnectionPool, in which case each task checks out its own
+    connection. When `metrics_output` is set, the aggregated latency metrics
+    and per-task results are also written there as JSON. Results of the tools
+    named in `cache_tools` are memoized for the whole run (see ToolResultCache).
+    With `transcript_dir`, each task's transcript is saved as task_NNN.jsonl.
+    Tools using at least `context_share` of all input tokens are flagged.
+    """
     print("🚀 Starting Evaluation")
 
     client = Anthropic()
@@ -230,14 +698,37 @@ async def run_evaluation(
     tools = await connection.list_tools()
     print(f"📋 Loaded {len(tools)} tools from MCP server")
 
-    qa_pairs = parse_evaluation_file(eval_path)
-    print(f"📋 Loaded {len(qa_pairs)} evaluation tasks")
+    print(f"📋 Streaming evaluation tasks from {eval_path}" + (f" (shard {shard[0]}/{shard[1]})" if shard else ""))
+
+    cache = ToolResultCache(cache_tools, cache_size) if cache_tools else None
+    if transcript_dir:
+        transcript_dir.mkdir(parents=True, exist_ok=True)
 
-    results = []
-    for i, qa_pair in enumerate(qa_pairs):
-        print(f"Processing task {i + 1}/{len(qa_pairs)}")
-        result = await evaluate_single_task(client, model, qa_pair, tools, connection, i)
-        results.append(result)
+    async def run_task(i: int, qa_pair: dict[str, Any]) -> dict[str, Any]:
+        async with checkout(connection) as task_connection:
+            print(f"Processing task {i + 1}")
+            transcript_path = transcript_dir / f"task_{i + 1:03d}.jsonl" if transcript_dir else None
+            return await evaluate_single_task(client, model, qa_pair, tools, task_connection, i, cache, transcript_path)
+
+    tasks = []
+    running = set()
+    try:
+        for i, qa_pair in iter_evaluation_file(eval_path, shard):
+            if len(running) >= max(1, concurrency):
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            task = asyncio.create_task(run_task(i, qa_pair))
+            tasks.append(task)
+            running.add(task)
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        # Let cancelled tasks leave their pool checkouts before the pool is closed.
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    print(f"📋 Evaluated {len(results)} tasks")
 
     correct = sum(r["score"] for r in results)
     accuracy = (correct / len(results)) * 100 if results else 0
@@ -246,6 +737,7 @@ async def run_evaluation(
     total_tool_calls = sum(r["num_tool_calls"] for r in results)
 
     report = REPORT_HEADER.format(
+        shard=f"\n- **Shard**: {shard[0]}/{shard[1]}" if shard else "",
         correct=correct,
         total=len(results),
         accuracy=accuracy,
@@ -254,21 +746,46 @@ async def run_evaluation(
         total_tool_calls=total_tool_calls,
     )
 
+    metrics = aggregate_metrics(results, cache, context_share)
+    report += format_latency_section(metrics)
+    report += format_context_section(metrics)
+
     report += "".join([
         TASK_TEMPLATE.format(
-            task_num=i + 1,
-            question=qa_pair["question"],
-            expected_answer=qa_pair["answer"],
+            task_num=result["task"],
+            question=result["question"],
+            expected_answer=result["expected"],
             actual_answer=result["actual"] or "N/A",
             correct_indicator="✅" if result["score"] else "❌",
             total_duration=result["total_duration"],
+            input_tokens=_prompt_tokens(result["model_calls"]),
+            output_tokens=result["model_calls"]["output_tokens"],
             tool_calls=json.dumps(result["tool_calls"], indent=2),
             summary=result["summary"] or "N/A",
             feedback=result["feedback"] or "N/A",
         )
-        for i, (qa_pair, result) in enumerate(zip(qa_pairs, results))
+        for result in results
     ])
 
+    if metrics_output:
+        metrics_output.write_text(json.dumps({
+            "model": model,
+            "shard": list(shard) if shard else None,
+            "summary": metrics,
+            "tasks": [
+                {
+                    "task": result["task"],
+                    "question": result["question"],
+                    "score": result["score"],
+                    "total_duration": result["total_duration"],
+                    "tool_calls": result["tool_calls"],
+                    "model_calls": result["model_calls"],
+                }
+                for result in results
+            ],
+        }, indent=2))
+        print(f"📊 Metrics saved to {metrics_output}")
+
     return report
 
 
@@ -316,12 +833,19 @@ Examples:
 
   # Evaluate an HTTP MCP server with custom model
   python evaluation.py -t http -u https://example.com/mcp -m claude-3-5-sonnet-20241022 eval.xml
+
+  # Evaluate up to 4 questions at a time, each on its own server process
+  python evaluation.py -t stdio -c python -a my_server.py -j 4 -p 4 eval.xml
         """,
     )
 
     parser.add_argument("eval_file", type=Path, help="Path to evaluation XML file")
     parser.add_argument("-t", "--transport", choices=["stdio", "sse", "http"], default="stdio", help="Transport type (default: stdio)")
     parser.add_argument("-m", "--model", default="claude-3-7-sonnet-20250219", help="Claude model to use (default: claude-3-7-sonnet-20250219)")
+    parser.add_argument("-j", "--concurrency", type=int, default=1, help="Number of QA pairs to evaluate concurrently (default: 1)")
+    parser.add_argument("--shard", type=parse_shard, metavar="I/N", help="Only run every N-th QA pair, starting with the I-th (1-based), e.g. 2/4")
+    parser.add_argument("--tool-timeout", type=float, default=300.0, help="Seconds before a tool call is failed (default: 300)")
+    parser.add_argument("-p", "--connections", type=int, default=1, help="Number of server connections to open and share across tasks (default: 1)")
 
     stdio_group = parser.add_argument_group("stdio options")
     stdio_group.add_argument("-c", "--command", help="Command to run MCP server (stdio only)")
@@ -333,9 +857,34 @@ Examples:
     remote_group.add_argument("-H", "--header", nargs="+", dest="headers", help="HTTP headers in 'Key: Value' format (sse/http only)")
 
     parser.add_argument("-o", "--output", type=Path, help="Output file for evaluation report (default: stdout)")
+    parser.add_argument("--cache-tools", nargs="+", metavar="TOOL", help="Idempotent tools whose results may be reused within the run (default: no caching)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Maximum number of cached tool results (default: 1024)")
+    parser.add_argument("--transcripts", type=Path, metavar="DIR", help="Directory to save one JSONL transcript per task (default: not saved)")
+    parser.add_argument("--context-share", type=float, default=0.25, help="Flag tools whose results use at least this fraction of input tokens (default: 0.25)")
+    parser.add_argument("--metrics", type=Path, help="Output file for metrics JSON (default: <output>.metrics.json when -o is given)")
 
     args = parser.parse_args()
 
+    if args.concurrency < 1:
+        print("Error: --concurrency must be at least 1")
+        sys.exit(1)
+
+    if args.connections < 1:
+        print("Error: --connections must be at least 1")
+        sys.exit(1)
+
+    if args.tool_timeout <= 0:
+        print("Error: --tool-timeout must be positive")
+        sys.exit(1)
+
+    if args.cache_size < 1:
+        print("Error: --cache-size must be at least 1")
+        sys.exit(1)
+
+    if not 0 < args.context_share <= 1:
+        print("Error: --context-share must be between 0 and 1")
+        sys.exit(1)
+
     if not args.eval_file.exists():
         print(f"Error: Evaluation file not found: {args.eval_file}")
         sys.exit(1)
@@ -344,23 +893,43 @@ Examples:
     env_vars = parse_env_vars(args.env) if args.env else None
 
     try:
-        connection = create_connection(
+        connection = create_connection_pool(
+            size=args.connections,
             transport=args.transport,
             command=args.command,
             args=args.args,
             env=env_vars,
             url=args.url,
             headers=headers,
+            call_timeout=args.tool_timeout,
         )
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
 
-    print(f"🔗 Connecting to MCP server via {args.transport}...")
+    print(f"🔗 Connecting to MCP server via {args.transport} ({args.connections} connection(s))...")
 
     async with connection:
         print("✅ Connected successfully")
-        report = await run_evaluation(args.eval_file, connection, args.model)
+        metrics_output = args.metrics or (args.output.with_suffix(".metrics.json") if args.output else None)
+        try:
+            report = await run_evaluation(
+                args.eval_file,
+                connection,
+                args.model,
+                args.concurrency,
+                metrics_output,
+                cache_tools=args.cache_tools,
+                cache_size=args.cache_size,
+                transcript_dir=args.transcripts,
+                context_share=args.context_share,
+                shard=args.shard,
+            )
+        except ET.ParseError as e:
+            print(f"Error parsing evaluation file {args.eval_file}: {e}")
+            sys.exit(1)
+        if connection.reconnects:
+            print(f"🔁 Reconnected to the MCP server {connection.reconnects} time(s) during the run")
 
         if args.output:
             args.output.write_text(report)
@@ -0,0 +1,336 @@
+"""MCP Server Load Test
+
+This script benchmarks MCP servers by replaying recorded call_tool sequences
+against them, without any model in the loop.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from connections import create_connection_pool
+from evaluation import execute_tool, latency_stats, parse_env_vars, parse_headers
+
+
+def _parse_call(raw: Any, where: str) -> dict[str, Any]:
+    if not isinstance(raw, dict) or not isinstance(raw.get("tool"), str):
+        raise ValueError(f"{where}: each call needs a 'tool' name")
+    arguments = raw.get("arguments") or {}
+    if not isinstance(arguments, dict):
+        raise ValueError(f"{where}: 'arguments' must be a mapping")
+    return {"tool": raw["tool"], "arguments": arguments}
+
+
+def load_jsonl_sequence(path: Path) -> dict[str, Any]:
+    """Load one sequence from a JSONL file of tool call records.
+
+    Every line with a `tool` key (and, if present, `"type": "tool_call"`) is a
+    call; other lines are ignored, so evaluation transcripts can be replayed
+    as-is. Calls a transcript marks as `cached` never reached the server and
+    are skipped too.
+    """
+    calls = []
+    with path.open(encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict) or "tool" not in record:
+                continue
+            if record.get("type", "tool_call") != "tool_call" or record.get("cached"):
+                continue
+            calls.append(_parse_call(record, f"{path}:{line_no}"))
+    return {"name": path.stem, "calls": calls}
+
+
+def load_yaml_sequences(path: Path) -> list[dict[str, Any]]:
+    """Load sequences from a YAML script.
+
+    The script is either a list of calls (one sequence) or a mapping with a
+    `sequences` list, each entry having an optional `name` and a `calls` list.
+    """
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    if isinstance(data, list):
+        data = {"sequences": [{"name": path.stem, "calls": data}]}
+    if not isinstance(data, dict) or not isinstance(data.get("sequences"), list):
+        raise ValueError(f"{path}: expected a list of calls or a mapping with a 'sequences' list")
+
+    sequences = []
+    for i, raw in enumerate(data["sequences"], 1):
+        if not isinstance(raw, dict) or not isinstance(raw.get("calls"), list):
+            raise ValueError(f"{path}: sequence #{i} needs a 'calls' list")
+        name = str(raw.get("name") or f"{path.stem}-{i}")
+        calls = [_parse_call(call, f"{path}: sequence {name!r} call #{j}") for j, call in enumerate(raw["calls"], 1)]
+        sequences.append({"name": name, "calls": calls})
+    return sequences
+
+
+def load_sequences(paths: list[Path]) -> list[dict[str, Any]]:
+    """Load call sequences from YAML scripts and/or JSONL transcripts; empty sequences are dropped."""
+    sequences = []
+    for path in paths:
+        if path.is_dir():
+            sequences.extend(load_jsonl_sequence(p) for p in sorted(path.glob("*.jsonl")))
+        elif path.suffix == ".jsonl":
+            sequences.append(load_jsonl_sequence(path))
+        else:
+            sequences.extend(load_yaml_sequences(path))
+    return [s for s in sequences if s["calls"]]
+
+
+class RateLimiter:
+    """Spaces call starts `1 / rate` seconds apart across all workers."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = time.perf_counter()
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.perf_counter()
+            delay = self._next - now
+            self._next = max(self._next, now) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def run_load(
+    connection: Any,
+    sequences: list[dict[str, Any]],
+    concurrency: int = 1,
+    rate: float | None = None,
+    duration: float | None = None,
+    iterations: int | None = None,
+) -> dict[str, Any]:
+    """Replay `sequences` round-robin from `concurrency` workers.
+
+    Each worker checks out a pooled connection for one sequence at a time.
+    The run stops after `iterations` sequence runs or `duration` seconds,
+    whichever comes first; `rate` caps call starts per second across workers.
+    """
+    durations: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    completed = 0
+    connection_errors = 0
+    counter = itertools.count()
+    limiter = RateLimiter(rate) if rate else None
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    def expired() -> bool:
+        return deadline is not None and time.perf_counter() >= deadline
+
+    async def worker() -> None:
+        nonlocal completed, connection_errors
+        while not expired():
+            n = next(counter)
+            if iterations is not None and n >= iterations:
+                return
+            sequence = sequences[n % len(sequences)]
+            try:
+                async with connection.acquire() as session:
+                    for call in sequence["calls"]:
+                        if limiter:
+                            await limiter.wait()
+                        if expired():
+                            return
+                        _, call_duration, is_error = await execute_tool(session, call["tool"], call["arguments"])
+                        durations.setdefault(call["tool"], []).append(call_duration)
+                        errors[call["tool"]] = errors.get(call["tool"], 0) + int(is_error)
+            except ConnectionError as e:
+                connection_errors += 1
+                print(f"⚠️  Connection error: {e}")
+                continue
+            completed += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    tools = {}
+    for name in sorted(durations):
+        stats = latency_stats(durations[name])
+        stats["errors"] = errors[name]
+        stats["error_rate"] = errors[name] / stats["count"]
+        stats["throughput"] = stats["count"] / elapsed if elapsed else 0.0
+        tools[name] = stats
+
+    all_durations = [d for values in durations.values() for d in values]
+    total_errors = sum(errors.values())
+    summary = latency_stats(all_durations)
+    summary.update({
+        "errors": total_errors,
+        "error_rate": total_errors / len(all_durations) if all_durations else 0.0,
+        "throughput": len(all_durations) / elapsed if elapsed else 0.0,
+        "elapsed": elapsed,
+        "sequences_completed": completed,
+        "connection_errors": connection_errors,
+    })
+    return {
+        "config": {
+            "sequences": [s["name"] for s in sequences],
+            "concurrency": concurrency,
+            "rate": rate,
+            "duration": duration,
+            "iterations": iterations,
+        },
+        "summary": summary,
+        "tools": tools,
+    }
+
+
+def _fmt_ms(value: float | None) -> str:
+    return "-" if value is None else f"{value * 1000:.1f}ms"
+
+
+def format_report(results: dict[str, Any]) -> str:
+    """Render load test results as a Markdown report."""
+    config = results["config"]
+    summary = results["summary"]
+    target = f"{config['concurrency']} worker(s)"
+    if config["rate"]:
+        target += f", {config['rate']:g} calls/s"
+
+    lines = [
+        "",
+        "# Load Test Report",
+        "",
+        "## Summary",
+        "",
+        f"- **Target**: {target}",
+        f"- **Sequences**: {len(config['sequences'])} ({summary['sequences_completed']} runs completed)",
+        f"- **Elapsed**: {summary['elapsed']:.2f}s",
+        f"- **Calls**: {summary['count']} ({summary['errors']} errors, {summary['error_rate']:.1%})",
+        f"- **Throughput**: {summary['throughput']:.1f} calls/s",
+    ]
+    if summary["connection_errors"]:
+        lines.append(f"- **Connection Errors**: {summary['connection_errors']}")
+    lines.extend([
+        "",
+        "## Latency",
+        "",
+        "| Tool | Calls | Errors | Calls/s | p50 | p90 | p99 | Max |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|",
+    ])
+    rows = [("All tools", summary)] + [(f"`{name}`", stats) for name, stats in results["tools"].items()]
+    for label, stats in rows:
+        lines.append(
+            f"| {label} | {stats['count']} | {stats['errors']} ({stats['error_rate']:.0%}) | {stats['throughput']:.1f} "
+            f"| {_fmt_ms(stats['p50'])} | {_fmt_ms(stats['p90'])} | {_fmt_ms(stats['p99'])} | {_fmt_ms(stats['max'])} |"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Load test MCP servers by replaying recorded tool call sequences (no model calls)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Replay a YAML script against a local stdio server with 8 workers for 30 seconds
+  python load_test.py -t stdio -c python -a my_server.py -j 8 -d 30 load.yaml
+
+  # Replay evaluation transcripts against an HTTP server at 50 calls/s
+  python load_test.py -t http -u https://example.com/mcp -j 16 -r 50 transcripts/
+        """,
+    )
+
+    parser.add_argument("script", type=Path, nargs="+", help="YAML script(s), JSONL transcript(s) or directories of transcripts")
+    parser.add_argument("-t", "--transport", choices=["stdio", "sse", "http"], default="stdio", help="Transport type (default: stdio)")
+    parser.add_argument("-j", "--concurrency", type=int, default=1, help="Number of concurrent workers (default: 1)")
+    parser.add_argument("-p", "--connections", type=int, help="Number of server connections (default: same as --concurrency)")
+    parser.add_argument("-r", "--rate", type=float, help="Target tool calls per second across all workers (default: unthrottled)")
+    parser.add_argument("-d", "--duration", type=float, help="Run for this many seconds (default: 10 unless --iterations is set)")
+    parser.add_argument("-n", "--iterations", type=int, help="Stop after this many sequence runs")
+
+    stdio_group = parser.add_argument_group("stdio options")
+    stdio_group.add_argument("-c", "--command", help="Command to run MCP server (stdio only)")
+    stdio_group.add_argument("-a", "--args", nargs="+", help="Arguments for the command (stdio only)")
+    stdio_group.add_argument("-e", "--env", nargs="+", help="Environment variables in KEY=VALUE format (stdio only)")
+
+    remote_group = parser.add_argument_group("sse/http options")
+    remote_group.add_argument("-u", "--url", help="MCP server URL (sse/http only)")
+    remote_group.add_argument("-H", "--header", nargs="+", dest="headers", help="HTTP headers in 'Key: Value' format (sse/http only)")
+
+    parser.add_argument("-o", "--output", type=Path, help="Output file for load test report (default: stdout)")
+    parser.add_argument("--metrics", type=Path, help="Output file for metrics JSON (default: <output>.metrics.json when -o is given)")
+
+    args = parser.parse_args()
+
+    for name in ("concurrency", "connections", "iterations"):
+        value = getattr(args, name)
+        if value is not None and value < 1:
+            print(f"Error: --{name} must be at least 1")
+            sys.exit(1)
+    for name in ("rate", "duration"):
+        value = getattr(args, name)
+        if value is not None and value <= 0:
+            print(f"Error: --{name} must be positive")
+            sys.exit(1)
+
+    try:
+        sequences = load_sequences(args.script)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not sequences:
+        print("Error: no tool calls found in the given scripts")
+        sys.exit(1)
+
+    headers = parse_headers(args.headers) if args.headers else None
+    env_vars = parse_env_vars(args.env) if args.env else None
+    connections = args.connections or args.concurrency
+    duration = args.duration if args.duration or args.iterations else 10.0
+
+    try:
+        connection = create_connection_pool(
+            size=connections,
+            transport=args.transport,
+            command=args.command,
+            args=args.args,
+            env=env_vars,
+            url=args.url,
+            headers=headers,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"🔗 Connecting to MCP server via {args.transport} ({connections} connection(s))...")
+
+    async with connection:
+        print("✅ Connected successfully")
+        print(f"🚀 Replaying {len(sequences)} sequence(s) with {args.concurrency} worker(s)")
+        results = await run_load(
+            connection,
+            sequences,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            duration=duration,
+            iterations=args.iterations,
+        )
+        results["summary"]["reconnects"] = connection.reconnects
+
+    report = format_report(results)
+    metrics_output = args.metrics or (args.output.with_suffix(".metrics.json") if args.output else None)
+    if metrics_output:
+        metrics_output.write_text(json.dumps(results, indent=2))
+        print(f"📊 Metrics saved to {metrics_output}")
+
+    if args.output:
+        args.output.write_text(report)
+        print(f"\n✅ Report saved to {args.output}")
+    else:
+        print("\n" + report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
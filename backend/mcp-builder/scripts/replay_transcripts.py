@@ -0,0 +1,258 @@
+"""MCP Transcript Replay
+
+This script re-drives the tool calls recorded in evaluation transcripts
+(evaluation.py --transcripts) against an MCP server, without any model calls,
+and compares the new outputs and latencies with the recorded ones.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from connections import create_connection_pool
+from evaluation import checkout, execute_tool, latency_stats, parse_env_vars, parse_headers
+
+
+def load_transcript(path: Path) -> list[dict[str, Any]]:
+    """Return the recorded tool calls of one transcript, in order.
+
+    Calls answered from the tool result cache never reached the server and are skipped.
+    """
+    calls = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("type") == "tool_call" and not record.get("cached"):
+                calls.append(record)
+    return calls
+
+
+def transcript_paths(paths: list[Path]) -> list[Path]:
+    """Expand directories into their *.jsonl transcripts."""
+    expanded = []
+    for path in paths:
+        expanded.extend(sorted(path.glob("*.jsonl")) if path.is_dir() else [path])
+    return expanded
+
+
+def outputs_match(recorded: dict[str, Any], is_error: bool, result: str) -> bool:
+    """Successful calls must return identical output; errors only need to still be errors."""
+    if bool(recorded.get("is_error")) != is_error:
+        return False
+    return is_error or recorded.get("result") == result
+
+
+async def replay_transcript(connection: Any, path: Path) -> list[dict[str, Any]]:
+    """Replay one transcript's tool calls turn by turn, each turn's calls concurrently as recorded."""
+    calls = load_transcript(path)
+    turns: dict[int, list[dict[str, Any]]] = {}
+    for call in calls:
+        turns.setdefault(call.get("turn", 0), []).append(call)
+
+    replayed = []
+    async with checkout(connection) as session:
+        for turn in sorted(turns):
+            outcomes = await asyncio.gather(
+                *(execute_tool(session, call["tool"], call.get("arguments") or {}) for call in turns[turn])
+            )
+            for call, (result, duration, is_error) in zip(turns[turn], outcomes):
+                replayed.append({
+                    "transcript": path.name,
+                    "turn": turn,
+                    "tool": call["tool"],
+                    "arguments": call.get("arguments") or {},
+                    "match": outputs_match(call, is_error, result),
+                    "recorded_error": bool(call.get("is_error")),
+                    "is_error": is_error,
+                    "recorded_result": call.get("result"),
+                    "result": result,
+                    "recorded_duration": call.get("duration"),
+                    "duration": duration,
+                })
+    return replayed
+
+
+def compare(calls: list[dict[str, Any]], max_slowdown: float | None = None) -> dict[str, Any]:
+    """Per-tool output mismatches and recorded-vs-replayed latency."""
+    by_tool: dict[str, list[dict[str, Any]]] = {}
+    for call in calls:
+        by_tool.setdefault(call["tool"], []).append(call)
+
+    tools = {}
+    for name in sorted(by_tool):
+        tool_calls = by_tool[name]
+        recorded = latency_stats([c["recorded_duration"] for c in tool_calls if c["recorded_duration"] is not None])
+        replayed = latency_stats([c["duration"] for c in tool_calls])
+        slowdown = replayed["p50"] / recorded["p50"] if recorded["p50"] else None
+        tools[name] = {
+            "calls": len(tool_calls),
+            "mismatches": sum(1 for c in tool_calls if not c["match"]),
+            "recorded": recorded,
+            "replayed": replayed,
+            "p50_ratio": slowdown,
+            "slower": bool(max_slowdown and slowdown and slowdown > max_slowdown),
+        }
+    return {
+        "calls": len(calls),
+        "mismatches": sum(t["mismatches"] for t in tools.values()),
+        "slower_tools": [name for name, t in tools.items() if t["slower"]],
+        "max_slowdown": max_slowdown,
+        "tools": tools,
+    }
+
+
+def _fmt_ms(value: float | None) -> str:
+    return "-" if value is None else f"{value * 1000:.1f}ms"
+
+
+def _shorten(text: str | None, limit: int = 200) -> str:
+    text = (text or "").replace("\n", " ")
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def format_report(comparison: dict[str, Any], calls: list[dict[str, Any]], transcripts: int) -> str:
+    """Render a replay comparison as a Markdown report."""
+    lines = [
+        "",
+        "# Transcript Replay Report",
+        "",
+        "## Summary",
+        "",
+        f"- **Transcripts**: {transcripts}",
+        f"- **Tool Calls Replayed**: {comparison['calls']}",
+        f"- **Output Mismatches**: {comparison['mismatches']}",
+    ]
+    if comparison["max_slowdown"]:
+        slower = ", ".join(f"`{name}`" for name in comparison["slower_tools"]) or "none"
+        lines.append(f"- **Slower than {comparison['max_slowdown']:g}x (p50)**: {slower}")
+    lines.extend([
+        "",
+        "## Per-Tool Comparison",
+        "",
+        "| Tool | Calls | Mismatches | Recorded p50 | Replayed p50 | Recorded p90 | Replayed p90 | p50 ratio |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|",
+    ])
+    for name, t in comparison["tools"].items():
+        ratio = "-" if t["p50_ratio"] is None else f"{t['p50_ratio']:.2f}x"
+        lines.append(
+            f"| `{name}` | {t['calls']} | {t['mismatches']} | {_fmt_ms(t['recorded']['p50'])} | {_fmt_ms(t['replayed']['p50'])} "
+            f"| {_fmt_ms(t['recorded']['p90'])} | {_fmt_ms(t['replayed']['p90'])} | {ratio} |"
+        )
+
+    mismatched = [c for c in calls if not c["match"]]
+    if mismatched:
+        lines.extend(["", "## Mismatches", ""])
+        for c in mismatched:
+            lines.extend([
+                f"### `{c['tool']}` ({c['transcript']}, turn {c['turn']})",
+                "",
+                f"**Arguments**: `{json.dumps(c['arguments'])}`",
+                f"**Recorded** ({'error' if c['recorded_error'] else 'ok'}): `{_shorten(c['recorded_result'])}`",
+                f"**Replayed** ({'error' if c['is_error'] else 'ok'}): `{_shorten(c['result'])}`",
+                "",
+            ])
+    lines.append("")
+    return "\n".join(lines)
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Replay recorded evaluation tool calls against an MCP server and compare outputs and latency",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Record transcripts, then replay them against a new server build
+  python evaluation.py eval.xml -t stdio -c python -a server_v1.py --transcripts transcripts/
+  python replay_transcripts.py transcripts/ -t stdio -c python -a server_v2.py
+
+  # Fail if any tool's median latency regressed by more than 50%
+  python replay_transcripts.py transcripts/ -t http -u http://localhost:8000/mcp --max-slowdown 1.5
+        """,
+    )
+
+    parser.add_argument("transcripts", type=Path, nargs="+", help="Transcript JSONL file(s) or directories of them")
+    parser.add_argument("-t", "--transport", choices=["stdio", "sse", "http"], default="stdio", help="Transport type (default: stdio)")
+    parser.add_argument("-j", "--concurrency", type=int, default=1, help="Number of transcripts to replay concurrently (default: 1)")
+    parser.add_argument("--max-slowdown", type=float, help="Fail when a tool's replayed p50 exceeds its recorded p50 by this factor")
+
+    stdio_group = parser.add_argument_group("stdio options")
+    stdio_group.add_argument("-c", "--command", help="Command to run MCP server (stdio only)")
+    stdio_group.add_argument("-a", "--args", nargs="+", help="Arguments for the command (stdio only)")
+    stdio_group.add_argument("-e", "--env", nargs="+", help="Environment variables in KEY=VALUE format (stdio only)")
+
+    remote_group = parser.add_argument_group("sse/http options")
+    remote_group.add_argument("-u", "--url", help="MCP server URL (sse/http only)")
+    remote_group.add_argument("-H", "--header", nargs="+", dest="headers", help="HTTP headers in 'Key: Value' format (sse/http only)")
+
+    parser.add_argument("-o", "--output", type=Path, help="Output file for replay report (default: stdout)")
+    parser.add_argument("--metrics", type=Path, help="Output file for comparison JSON (default: <output>.metrics.json when -o is given)")
+
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        print("Error: --concurrency must be at least 1")
+        sys.exit(1)
+
+    paths = transcript_paths(args.transcripts)
+    missing = [p for p in paths if not p.exists()]
+    if missing or not paths:
+        print(f"Error: transcript not found: {missing[0] if missing else args.transcripts[0]}")
+        sys.exit(1)
+
+    headers = parse_headers(args.headers) if args.headers else None
+    env_vars = parse_env_vars(args.env) if args.env else None
+
+    try:
+        connection = create_connection_pool(
+            size=args.concurrency,
+            transport=args.transport,
+            command=args.command,
+            args=args.args,
+            env=env_vars,
+            url=args.url,
+            headers=headers,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"🔗 Connecting to MCP server via {args.transport}...")
+
+    async with connection:
+        print("✅ Connected successfully")
+        print(f"🔁 Replaying {len(paths)} transcript(s)")
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def replay(path: Path) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await replay_transcript(connection, path)
+
+        replayed = await asyncio.gather(*(replay(p) for p in paths))
+
+    calls = [call for transcript_calls in replayed for call in transcript_calls]
+    comparison = compare(calls, args.max_slowdown)
+    report = format_report(comparison, calls, len(paths))
+
+    metrics_output = args.metrics or (args.output.with_suffix(".metrics.json") if args.output else None)
+    if metrics_output:
+        metrics_output.write_text(json.dumps({"summary": comparison, "calls": calls}, indent=2))
+        print(f"📊 Metrics saved to {metrics_output}")
+
+    if args.output:
+        args.output.write_text(report)
+        print(f"\n✅ Report saved to {args.output}")
+    else:
+        print("\n" + report)
+
+    if comparison["mismatches"] or comparison["slower_tools"]:
+        print("❌ Replay differs from the recorded transcripts")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
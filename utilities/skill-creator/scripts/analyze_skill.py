@@ -5,7 +5,8 @@ analyze_skill.py
 Analyze a Codex agent skill (SKILL.md) and emit a quality score + actionable feedback.
 
 Usage:
-    python analyze_skill.py <path/to/skill-dir-or-SKILL.md>
+    python analyze_skill.py <path/to/skill-dir-or-SKILL.md> [...]
+    python analyze_skill.py --all <root> --format jsonl|sarif
 
 Examples:
     python analyze_skill.py .codex/skills/my-skill
@@ -13,12 +14,13 @@ Examples:
 
 Exit codes:
     0  score >= --min-pass
-    1  parsing/IO error
-    2  score <  --min-pass  (useful for CI gating)
+    1  parsing/IO error (any skill)
+    2  score <  --min-pass  (any skill; useful for CI gating)
 
 Output:
 - Human-readable report (default)
 - Optional machine-readable JSON/YAML via --format
+- JSON Lines (one record per skill, printed as each finishes) or SARIF 2.1.0
 """
 
 from __future__ import annotations
@@ -35,6 +37,9 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import yaml
 
+import sarif_report
+from skill_doc import SkillDoc, discover_skills, iter_files, load_skill_doc, resolve_skill_md_path
+
 
 # -----------------------------
 # Data model
@@ -63,103 +68,18 @@ class CategoryResult:
     findings: List[Finding]
 
 
-@dataclass(frozen=True)
-class SkillDoc:
-    skill_md_path: Path
-    raw_text: str
-    frontmatter: Dict[str, Any]
-    body: str
-    fm_start_line: int  # 1-indexed
-    fm_end_line: int    # 1-indexed (line containing closing ---)
-
-
 # -----------------------------
 # Parsing
 # -----------------------------
 
-_FRONTMATTER_DELIM_RE = re.compile(r"^\s*---\s*$")
-
-
-def _resolve_skill_md_path(path_like: str) -> Path:
-    p = Path(path_like).expanduser().resolve()
-    if p.is_dir():
-        return p / "SKILL.md"
-    return p
-
-
-def _read_text(path: Path) -> str:
-    try:
-        return path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        return path.read_text(encoding="utf-8", errors="replace")
-
-
-def _parse_frontmatter(raw_text: str) -> Tuple[Dict[str, Any], str, int, int]:
-    lines = raw_text.splitlines(keepends=True)
-
-    first_nonempty_idx: Optional[int] = None
-    for i, line in enumerate(lines):
-        if line.strip():
-            first_nonempty_idx = i
-            break
-    if first_nonempty_idx is None:
-        raise ValueError("SKILL.md is empty")
-
-    if not _FRONTMATTER_DELIM_RE.match(lines[first_nonempty_idx]):
-        raise ValueError("Missing YAML frontmatter. Expected `---` as the first non-empty line.")
-
-    end_idx: Optional[int] = None
-    for j in range(first_nonempty_idx + 1, len(lines)):
-        if _FRONTMATTER_DELIM_RE.match(lines[j]):
-            end_idx = j
-            break
-    if end_idx is None:
-        raise ValueError("Unterminated YAML frontmatter. Missing closing `---`.")
-
-    yaml_text = "".join(lines[first_nonempty_idx + 1 : end_idx])
-    try:
-        fm_obj = yaml.safe_load(yaml_text)
-    except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML in frontmatter: {e}") from e
-
-    if fm_obj is None:
-        fm: Dict[str, Any] = {}
-    elif isinstance(fm_obj, dict):
-        fm = fm_obj
-    else:
-        raise ValueError("Frontmatter YAML must be a mapping/object (key: value pairs).")
-
-    body = "".join(lines[end_idx + 1 :]).lstrip("\n")
-    fm_start_line = first_nonempty_idx + 1
-    fm_end_line = end_idx + 1
-    return fm, body, fm_start_line, fm_end_line
-
-
 def load_skill(path_like: str) -> SkillDoc:
-    skill_md_path = _resolve_skill_md_path(path_like)
-    if not skill_md_path.exists():
-        raise FileNotFoundError(f"SKILL.md not found at: {skill_md_path}")
-
-    raw = _read_text(skill_md_path)
-    fm, body, fm_start, fm_end = _parse_frontmatter(raw)
-    return SkillDoc(
-        skill_md_path=skill_md_path,
-        raw_text=raw,
-        frontmatter=fm,
-        body=body,
-        fm_start_line=fm_start,
-        fm_end_line=fm_end,
-    )
+    return load_skill_doc(path_like)
 
 
 # -----------------------------
 # Helpers
 # -----------------------------
 
-_H1_H6_RE = re.compile(r"(?m)^(#{1,6})\s+(.+?)\s*$")
-_H2_RE = re.compile(r"(?m)^##\s+(.+?)\s*$")
-
-
 def _has_any(text: str, needles: Sequence[str]) -> bool:
     t = text.lower()
     return any(n.lower() in t for n in needles)
@@ -169,24 +89,8 @@ def _count_regex(pattern: str, text: str, flags: int = 0) -> int:
     return len(re.findall(pattern, text, flags))
 
 
-def _extract_headers(body: str) -> List[Tuple[int, str]]:
-    out: List[Tuple[int, str]] = []
-    for m in _H1_H6_RE.finditer(body):
-        level = len(m.group(1))
-        title = m.group(2).strip()
-        out.append((level, title))
-    return out
-
-
-def _extract_h2_titles(body: str) -> List[str]:
-    return [m.group(1).strip().lower() for m in _H2_RE.finditer(body)]
-
-
 def _iter_files(skill_dir: Path, rel_dir: str) -> List[Path]:
-    p = skill_dir / rel_dir
-    if not p.exists() or not p.is_dir():
-        return []
-    return sorted([c for c in p.rglob("*") if c.is_file()])
+    return iter_files(skill_dir, rel_dir)
 
 
 # -----------------------------
@@ -243,7 +147,8 @@ def score_frontmatter(doc: SkillDoc) -> CategoryResult:
     return CategoryResult("Frontmatter", score, max_score, findings)
 
 
-def score_philosophy(body: str) -> CategoryResult:
+def score_philosophy(doc: SkillDoc) -> CategoryResult:
+    body = doc.body
     findings: List[Finding] = []
     score = 0
     max_score = 20
@@ -252,7 +157,7 @@ def score_philosophy(body: str) -> CategoryResult:
         "philosophy", "approach", "principle", "principles", "mental model", "framework",
         "mindset", "why", "tradeoff", "consider", "understand",
     ]
-    found = [kw for kw in keywords if kw in body.lower()]
+    found = [kw for kw in keywords if kw in doc.body_lower]
 
     if len(found) >= 3:
         score += 14
@@ -275,12 +180,13 @@ def score_philosophy(body: str) -> CategoryResult:
     return CategoryResult("Philosophy", score, max_score, findings)
 
 
-def score_antipatterns(body: str) -> CategoryResult:
+def score_antipatterns(doc: SkillDoc) -> CategoryResult:
+    body = doc.body
     findings: List[Finding] = []
     score = 0
     max_score = 20
 
-    body_lc = body.lower()
+    body_lc = doc.body_lower
     anti_pattern_keywords = [
         "avoid", "never", "don't", "do not", "anti-pattern", "anti pattern",
         "mistake", "pitfall", "warning", "wrong", "incorrect",
@@ -308,12 +214,12 @@ def score_antipatterns(body: str) -> CategoryResult:
     return CategoryResult("Anti-Patterns", min(score, max_score), max_score, findings)
 
 
-def score_variation(body: str) -> CategoryResult:
+def score_variation(doc: SkillDoc) -> CategoryResult:
     findings: List[Finding] = []
     score = 0
     max_score = 15
 
-    body_lc = body.lower()
+    body_lc = doc.body_lower
     variation_keywords = [
         "vary", "variation", "different", "diverse", "context-specific", "context specific",
         "adapt", "customize", "unique", "avoid repetition", "not the same",
@@ -338,13 +244,14 @@ def score_variation(body: str) -> CategoryResult:
     return CategoryResult("Variation", min(score, max_score), max_score, findings)
 
 
-def score_organization(body: str) -> CategoryResult:
+def score_organization(doc: SkillDoc) -> CategoryResult:
+    body = doc.body
     findings: List[Finding] = []
     score = 0
     max_score = 10
 
-    headers = _extract_headers(body)
-    h2s = _extract_h2_titles(body)
+    headers = doc.headings
+    h2s = doc.h2_titles
 
     if len(headers) >= 5:
         score += 6
@@ -374,12 +281,12 @@ def score_organization(body: str) -> CategoryResult:
     return CategoryResult("Organization", min(score, max_score), max_score, findings)
 
 
-def score_empowerment(body: str) -> CategoryResult:
+def score_empowerment(doc: SkillDoc) -> CategoryResult:
     findings: List[Finding] = []
     score = 0
     max_score = 5
 
-    body_lc = body.lower()
+    body_lc = doc.body_lower
     empowering_keywords = [
         "extraordinary", "capable", "unlock", "enable", "empower",
         "creative", "innovative", "push boundaries", "explore",
@@ -409,7 +316,7 @@ def score_repo_integration(doc: SkillDoc) -> CategoryResult:
     score = 0
     max_score = 10
 
-    skill_dir = doc.skill_md_path.parent
+    skill_dir = doc.path.parent
     body = doc.body
     scripts = _iter_files(skill_dir, "scripts")
     refs = _iter_files(skill_dir, "references")
@@ -485,10 +392,10 @@ def print_human_report(doc: SkillDoc, results: List[CategoryResult], total: int,
         print("\nSignificant improvements needed: rebuild structure and clarify selection triggers.\n")
 
 
-def print_machine_report(doc: SkillDoc, results: List[CategoryResult], total: int, max_total: int, *, fmt: str) -> None:
-    payload = {
+def build_machine_payload(doc: SkillDoc, results: List[CategoryResult], total: int, max_total: int) -> Dict[str, Any]:
+    return {
         "name": doc.frontmatter.get("name"),
-        "path": str(doc.skill_md_path),
+        "path": str(doc.path),
         "total_score": total,
         "max_total": max_total,
         "categories": [
@@ -511,6 +418,29 @@ def print_machine_report(doc: SkillDoc, results: List[CategoryResult], total: in
         ],
     }
 
+
+def sarif_results(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """WARN/FAIL findings from a machine payload as SARIF results (positive findings are omitted)."""
+    skill_md = Path(payload["path"])
+    levels = {"FAIL": sarif_report.ERROR, "WARN": sarif_report.WARNING}
+    out: List[Dict[str, Any]] = []
+    for cat in payload["categories"]:
+        for f in cat["findings"]:
+            if f["severity"] not in levels:
+                continue
+            out.append(sarif_report.sarif_result(
+                f"analyze/{re.sub(r'[^a-z0-9]+', '-', f['category'].lower()).strip('-')}",
+                levels[f["severity"]],
+                f["message"],
+                sarif_report.evidence_path(skill_md, f["evidence"]),
+                properties={"points": f["points"]},
+            ))
+    return out
+
+
+def print_machine_report(doc: SkillDoc, results: List[CategoryResult], total: int, max_total: int, *, fmt: str) -> None:
+    payload = build_machine_payload(doc, results, total, max_total)
+
     if fmt == "json":
         print(json.dumps(payload, indent=2, ensure_ascii=False))
     elif fmt == "yaml":
@@ -526,11 +456,11 @@ def print_machine_report(doc: SkillDoc, results: List[CategoryResult], total: in
 def analyze(doc: SkillDoc) -> Tuple[int, int, List[CategoryResult]]:
     results: List[CategoryResult] = []
     results.append(score_frontmatter(doc))
-    results.append(score_philosophy(doc.body))
-    results.append(score_antipatterns(doc.body))
-    results.append(score_variation(doc.body))
-    results.append(score_organization(doc.body))
-    results.append(score_empowerment(doc.body))
+    results.append(score_philosophy(doc))
+    results.append(score_antipatterns(doc))
+    results.append(score_variation(doc))
+    results.append(score_organization(doc))
+    results.append(score_empowerment(doc))
     results.append(score_repo_integration(doc))
 
     total = sum(r.score for r in results)
@@ -543,12 +473,17 @@ def build_arg_parser() -> argparse.ArgumentParser:
         prog="analyze_skill.py",
         description="Analyze a Codex skill (SKILL.md) and output a quality score.",
     )
-    p.add_argument("path", help="Path to a skill directory or a SKILL.md file.")
+    p.add_argument(
+        "path",
+        nargs="*",
+        help="Path(s) to a skill directory or a SKILL.md file. With --all, root directories to search (default: .).",
+    )
+    p.add_argument("--all", action="store_true", help="Analyze every SKILL.md under the given root(s).")
     p.add_argument(
         "--format",
-        choices=["text", "json", "yaml"],
+        choices=["text", "json", "yaml", "jsonl", "sarif"],
         default="text",
-        help="Output format (default: text).",
+        help="Output format (default: text). jsonl streams one record per skill; sarif emits SARIF 2.1.0.",
     )
     p.add_argument(
         "--min-pass",
@@ -564,11 +499,96 @@ def build_arg_parser() -> argparse.ArgumentParser:
     return p
 
 
+def _stream_jsonl(paths: Sequence[Path], *, min_pass: int) -> int:
+    rc = 0
+    scores: List[int] = []
+    for path in paths:
+        try:
+            doc = load_skill(str(path))
+        except Exception as e:
+            print(json.dumps({"type": "error", "path": str(path), "error": str(e)}, ensure_ascii=False), flush=True)
+            rc = 1
+            continue
+        total, max_total, results = analyze(doc)
+        payload = build_machine_payload(doc, results, total, max_total)
+        passed = total >= min_pass
+        print(json.dumps({"type": "skill", "passed": passed, **payload}, ensure_ascii=False), flush=True)
+        scores.append(total)
+        if not passed and rc == 0:
+            rc = 2
+    summary = {
+        "type": "summary",
+        "skills": len(scores),
+        "errors": len(paths) - len(scores),
+        "below_min_pass": sum(1 for t in scores if t < min_pass),
+    }
+    print(json.dumps(summary), flush=True)
+    return rc
+
+
+def _print_sarif(paths: Sequence[Path], *, min_pass: int) -> int:
+    rc = 0
+    run_results: List[Dict[str, Any]] = []
+    for path in paths:
+        try:
+            doc = load_skill(str(path))
+        except Exception as e:
+            run_results.append(sarif_report.sarif_result("analyze/load-error", sarif_report.ERROR, str(e), path))
+            rc = 1
+            continue
+        total, max_total, results = analyze(doc)
+        run_results.extend(sarif_results(build_machine_payload(doc, results, total, max_total)))
+        if total < min_pass and rc == 0:
+            rc = 2
+    print(json.dumps(sarif_report.sarif_log([sarif_report.sarif_run("analyze_skill", run_results)]), indent=2, ensure_ascii=False))
+    return rc
+
+
+def _report_many(paths: Sequence[Path], *, fmt: str, min_pass: int, emoji: bool) -> int:
+    rc = 0
+    payloads: List[Dict[str, Any]] = []
+    for path in paths:
+        try:
+            doc = load_skill(str(path))
+        except Exception as e:
+            print(f"ERROR {path}: {e}", file=sys.stderr)
+            rc = 1
+            continue
+        total, max_total, results = analyze(doc)
+        if fmt == "text":
+            print_human_report(doc, results, total, max_total, emoji=emoji)
+        else:
+            payloads.append(build_machine_payload(doc, results, total, max_total))
+        if total < min_pass and rc == 0:
+            rc = 2
+    if fmt == "json":
+        print(json.dumps(payloads, indent=2, ensure_ascii=False))
+    elif fmt == "yaml":
+        print(yaml.safe_dump(payloads, sort_keys=False, allow_unicode=True))
+    return rc
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
-    args = build_arg_parser().parse_args(argv)
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    if args.all:
+        paths = discover_skills(args.path or ["."])
+    elif args.path:
+        paths = [resolve_skill_md_path(p) for p in args.path]
+    else:
+        parser.error("a skill path is required (or use --all)")
+
+    if args.format == "jsonl":
+        return _stream_jsonl(paths, min_pass=args.min_pass)
+    if args.format == "sarif":
+        return _print_sarif(paths, min_pass=args.min_pass)
+
+    if len(paths) > 1:
+        return _report_many(paths, fmt=args.format, min_pass=args.min_pass, emoji=not args.no_emoji)
 
     try:
-        doc = load_skill(args.path)
+        doc = load_skill(str(paths[0]))
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
         return 1
@@ -8,7 +8,7 @@ import re
 import sys
 from pathlib import Path
 
-import yaml
+from skill_doc import load_skill_doc
 
 TARGETS = ("portable", "codex", "claude")
 
@@ -44,6 +44,24 @@ def _target_keys(target: str) -> set[str] | None:
     return None
 
 
+# skill_doc's parse errors, mapped back to this script's established messages.
+_PARSE_ERRORS = (
+    ("SKILL.md is empty", "No YAML frontmatter found"),
+    ("SKILL.md has no content", "No YAML frontmatter found"),
+    ("Missing YAML frontmatter", "No YAML frontmatter found"),
+    ("Unterminated YAML frontmatter", "Invalid frontmatter format"),
+    ("Frontmatter YAML must be a mapping", "Frontmatter must be a YAML dictionary"),
+)
+
+
+def _parse_error_message(error: ValueError) -> str:
+    message = str(error)
+    for prefix, legacy in _PARSE_ERRORS:
+        if message.startswith(prefix):
+            return legacy
+    return message
+
+
 def validate_skill(skill_path: str, *, target: str = "portable"):
     """Basic validation of a skill"""
     warnings: list[str] = []
@@ -56,22 +74,16 @@ def validate_skill(skill_path: str, *, target: str = "portable"):
     if not skill_md.exists():
         return False, "SKILL.md not found", warnings
 
-    content = skill_md.read_text()
-    if not content.startswith("---"):
+    try:
+        doc = load_skill_doc(str(skill_md))
+    except ValueError as e:
+        return False, _parse_error_message(e), warnings
+    if doc.fm_start_line != 1:
         return False, "No YAML frontmatter found", warnings
 
-    match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-    if not match:
-        return False, "Invalid frontmatter format", warnings
-
-    frontmatter_text = match.group(1)
-
-    try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-        if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary", warnings
-    except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}", warnings
+    frontmatter = doc.frontmatter
+    if not frontmatter:
+        return False, "Frontmatter must be a YAML dictionary", warnings
 
     allowed_properties = _target_keys(target)
     if allowed_properties is not None:
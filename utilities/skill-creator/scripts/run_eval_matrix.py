@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+run_eval_matrix.py
+
+Run the evals of many skills against several runners and models in one
+invocation, with a single bounded worker pool shared by every case.
+
+- Discovers every SKILL.md with references/evals.yaml under the given roots
+- Expands (skill x runner x model) into matrix cells; each cell is a normal
+  run_skill_evals run (same report layout, summary.json and history entry)
+- All cases of all cells share one --jobs budget
+- Prints one matrix report: pass rate and case latency per (skill, runner, model)
+
+Usage:
+  python scripts/run_eval_matrix.py [root ...] --runner codex --runner claude \
+      --model codex:gpt-5 --model claude:sonnet [--jobs N] [--format json]
+
+Models:
+  --model NAME applies to every runner; --model RUNNER:NAME to one runner.
+  Without --model each runner uses its default model.
+
+Exit codes:
+  0  every case in every cell passed
+  1  parsing/IO error (any cell could not start)
+  2  one or more evals failed
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import run_skill_evals as rse
+from skill_doc import discover_skills
+
+
+RUNNERS = ("codex", "claude")
+
+
+@dataclass
+class MatrixCell:
+    skill_md: Path
+    runner: str
+    model: Optional[str]
+    skill_name: str = ""
+    run_id: str = ""
+    settings: Optional[rse.EvalSettings] = None
+    cases: List[rse.EvalCase] = field(default_factory=list)
+    case_dirs: List[Path] = field(default_factory=list)
+    schema_paths: List[Optional[Path]] = field(default_factory=list)
+    reports_base: Optional[Path] = None
+    tracker: Optional[rse.AbortTracker] = None
+    error: Optional[str] = None
+
+
+def discover_eval_skills(roots: Sequence[str]) -> List[Path]:
+    return [p for p in discover_skills(roots) if (p.parent / "references" / "evals.yaml").exists()]
+
+
+def models_for(runner: str, model_specs: Sequence[str]) -> List[Optional[str]]:
+    """Models that apply to `runner`: bare names apply to all runners, `runner:name` to one."""
+    models: List[Optional[str]] = []
+    for spec in model_specs:
+        prefix, sep, name = spec.partition(":")
+        if sep and prefix in RUNNERS:
+            if prefix == runner:
+                models.append(name)
+        else:
+            models.append(spec)
+    return models or [None]
+
+
+def _skill_name_or_none(skill_md: Path) -> Optional[str]:
+    try:
+        return rse.load_skill_name(skill_md)
+    except (OSError, ValueError):
+        return None
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", text).strip("-")
+
+
+def cell_run_id(base_run_id: str, runner: str, model: Optional[str]) -> str:
+    """Unique per cell so cells of one skill get separate report dirs and history runs."""
+    return f"{base_run_id}-{runner}" + (f"-{_slug(model)}" if model else "")
+
+
+def prepare_cell(
+    cell: MatrixCell,
+    args: argparse.Namespace,
+    *,
+    base_run_id: str,
+    reports_dir: Path,
+    policy: rse.AbortPolicy,
+) -> None:
+    """Load the skill's evals and resolve everything a cell needs; failures set `cell.error`."""
+    try:
+        cell.skill_name = rse.load_skill_name(cell.skill_md)
+        cell.cases = rse.load_evals(cell.skill_md.parent / "references" / "evals.yaml")
+        cell.settings = rse.settings_from_args(
+            args, cell.skill_md, cell.skill_name, runner=cell.runner, model=cell.model, reports_dir=reports_dir
+        )
+        cell.schema_paths = [rse.resolve_schema_path(cell.settings.skill_dir, c) for c in cell.cases]
+    except (OSError, ValueError) as e:
+        cell.skill_name = cell.skill_name or cell.skill_md.parent.name
+        cell.error = str(e)
+        return
+    cell.run_id = cell_run_id(base_run_id, cell.runner, cell.model)
+    cell.reports_base = reports_dir / cell.skill_name / cell.run_id
+    cell.reports_base.mkdir(parents=True, exist_ok=True)
+    cell.case_dirs = [cell.reports_base / rse.case_dir_name(i, c) for i, c in enumerate(cell.cases, 1)]
+    cell.tracker = rse.AbortTracker(policy)
+
+
+def run_matrix(
+    cells: Sequence[MatrixCell],
+    *,
+    jobs: int,
+    cache: Optional[rse.ResponseCache],
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Run every case of every ready cell on one pool of `jobs` workers.
+
+    Cases are queued cell by cell; each cell keeps its own abort tracker, so
+    a cell whose runner is unhealthy skips its remaining cases without
+    holding up the others.
+    """
+    work: List[Tuple[int, int]] = [
+        (ci, i) for ci, cell in enumerate(cells) if cell.error is None for i in range(len(cell.cases))
+    ]
+    records: Dict[int, List[Dict[str, Any]]] = {ci: [] for ci, cell in enumerate(cells) if cell.error is None}
+    if not work:
+        return records
+
+    def task(ci: int, i: int) -> Dict[str, Any]:
+        cell = cells[ci]
+        assert cell.settings is not None and cell.tracker is not None
+        return rse.run_case_guarded(
+            cell.settings, cell.cases[i], cell.case_dirs[i], cell.schema_paths[i], cache, cell.tracker
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(work)))) as pool:
+        futures = [(ci, pool.submit(task, ci, i)) for ci, i in work]
+        for ci, fut in futures:
+            records[ci].append(fut.result())
+    return records
+
+
+def _latencies(case_records: Sequence[Dict[str, Any]]) -> List[float]:
+    return [
+        r["attempt_wall_sec"]
+        for r in case_records
+        if not r.get("skipped") and not r.get("cached") and r.get("attempt_wall_sec") is not None
+    ]
+
+
+def matrix_row(cell: MatrixCell, summary: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {
+        "skill": cell.skill_name,
+        "skill_path": str(cell.skill_md.parent),
+        "runner": cell.runner,
+        "model": (summary or {}).get("model") or cell.model,
+    }
+    if summary is None:
+        row.update({"error": cell.error, "passed": False})
+        return row
+    case_records = summary["cases"]
+    passed = sum(1 for r in case_records if r["passed"])
+    skipped = sum(1 for r in case_records if r.get("skipped"))
+    times = _latencies(case_records)
+    row.update(
+        {
+            "run_id": summary["run_id"],
+            "cases": len(case_records),
+            "passed_cases": passed,
+            "failed_cases": len(case_records) - passed - skipped,
+            "skipped_cases": skipped,
+            "pass_rate": round(passed / len(case_records), 3) if case_records else None,
+            "p50_sec": rse.percentile(times, 50),
+            "p95_sec": rse.percentile(times, 95),
+            "aborted": summary["aborted"],
+            "passed": summary["passed"],
+            "reports": str(cell.reports_base),
+        }
+    )
+    return row
+
+
+def _fmt_sec(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v:.2f}s"
+
+
+def print_matrix(rows: Sequence[Dict[str, Any]], report_path: Path) -> None:
+    print(f"Eval matrix: {len(rows)} cell(s)")
+    print(f"Report: {report_path}")
+    for r in rows:
+        label = f"{r['skill']} | {r['runner']} | {r['model'] or 'default'}"
+        if r.get("error"):
+            print(f"- ERROR {label}: {r['error']}")
+            continue
+        status = "PASS" if r["passed"] else "FAIL"
+        rate = "-" if r["pass_rate"] is None else f"{r['pass_rate']:.0%}"
+        print(
+            f"- {status} {label}: {r['passed_cases']}/{r['cases']} ({rate})"
+            f"  p50 {_fmt_sec(r['p50_sec'])}  p95 {_fmt_sec(r['p95_sec'])}"
+            + (f"  skipped {r['skipped_cases']}" if r["skipped_cases"] else "")
+        )
+        if r["aborted"]:
+            print(f"    aborted: {r['aborted']}")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="run_eval_matrix.py",
+        description="Run evals for many skills across runners and models with one shared worker pool.",
+    )
+    p.add_argument("path", nargs="*", help="Root directories (or skill dirs) to search for evals (default: .).")
+    p.add_argument("--skill", action="append", default=[], help="Only skills with this name (repeatable).")
+    p.add_argument(
+        "--runner",
+        action="append",
+        choices=list(RUNNERS),
+        default=[],
+        help="Runner to include (repeatable; default: claude).",
+    )
+    p.add_argument(
+        "--model",
+        action="append",
+        default=[],
+        help="Model to include (repeatable). NAME applies to every runner, RUNNER:NAME to one.",
+    )
+    p.add_argument("--jobs", type=int, default=4, help="Total concurrent cases across the whole matrix (default: 4).")
+    p.add_argument("--format", choices=["text", "json"], default="text")
+    rse.add_run_arguments(p)
+    return p
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    skill_paths = discover_eval_skills(args.path or ["."])
+    if args.skill:
+        skill_paths = [p for p in skill_paths if _skill_name_or_none(p) in set(args.skill)]
+    runners = list(dict.fromkeys(args.runner)) or ["claude"]
+    if args.capture_jsonl and "claude" in runners:
+        print("WARN: --capture-jsonl is Codex-only; ignored for Claude cells.", file=sys.stderr)
+
+    started_at = dt.datetime.now()
+    base_run_id = started_at.strftime("%Y%m%d-%H%M%S")
+    reports_dir = Path(args.reports_dir).expanduser().resolve()
+    policy = rse.abort_policy_from_args(args)
+
+    cells = [
+        MatrixCell(skill_md=p, runner=runner, model=model)
+        for p in skill_paths
+        for runner in runners
+        for model in models_for(runner, args.model)
+    ]
+    if not cells:
+        print("ERROR: no skills with references/evals.yaml found.", file=sys.stderr)
+        return 1
+
+    for cell in cells:
+        prepare_cell(cell, args, base_run_id=base_run_id, reports_dir=reports_dir, policy=policy)
+
+    cache, cache_error = rse.response_cache_from_args(args)
+    if cache_error:
+        print(f"ERROR: {cache_error}", file=sys.stderr)
+        return 1
+    try:
+        records = run_matrix(cells, jobs=args.jobs, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    rows: List[Dict[str, Any]] = []
+    for ci, cell in enumerate(cells):
+        summary: Optional[Dict[str, Any]] = None
+        if cell.error is None:
+            assert cell.settings is not None and cell.tracker is not None and cell.reports_base is not None
+            summary = rse.build_summary(
+                cell.settings,
+                run_id=cell.run_id,
+                started_at=started_at,
+                case_records=records[ci],
+                aborted=cell.tracker.reason,
+            )
+            rse.record_run(summary, cell.reports_base, reports_dir, history=not args.no_history)
+        rows.append(matrix_row(cell, summary))
+
+    report = {
+        "run_id": base_run_id,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "runners": runners,
+        "models": args.model,
+        "jobs": args.jobs,
+        "cells": rows,
+        "passed": all(r["passed"] for r in rows),
+    }
+    report_path = reports_dir / "matrix" / f"{base_run_id}.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.format == "json":
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_matrix(rows, report_path)
+        print(f"RESULT: {'PASS' if report['passed'] else 'FAIL'}")
+
+    if any(r.get("error") for r in rows):
+        return 1
+    return 0 if report["passed"] else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
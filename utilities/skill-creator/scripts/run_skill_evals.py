@@ -9,9 +9,27 @@ Run evaluation cases for a Codex skill using Claude Code CLI (default) or Codex
 - For each case, runs: codex exec (optionally with --output-schema) or claude -p (headless)
 - Captures final output via --output-last-message (-o)
 - Applies acceptance assertions and exits non-zero on failures
+- With --jobs N, up to N cases run concurrently; report dirs and summary order stay by case index
+- stdout/stderr (and the Codex --json event stream) are streamed straight into the
+  case files, so memory stays flat and partial output survives a timeout; turn and
+  tool-call counts are parsed from the event stream as it arrives (--progress)
+- Per-case `timeout_sec` and `retries` in evals.yaml; transient non-zero exits are
+  retried with exponential backoff. Cases without `timeout_sec` get a timeout
+  derived from their recorded p95 latency once the history has enough samples.
+- --fail-fast / --max-failures N stop scheduling after failures; consecutive timeouts
+  or a missing CLI (exit 124/127, --breaker-threshold) trip a circuit breaker.
+  Unscheduled cases are reported as skipped.
+- Successful CLI responses are stored in a content-addressed cache; --replay grades
+  cached responses again without calling the CLI (useful while tuning assertions)
+- Every run is also indexed in <reports-dir>/history.sqlite; the `history`
+  subcommand reports p50/p95 case latency, flaky cases and regressions
+- Each case records CLI wall time, CPU user/sys time, peak RSS, stdout/stderr
+  byte counts and whether it timed out (`resources` in result.json/summary.json)
 
 Usage:
-  python scripts/run_skill_evals.py <path/to/skill-dir-or-SKILL.md>
+  python scripts/run_skill_evals.py <path/to/skill-dir-or-SKILL.md> [--jobs N] [--fail-fast | --max-failures N]
+  python scripts/run_skill_evals.py <path/to/skill-dir-or-SKILL.md> --replay
+  python scripts/run_skill_evals.py history [--skill NAME] [--last N] [--format json]
 
 Exit codes:
   0  all evals passed
@@ -23,70 +41,31 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
+import hashlib
 import json
+import math
 import os
 import re
+import shutil
+import signal
+import sqlite3
 import subprocess
 import sys
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import yaml
 
-
-_FM_DELIM = re.compile(r"^\s*---\s*$")
-
-
-def _resolve_skill_md_path(path_like: str) -> Path:
-    p = Path(path_like).expanduser().resolve()
-    return (p / "SKILL.md") if p.is_dir() else p
-
-
-def _read_text(path: Path) -> str:
-    try:
-        return path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        return path.read_text(encoding="utf-8", errors="replace")
-
-
-def _parse_frontmatter(raw: str) -> Tuple[Dict[str, Any], str]:
-    lines = raw.splitlines(keepends=True)
-    if not lines:
-        raise ValueError("SKILL.md is empty")
-
-    start_idx: Optional[int] = None
-    for i, line in enumerate(lines):
-        if line.strip():
-            start_idx = i
-            break
-    if start_idx is None or not _FM_DELIM.match(lines[start_idx]):
-        raise ValueError("Missing YAML frontmatter. Expected `---` as first non-empty line.")
-
-    end_idx: Optional[int] = None
-    for j in range(start_idx + 1, len(lines)):
-        if _FM_DELIM.match(lines[j]):
-            end_idx = j
-            break
-    if end_idx is None:
-        raise ValueError("Unterminated YAML frontmatter. Missing closing `---`.")
-
-    yaml_text = "".join(lines[start_idx + 1 : end_idx])
-    fm_obj = yaml.safe_load(yaml_text)
-    if fm_obj is None:
-        fm: Dict[str, Any] = {}
-    elif isinstance(fm_obj, dict):
-        fm = fm_obj
-    else:
-        raise ValueError("Frontmatter YAML must be a mapping/object.")
-
-    body = "".join(lines[end_idx + 1 :]).lstrip("\n")
-    return fm, body
+from skill_doc import load_skill_doc, resolve_skill_md_path as _resolve_skill_md_path
 
 
 def load_skill_name(skill_md_path: Path) -> str:
-    raw = _read_text(skill_md_path)
-    fm, _ = _parse_frontmatter(raw)
+    fm = load_skill_doc(str(skill_md_path)).frontmatter
     name = fm.get("name")
     if not isinstance(name, str) or not name.strip():
         raise ValueError("SKILL.md frontmatter missing valid `name`.")
@@ -102,10 +81,16 @@ class EvalCase:
     prompt: str
     acceptance: List[Assertion]
     output_schema: Optional[str] = None
+    plan: Optional["AssertionPlan"] = field(default=None, compare=False, repr=False)
+    timeout_sec: Optional[float] = None
+    retries: Optional[int] = None
 
 
 def load_evals(evals_path: Path) -> List[EvalCase]:
-    obj = yaml.safe_load(evals_path.read_text(encoding="utf-8"))
+    try:
+        obj = yaml.safe_load(evals_path.read_text(encoding="utf-8"))
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML: {e}") from e
     if not isinstance(obj, dict) or "cases" not in obj or not isinstance(obj["cases"], list):
         raise ValueError("evals.yaml must be a mapping with `cases: [...]`.")
 
@@ -118,6 +103,16 @@ def load_evals(evals_path: Path) -> List[EvalCase]:
                 raise ValueError(f"Case #{i} missing `{k}`.")
         if not isinstance(c["acceptance"], list):
             raise ValueError(f"Case #{i} `acceptance` must be a list.")
+        try:
+            plan = compile_assertions(c["acceptance"])
+        except ValueError as e:
+            raise ValueError(f"Case #{i} ({c['name']}): {e}") from e
+        timeout_sec = c.get("timeout_sec")
+        if timeout_sec is not None and (isinstance(timeout_sec, bool) or not isinstance(timeout_sec, (int, float)) or timeout_sec <= 0):
+            raise ValueError(f"Case #{i} `timeout_sec` must be a positive number.")
+        retries = c.get("retries")
+        if retries is not None and (isinstance(retries, bool) or not isinstance(retries, int) or retries < 0):
+            raise ValueError(f"Case #{i} `retries` must be a non-negative integer.")
 
         cases.append(
             EvalCase(
@@ -125,27 +120,50 @@ def load_evals(evals_path: Path) -> List[EvalCase]:
                 prompt=str(c["prompt"]),
                 acceptance=list(c["acceptance"]),
                 output_schema=str(c["output_schema"]) if "output_schema" in c and c["output_schema"] else None,
+                plan=plan,
+                timeout_sec=float(timeout_sec) if timeout_sec is not None else None,
+                retries=retries,
             )
         )
     return cases
 
 
-def _json_get_path(obj: Any, path: str) -> Any:
+# -----------------------------
+# Assertions
+# -----------------------------
+#
+# Each case's acceptance list is compiled once into an AssertionPlan: regexes
+# are compiled, JSON paths are tokenized, and the JSON document is serialized
+# at most once per evaluation (only if a text assertion needs it).
+
+_TEXT_TYPES = ("contains", "not_contains", "regex", "not_regex")
+_JSON_TYPES = ("jsonpath_equals", "jsonpath_exists", "jsonpath_matches", "jsonpath_range", "jsonpath_length")
+_PATH_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\[\d+\]")
+
+PathTokens = Tuple[Union[str, int], ...]
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_path(path: str) -> PathTokens:
+    return tuple(int(t[1:-1]) if t.startswith("[") else t for t in _PATH_TOKEN_RE.findall(path))
+
+
+def _get_path(obj: Any, tokens: PathTokens, path: str) -> Any:
     cur = obj
-    tokens = re.findall(r"[A-Za-z_][A-Za-z0-9_]*|\[\d+\]", path)
     for t in tokens:
-        if t.startswith("["):
-            idx = int(t[1:-1])
-            if not isinstance(cur, list) or idx >= len(cur):
+        if isinstance(t, int):
+            if not isinstance(cur, list) or t >= len(cur):
                 raise KeyError(path)
-            cur = cur[idx]
-        else:
-            if not isinstance(cur, dict) or t not in cur:
-                raise KeyError(path)
-            cur = cur[t]
+        elif not isinstance(cur, dict) or t not in cur:
+            raise KeyError(path)
+        cur = cur[t]
     return cur
 
 
+def _json_get_path(obj: Any, path: str) -> Any:
+    return _get_path(obj, _compile_path(path), path)
+
+
 def _normalize_assert(a: Assertion) -> Dict[str, Any]:
     if isinstance(a, str):
         s = a.strip()
@@ -160,73 +178,458 @@ def _normalize_assert(a: Assertion) -> Dict[str, Any]:
         return {"type": "contains", "value": s}
 
     if isinstance(a, dict):
-        if "type" not in a:
-            raise ValueError("Assertion dict must include `type`.")
-        return dict(a)
+        if "type" in a:
+            return dict(a)
+        # Shorthand used by evals.template.yaml: `- contains: "x"` or `- jsonpath_equals: {path: ..., value: ...}`.
+        if len(a) == 1:
+            ((t, v),) = a.items()
+            if t in _TEXT_TYPES:
+                return {"type": t, "value": v}
+            if t in _JSON_TYPES and isinstance(v, dict):
+                return {"type": t, **v}
+        raise ValueError("Assertion dict must include `type`.")
 
     raise ValueError("Assertion must be a string or mapping.")
 
 
-def evaluate_assertions_text(text: str, assertions: List[Assertion]) -> List[str]:
-    failures: List[str] = []
-    for raw in assertions:
-        a = _normalize_assert(raw)
-        t = a["type"]
-        v = a.get("value", "")
-
-        if t == "contains":
-            if v not in text:
-                failures.append(f"contains failed: {v!r}")
-        elif t == "not_contains":
-            if v in text:
-                failures.append(f"not_contains failed: {v!r}")
-        elif t == "regex":
-            if not re.search(v, text, flags=re.MULTILINE):
-                failures.append(f"regex failed: /{v}/")
-        elif t == "not_regex":
-            if re.search(v, text, flags=re.MULTILINE):
-                failures.append(f"not_regex failed: /{v}/")
-        else:
-            failures.append(f"unsupported assertion type for text output: {t!r}")
-    return failures
+class _Subject:
+    """Output under test. For JSON output, the text form is serialized lazily, once."""
 
+    __slots__ = ("obj", "_text")
 
-def evaluate_assertions_json(obj: Any, assertions: List[Assertion]) -> List[str]:
-    failures: List[str] = []
-    for raw in assertions:
-        a = _normalize_assert(raw)
-        t = a["type"]
+    def __init__(self, *, text: Optional[str] = None, obj: Any = None) -> None:
+        self.obj = obj
+        self._text = text
 
-        if t in ("contains", "not_contains", "regex", "not_regex"):
-            text = json.dumps(obj, ensure_ascii=False, indent=2)
-            failures.extend(evaluate_assertions_text(text, [a]))
-            continue
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = json.dumps(self.obj, ensure_ascii=False, indent=2)
+        return self._text
 
-        if t == "jsonpath_equals":
-            path = a.get("path")
-            expected = a.get("value")
-            if not isinstance(path, str) or path.strip() == "":
-                failures.append("jsonpath_equals missing `path`")
-                continue
-            try:
-                got = _json_get_path(obj, path)
-            except KeyError:
-                failures.append(f"jsonpath_equals missing path: {path}")
+
+Check = Callable[[_Subject], Optional[str]]
+
+
+@dataclass(frozen=True)
+class CompiledAssertion:
+    type: str
+    json_only: bool
+    check: Optional[Check]  # None: unsupported type
+
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _bounds(a: Dict[str, Any], t: str) -> Tuple[Optional[float], Optional[float]]:
+    lo, hi = a.get("min"), a.get("max")
+    for name, v in (("min", lo), ("max", hi)):
+        if v is not None and not _is_number(v):
+            raise ValueError(f"{t} `{name}` must be a number, got {v!r}")
+    return lo, hi
+
+
+def _describe_bounds(lo: Optional[float], hi: Optional[float]) -> str:
+    return f"{'' if lo is None else lo}..{'' if hi is None else hi}"
+
+
+def _compile_text(t: str, v: Any) -> Check:
+    v = "" if v is None else str(v)
+    if t == "contains":
+        return lambda s: None if v in s.text else f"contains failed: {v!r}"
+    if t == "not_contains":
+        return lambda s: f"not_contains failed: {v!r}" if v in s.text else None
+    try:
+        rx = re.compile(v, flags=re.MULTILINE)
+    except re.error as e:
+        raise ValueError(f"invalid {t} pattern /{v}/: {e}") from e
+    if t == "regex":
+        return lambda s: None if rx.search(s.text) else f"regex failed: /{v}/"
+    return lambda s: f"not_regex failed: /{v}/" if rx.search(s.text) else None
+
+
+def _compile_json(t: str, a: Dict[str, Any]) -> Check:
+    path = a.get("path")
+    if not isinstance(path, str) or path.strip() == "":
+        msg = f"{t} missing `path`"
+        return lambda s: msg
+    tokens = _compile_path(path)
+
+    def lookup(s: _Subject, on_missing: str) -> Tuple[Any, Optional[str]]:
+        try:
+            return _get_path(s.obj, tokens, path), None
+        except KeyError:
+            return None, on_missing
+
+    if t == "jsonpath_exists":
+        return lambda s: lookup(s, f"jsonpath_exists failed (missing): {path}")[1]
+
+    missing = f"{t} missing path: {path}"
+
+    if t == "jsonpath_equals":
+        expected = a.get("value")
+
+        def check_equals(s: _Subject) -> Optional[str]:
+            got, err = lookup(s, missing)
+            if err or got == expected:
+                return err
+            return f"jsonpath_equals failed at {path}: got={got!r} expected={expected!r}"
+
+        return check_equals
+
+    if t == "jsonpath_matches":
+        pattern = str(a.get("value", ""))
+        try:
+            rx = re.compile(pattern, flags=re.MULTILINE)
+        except re.error as e:
+            raise ValueError(f"invalid jsonpath_matches pattern /{pattern}/: {e}") from e
+
+        def check_matches(s: _Subject) -> Optional[str]:
+            got, err = lookup(s, missing)
+            if err:
+                return err
+            text = got if isinstance(got, str) else json.dumps(got, ensure_ascii=False)
+            return None if rx.search(text) else f"jsonpath_matches failed at {path}: /{pattern}/ got={got!r}"
+
+        return check_matches
+
+    if t == "jsonpath_range":
+        lo, hi = _bounds(a, t)
+        if lo is None and hi is None:
+            raise ValueError("jsonpath_range needs `min` and/or `max`")
+        want = _describe_bounds(lo, hi)
+
+        def check_range(s: _Subject) -> Optional[str]:
+            got, err = lookup(s, missing)
+            if err:
+                return err
+            if not _is_number(got):
+                return f"jsonpath_range failed at {path}: got non-number {got!r}"
+            if (lo is not None and got < lo) or (hi is not None and got > hi):
+                return f"jsonpath_range failed at {path}: got={got!r} expected {want}"
+            return None
+
+        return check_range
+
+    # jsonpath_length: exact `value`, or `min`/`max` bounds.
+    exact = a.get("value")
+    if exact is not None and (not isinstance(exact, int) or isinstance(exact, bool)):
+        raise ValueError(f"jsonpath_length `value` must be an integer, got {exact!r}")
+    lo, hi = (exact, exact) if exact is not None else _bounds(a, t)
+    if lo is None and hi is None:
+        raise ValueError("jsonpath_length needs `value`, `min` or `max`")
+    want = str(exact) if exact is not None else _describe_bounds(lo, hi)
+
+    def check_length(s: _Subject) -> Optional[str]:
+        got, err = lookup(s, missing)
+        if err:
+            return err
+        if not isinstance(got, (list, dict, str)):
+            return f"jsonpath_length failed at {path}: got {type(got).__name__}, expected array/object/string"
+        n = len(got)
+        if (lo is not None and n < lo) or (hi is not None and n > hi):
+            return f"jsonpath_length failed at {path}: length={n} expected {want}"
+        return None
+
+    return check_length
+
+
+def compile_assertion(raw: Assertion) -> CompiledAssertion:
+    a = _normalize_assert(raw)
+    t = a["type"]
+    if t in _TEXT_TYPES:
+        return CompiledAssertion(t, False, _compile_text(t, a.get("value", "")))
+    if t in _JSON_TYPES:
+        return CompiledAssertion(t, True, _compile_json(t, a))
+    return CompiledAssertion(t, False, None)
+
+
+@dataclass(frozen=True)
+class AssertionPlan:
+    assertions: Tuple[CompiledAssertion, ...]
+
+    def evaluate_text(self, text: str) -> List[str]:
+        subject = _Subject(text=text)
+        failures: List[str] = []
+        for ca in self.assertions:
+            if ca.check is None or ca.json_only:
+                failures.append(f"unsupported assertion type for text output: {ca.type!r}")
                 continue
-            if got != expected:
-                failures.append(f"jsonpath_equals failed at {path}: got={got!r} expected={expected!r}")
-        elif t == "jsonpath_exists":
-            path = a.get("path")
-            if not isinstance(path, str) or path.strip() == "":
-                failures.append("jsonpath_exists missing `path`")
+            msg = ca.check(subject)
+            if msg:
+                failures.append(msg)
+        return failures
+
+    def evaluate_json(self, obj: Any) -> List[str]:
+        subject = _Subject(obj=obj)
+        failures: List[str] = []
+        for ca in self.assertions:
+            if ca.check is None:
+                failures.append(f"unsupported assertion type for json output: {ca.type!r}")
                 continue
-            try:
-                _json_get_path(obj, path)
-            except KeyError:
-                failures.append(f"jsonpath_exists failed (missing): {path}")
-        else:
-            failures.append(f"unsupported assertion type for json output: {t!r}")
-    return failures
+            msg = ca.check(subject)
+            if msg:
+                failures.append(msg)
+        return failures
+
+
+def compile_assertions(assertions: Sequence[Assertion]) -> AssertionPlan:
+    """Compile an acceptance list once; raises ValueError for malformed assertions."""
+    return AssertionPlan(tuple(compile_assertion(a) for a in assertions))
+
+
+def _plan_for(case: EvalCase) -> AssertionPlan:
+    return case.plan if case.plan is not None else compile_assertions(case.acceptance)
+
+
+def evaluate_assertions_text(text: str, assertions: List[Assertion]) -> List[str]:
+    return compile_assertions(assertions).evaluate_text(text)
+
+
+def evaluate_assertions_json(obj: Any, assertions: List[Assertion]) -> List[str]:
+    return compile_assertions(assertions).evaluate_json(obj)
+
+
+@dataclass(frozen=True)
+class ProcessResult:
+    """
+    Outcome of one CLI invocation.
+
+    `stdout`/`stderr` are only populated when the output was captured in
+    memory; when streamed to files they are empty and the byte counts are the
+    source of truth.
+    """
+
+    rc: int
+    stdout: str
+    stderr: str
+    wall_sec: float = 0.0
+    cpu_user_sec: Optional[float] = None
+    cpu_sys_sec: Optional[float] = None
+    max_rss_kb: Optional[int] = None
+    stdout_bytes: int = 0
+    stderr_bytes: int = 0
+    timed_out: bool = False
+
+    def resources(self) -> Dict[str, Any]:
+        return {
+            "wall_sec": round(self.wall_sec, 3),
+            "cpu_user_sec": None if self.cpu_user_sec is None else round(self.cpu_user_sec, 3),
+            "cpu_sys_sec": None if self.cpu_sys_sec is None else round(self.cpu_sys_sec, 3),
+            "max_rss_kb": self.max_rss_kb,
+            "stdout_bytes": self.stdout_bytes,
+            "stderr_bytes": self.stderr_bytes,
+            "timed_out": self.timed_out,
+        }
+
+
+class EventProgress:
+    """
+    Incremental counters over a JSONL event stream (`codex exec --json`, or
+    Claude `--output-format stream-json`). Fed one line at a time; nothing is
+    buffered.
+    """
+
+    _TURN_EVENTS = {"turn.started", "task_started"}
+    _TOOL_ITEMS = {"command_execution", "mcp_tool_call", "web_search", "file_change"}
+    _TOOL_EVENTS = {"exec_command_begin", "mcp_tool_call_begin", "patch_apply_begin", "web_search_begin"}
+
+    def __init__(self, label: str = "", *, echo: bool = False) -> None:
+        self.label = label
+        self.echo = echo
+        self.events = 0
+        self.turns = 0
+        self.tool_calls = 0
+        self._lock = threading.Lock()
+
+    def feed(self, line: str) -> None:
+        line = line.strip()
+        if not line.startswith("{"):
+            return
+        try:
+            ev = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(ev, dict):
+            return
+        msg = ev.get("msg") if isinstance(ev.get("msg"), dict) else {}
+        etype = ev.get("type") or msg.get("type")
+        item = ev.get("item") if isinstance(ev.get("item"), dict) else {}
+
+        turns = tools = 0
+        if etype in self._TURN_EVENTS:
+            turns = 1
+        elif etype == "item.started" and item.get("type") in self._TOOL_ITEMS:
+            tools = 1
+        elif etype in self._TOOL_EVENTS:
+            tools = 1
+        elif etype == "assistant":
+            content = (ev.get("message") or {}).get("content") or []
+            turns = 1
+            tools = sum(1 for c in content if isinstance(c, dict) and c.get("type") == "tool_use")
+
+        with self._lock:
+            self.events += 1
+            self.turns += turns
+            self.tool_calls += tools
+            if self.echo and (turns or tools):
+                print(f"  [{self.label}] turns={self.turns} tool_calls={self.tool_calls}", file=sys.stderr, flush=True)
+
+    def summary(self) -> Dict[str, int]:
+        return {"events": self.events, "turns": self.turns, "tool_calls": self.tool_calls}
+
+
+def _maxrss_kb(usage: Any) -> int:
+    # ru_maxrss is bytes on macOS, kilobytes on Linux.
+    return int(usage.ru_maxrss // 1024) if sys.platform == "darwin" else int(usage.ru_maxrss)
+
+
+def _drain(
+    stream: Any,
+    paths: Sequence[Path],
+    sink: Optional[List[str]],
+    counter: List[int],
+    on_line: Optional[Callable[[str], None]],
+) -> None:
+    """Copy a child pipe line by line into `paths` (line-buffered, so partial output survives a kill)."""
+    files = [p.open("w", encoding="utf-8", buffering=1) for p in paths]
+    try:
+        for line in stream:
+            counter[0] += len(line.encode("utf-8", errors="replace"))
+            for f in files:
+                f.write(line)
+            if sink is not None:
+                sink.append(line)
+            if on_line is not None:
+                try:
+                    on_line(line)
+                except Exception:
+                    pass
+    finally:
+        for f in files:
+            f.close()
+        stream.close()
+
+
+def _run_child(
+    cmd: List[str],
+    *,
+    input_text: str,
+    cwd: Path,
+    timeout: float,
+    env: Optional[Dict[str, str]] = None,
+    stdout_paths: Sequence[Path] = (),
+    stderr_path: Optional[Path] = None,
+    on_stdout_line: Optional[Callable[[str], None]] = None,
+) -> ProcessResult:
+    """
+    Run `cmd` with `input_text` on stdin, plus resource usage.
+
+    stdout is streamed into every path in `stdout_paths` (and stderr into
+    `stderr_path`) as it arrives; a stream with no destination is captured in
+    memory instead. The child is reaped with os.wait4, so CPU time and peak
+    RSS are this child's own (RUSAGE_CHILDREN deltas would mix cases under
+    --jobs). Raises FileNotFoundError if the executable is missing.
+    """
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env,
+        cwd=cwd,
+    )
+
+    out: Optional[List[str]] = None if stdout_paths else []
+    err: Optional[List[str]] = None if stderr_path else []
+    out_bytes, err_bytes = [0], [0]
+
+    def result(*, usage: Any = None, timed_out: bool = False) -> ProcessResult:
+        return ProcessResult(
+            rc=proc.returncode,
+            stdout="".join(out or ()),
+            stderr="".join(err or ()),
+            wall_sec=time.monotonic() - started,
+            cpu_user_sec=usage.ru_utime if usage is not None else None,
+            cpu_sys_sec=usage.ru_stime if usage is not None else None,
+            max_rss_kb=_maxrss_kb(usage) if usage is not None else None,
+            stdout_bytes=out_bytes[0],
+            stderr_bytes=err_bytes[0],
+            timed_out=timed_out,
+        )
+
+    def feed() -> None:
+        try:
+            assert proc.stdin is not None
+            proc.stdin.write(input_text)
+            proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    pumps = [
+        threading.Thread(target=feed, daemon=True),
+        threading.Thread(
+            target=_drain, args=(proc.stdout, list(stdout_paths), out, out_bytes, on_stdout_line), daemon=True
+        ),
+        threading.Thread(
+            target=_drain, args=(proc.stderr, [stderr_path] if stderr_path else [], err, err_bytes, None), daemon=True
+        ),
+    ]
+    for t in pumps:
+        t.start()
+
+    if not hasattr(os, "wait4"):
+        try:
+            proc.wait(timeout=timeout)
+            timed_out = False
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            timed_out = True
+        for t in pumps:
+            t.join(1.0 if timed_out else None)
+        return result(timed_out=timed_out)
+
+    reaped: Dict[str, Any] = {}
+
+    def reap() -> None:
+        _, status, usage = os.wait4(proc.pid, 0)
+        reaped["status"], reaped["usage"] = status, usage
+
+    reaper = threading.Thread(target=reap, daemon=True)
+    reaper.start()
+
+    reaper.join(timeout)
+    timed_out = reaper.is_alive()
+    if timed_out:
+        try:
+            os.kill(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        reaper.join()
+    for t in pumps:
+        # After a timeout, grandchildren may still hold the pipes open; what
+        # they wrote so far is already on disk, so don't wait on them.
+        t.join(1.0 if timed_out else None)
+
+    proc.returncode = os.waitstatus_to_exitcode(reaped["status"])
+    return result(usage=reaped["usage"], timed_out=timed_out)
+
+
+def _runner_error(res: ProcessResult, rc: int, message: str, stderr_path: Optional[Path]) -> ProcessResult:
+    """Replace the exit code and report `message` on stderr, keeping any output already captured."""
+    if stderr_path is not None:
+        with stderr_path.open("a", encoding="utf-8") as f:
+            f.write(("\n" if res.stderr_bytes else "") + message + "\n")
+        return replace(res, rc=rc)
+    return replace(res, rc=rc, stderr=(res.stderr + "\n" if res.stderr else "") + message)
+
+
+def default_timeout_sec() -> float:
+    return float(os.environ.get("CODEX_EVAL_TIMEOUT_SEC", "60"))
 
 
 def run_codex_exec(
@@ -243,7 +646,11 @@ def run_codex_exec(
     jsonl_path: Optional[Path],
     codex_bin: Optional[Path],
     extra_codex_args: Optional[List[str]] = None,
-) -> Tuple[int, str, str]:
+    timeout: Optional[float] = None,
+    stdout_path: Optional[Path] = None,
+    stderr_path: Optional[Path] = None,
+    on_event: Optional[Callable[[str], None]] = None,
+) -> ProcessResult:
     if codex_bin:
         node_bin = codex_bin.parent / "node"
         if node_bin.exists():
@@ -298,27 +705,29 @@ def run_codex_exec(
         env["PATH"] = f"{codex_bin.parent}{os.pathsep}{env.get('PATH', '')}"
 
     # Add a timeout to prevent hangs; default 60s, override with CODEX_EVAL_TIMEOUT_SEC
-    timeout = float(os.environ.get("CODEX_EVAL_TIMEOUT_SEC", "60"))
+    if timeout is None:
+        timeout = default_timeout_sec()
 
+    # stdout is the --json event stream when jsonl_path is set: stream it to disk rather than hold it.
+    stdout_paths = [p for p in (stdout_path, jsonl_path) if p is not None]
     try:
-        proc = subprocess.run(
+        res = _run_child(
             cmd,
-            input=prompt,
-            text=True,
-            capture_output=True,
+            input_text=prompt,
             env=env,
             cwd=workspace_root,
             timeout=timeout,
+            stdout_paths=stdout_paths,
+            stderr_path=stderr_path,
+            on_stdout_line=on_event if jsonl_path else None,
         )
     except FileNotFoundError:
-        return 127, "", "codex CLI not found on PATH. Install it (for example: npm i -g @openai/codex)."
-    except subprocess.TimeoutExpired:
-        return 124, "", f"codex exec timed out after {timeout} seconds."
-
-    if jsonl_path:
-        jsonl_path.write_text(proc.stdout, encoding="utf-8")
-
-    return proc.returncode, proc.stdout, proc.stderr
+        return _runner_error(
+            ProcessResult(0, "", ""), 127, "codex CLI not found on PATH. Install it (for example: npm i -g @openai/codex).", stderr_path
+        )
+    if res.timed_out:
+        return _runner_error(res, 124, f"codex exec timed out after {timeout} seconds.", stderr_path)
+    return res
 
 
 def run_claude_exec(
@@ -329,7 +738,11 @@ def run_claude_exec(
     claude_bin: Optional[Path],
     output_format: str,
     extra_claude_args: Optional[List[str]] = None,
-) -> Tuple[int, str, str]:
+    timeout: Optional[float] = None,
+    stdout_path: Optional[Path] = None,
+    stderr_path: Optional[Path] = None,
+    on_event: Optional[Callable[[str], None]] = None,
+) -> ProcessResult:
     if claude_bin:
         cmd = [str(claude_bin), "-p"]
     else:
@@ -339,24 +752,954 @@ def run_claude_exec(
     if extra_claude_args:
         cmd.extend(extra_claude_args)
 
-    timeout = float(os.environ.get("CODEX_EVAL_TIMEOUT_SEC", "60"))
+    if timeout is None:
+        timeout = default_timeout_sec()
 
     try:
-        proc = subprocess.run(
+        res = _run_child(
             cmd,
-            input=prompt,
-            text=True,
-            capture_output=True,
+            input_text=prompt,
             cwd=workspace_root,
             timeout=timeout,
+            stdout_paths=[stdout_path] if stdout_path else [],
+            stderr_path=stderr_path,
+            on_stdout_line=on_event if output_format == "stream-json" else None,
+        )
+    except FileNotFoundError:
+        return _runner_error(
+            ProcessResult(0, "", ""), 127, "claude CLI not found on PATH. Install Claude Code CLI and ensure it is on PATH.", stderr_path
+        )
+    if res.timed_out:
+        return _runner_error(res, 124, f"claude headless timed out after {timeout} seconds.", stderr_path)
+
+    if stdout_path:
+        shutil.copyfile(stdout_path, output_last_message_path)
+    else:
+        output_last_message_path.write_text(res.stdout or "", encoding="utf-8")
+    return res
+
+
+_DEFAULT_CACHE_PATH = ".cache/skill_evals.sqlite"
+_CACHE_SCHEMA_VERSION = 1
+# Grading only needs the final message; larger stdout/stderr streams are not cached.
+_CACHE_MAX_STREAM_BYTES = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    rc: int
+    stdout: str
+    stderr: str
+    final: str
+
+
+def _sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _optional_file_hash(path: Optional[Path]) -> Optional[str]:
+    if path is None:
+        return None
+    try:
+        return _sha256_bytes(path.read_bytes())
+    except OSError:
+        return None
+
+
+class ResponseCache:
+    """
+    Content-addressed store of CLI responses.
+
+    Keys come from `response_key`; only successful (rc == 0) responses are
+    stored, so timeouts and missing CLIs are never replayed. One connection is
+    shared by the worker threads behind a lock.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                skill TEXT NOT NULL,
+                case_name TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                rc INTEGER NOT NULL,
+                stdout TEXT NOT NULL,
+                stderr TEXT NOT NULL,
+                final TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rc, stdout, stderr, final FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def put(self, key: str, skill: str, case_name: str, response: CachedResponse) -> None:
+        if response.rc != 0:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, skill, case_name, created_at, rc, stdout, stderr, final)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, skill, case_name, time.time(), response.rc, response.stdout, response.stderr, response.final),
+            )
+            self._conn.commit()
+
+
+def open_response_cache(cache_path: Optional[str]) -> Optional[ResponseCache]:
+    if not cache_path:
+        return None
+    try:
+        return ResponseCache(Path(cache_path).expanduser())
+    except (OSError, sqlite3.Error) as e:
+        print(f"WARN: response cache disabled ({e}).", file=sys.stderr)
+        return None
+
+
+@dataclass(frozen=True)
+class EvalSettings:
+    """Runner configuration shared by every case of one eval run."""
+
+    skill_name: str
+    skill_dir: Path
+    workspace_root: Path
+    runner: str
+    sandbox: str
+    ask_for_approval: Optional[str]
+    model: Optional[str]
+    profile: Optional[str]
+    codex_home: Optional[Path]
+    codex_bin: Optional[Path]
+    claude_bin: Optional[Path]
+    claude_output_format: str
+    capture_jsonl: bool
+    codex_args: Tuple[str, ...] = ()
+    claude_args: Tuple[str, ...] = ()
+    skill_md_hash: str = ""
+    replay: bool = False
+    timeout_sec: float = 60.0
+    retries: int = 0
+    retry_backoff_sec: float = 1.0
+    adaptive_timeouts: Dict[str, float] = field(default_factory=dict)
+    progress: bool = False
+
+
+def effective_model(settings: EvalSettings) -> Optional[str]:
+    """--model for Codex; for Claude the model only arrives via --claude-arg=--model."""
+    if settings.model:
+        return settings.model
+    args = list(settings.claude_args if settings.runner == "claude" else settings.codex_args)
+    for i, a in enumerate(args):
+        if a == "--model" and i + 1 < len(args):
+            return args[i + 1]
+        if a.startswith("--model="):
+            return a.split("=", 1)[1]
+    return None
+
+
+def case_timeout(settings: EvalSettings, case: EvalCase) -> float:
+    """evals.yaml `timeout_sec`, else the history-derived timeout, else the run-wide default."""
+    if case.timeout_sec is not None:
+        return case.timeout_sec
+    return settings.adaptive_timeouts.get(case.name, settings.timeout_sec)
+
+
+_MAX_BACKOFF_SEC = 30.0
+_NON_TRANSIENT_EXIT_CODES = (0, 127)  # success, CLI not found
+
+
+def _backoff_delay(base_sec: float, attempt: int) -> float:
+    """Exponential backoff before retry number `attempt` (1-based): base, 2*base, 4*base, ..."""
+    return min(_MAX_BACKOFF_SEC, base_sec * (2 ** (attempt - 1)))
+
+
+def case_dir_name(idx: int, case: EvalCase) -> str:
+    """Report directory name for a case; depends only on its position and name, never on run order."""
+    return f"{idx:02d}-{re.sub(r'[^A-Za-z0-9_.-]+', '-', case.name).strip('-')}"
+
+
+def compose_prompt(skill_name: str, case: EvalCase) -> str:
+    return f"$" + skill_name + "\n\n" + case.prompt.strip() + "\n"
+
+
+def resolve_schema_path(skill_dir: Path, case: EvalCase) -> Optional[Path]:
+    if not case.output_schema:
+        return None
+    schema_path = Path(case.output_schema)
+    if not schema_path.is_absolute():
+        schema_path = (skill_dir / schema_path).resolve()
+    if not schema_path.exists():
+        raise FileNotFoundError(f"Case {case.name}: output_schema not found: {schema_path}")
+    return schema_path
+
+
+def response_key(settings: EvalSettings, composed_prompt: str, schema_path: Optional[Path]) -> str:
+    """Hash everything that can change the CLI response; assertions are deliberately excluded."""
+    material = {
+        "schema": _CACHE_SCHEMA_VERSION,
+        "prompt": composed_prompt,
+        "runner": settings.runner,
+        "model": settings.model,
+        "profile": settings.profile,
+        "sandbox": settings.sandbox,
+        "output_schema": _optional_file_hash(schema_path),
+        "skill_md": settings.skill_md_hash,
+        "claude_output_format": settings.claude_output_format if settings.runner == "claude" else None,
+        "extra_args": list(settings.claude_args if settings.runner == "claude" else settings.codex_args),
+    }
+    return _sha256_bytes(json.dumps(material, sort_keys=True).encode("utf-8"))
+
+
+def grade_output(
+    settings: EvalSettings,
+    case: EvalCase,
+    rc: int,
+    output_text: str,
+    schema_path: Optional[Path],
+) -> List[str]:
+    failures: List[str] = []
+    if rc != 0:
+        runner_label = "codex exec" if settings.runner == "codex" else "claude headless"
+        failures.append(f"{runner_label} returned non-zero exit code: {rc}")
+
+    if schema_path and settings.runner == "claude":
+        failures.append("Claude runner does not support output_schema; use Codex or text-only assertions.")
+
+    if settings.runner == "claude" and settings.claude_output_format == "json":
+        try:
+            parsed = json.loads(output_text)
+        except Exception as e:
+            failures.append(f"expected JSON output (Claude json format), but parsing failed: {e}")
+            parsed = None
+        if parsed is not None:
+            failures.extend(_plan_for(case).evaluate_json(parsed))
+    elif schema_path and settings.runner == "codex":
+        try:
+            parsed = json.loads(output_text)
+        except Exception as e:
+            failures.append(f"expected JSON output (schema used), but parsing failed: {e}")
+            parsed = None
+        if parsed is not None:
+            failures.extend(_plan_for(case).evaluate_json(parsed))
+    else:
+        failures.extend(_plan_for(case).evaluate_text(output_text))
+    return failures
+
+
+def _invoke_runner(
+    settings: EvalSettings,
+    composed_prompt: str,
+    output_path: Path,
+    jsonl_path: Optional[Path],
+    schema_path: Optional[Path],
+    timeout: float,
+    case_dir: Path,
+    progress: EventProgress,
+) -> ProcessResult:
+    streams: Dict[str, Any] = {
+        "stdout_path": case_dir / "stdout.txt",
+        "stderr_path": case_dir / "stderr.txt",
+        "on_event": progress.feed,
+    }
+    if settings.runner == "claude":
+        claude_args = list(settings.claude_args)
+        if settings.model:
+            claude_args.extend(["--model", settings.model])
+        return run_claude_exec(
+            workspace_root=settings.workspace_root,
+            prompt=composed_prompt,
+            output_last_message_path=output_path,
+            claude_bin=settings.claude_bin,
+            output_format=settings.claude_output_format,
+            extra_claude_args=claude_args or None,
+            timeout=timeout,
+            **streams,
         )
+    return run_codex_exec(
+        workspace_root=settings.workspace_root,
+        prompt=composed_prompt,
+        output_last_message_path=output_path,
+        output_schema_path=schema_path,
+        sandbox=settings.sandbox,
+        ask_for_approval=settings.ask_for_approval,
+        model=settings.model,
+        profile=settings.profile,
+        codex_home=settings.codex_home,
+        jsonl_path=jsonl_path,
+        codex_bin=settings.codex_bin,
+        extra_codex_args=list(settings.codex_args) or None,
+        timeout=timeout,
+        **streams,
+    )
+
+
+def _invoke_with_retries(
+    settings: EvalSettings,
+    case: EvalCase,
+    composed_prompt: str,
+    output_path: Path,
+    jsonl_path: Optional[Path],
+    schema_path: Optional[Path],
+    case_dir: Path,
+) -> Tuple[ProcessResult, int, EventProgress]:
+    """Run the CLI, retrying transient non-zero exits (anything but 127) with exponential backoff."""
+    timeout = case_timeout(settings, case)
+    retries = case.retries if case.retries is not None else settings.retries
+    attempt = 0
+    while True:
+        attempt += 1
+        output_path.unlink(missing_ok=True)
+        progress = EventProgress(case.name, echo=settings.progress)
+        res = _invoke_runner(
+            settings, composed_prompt, output_path, jsonl_path, schema_path, timeout, case_dir, progress
+        )
+        if res.rc in _NON_TRANSIENT_EXIT_CODES or attempt > retries:
+            return res, attempt, progress
+        time.sleep(_backoff_delay(settings.retry_backoff_sec, attempt))
+
+
+def _read_if_exists(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8", errors="replace")
     except FileNotFoundError:
-        return 127, "", "claude CLI not found on PATH. Install Claude Code CLI and ensure it is on PATH."
-    except subprocess.TimeoutExpired:
-        return 124, "", f"claude headless timed out after {timeout} seconds."
+        return ""
+
+
+def run_case(
+    settings: EvalSettings,
+    case: EvalCase,
+    case_dir: Path,
+    schema_path: Optional[Path],
+    cache: Optional[ResponseCache] = None,
+) -> Dict[str, Any]:
+    """Run one case end to end and write its artifacts into `case_dir`. Safe to call from worker threads."""
+    started = time.monotonic()
+    case_dir.mkdir(parents=True, exist_ok=True)
+
+    output_path = case_dir / "output_last_message.txt"
+    jsonl_path = (case_dir / "codex_events.jsonl") if settings.capture_jsonl else None
+
+    composed_prompt = compose_prompt(settings.skill_name, case)
+    (case_dir / "prompt.txt").write_text(composed_prompt, encoding="utf-8")
+
+    key = response_key(settings, composed_prompt, schema_path)
+    cached = cache.get(key) if (cache is not None and settings.replay) else None
+
+    rc: Optional[int] = None
+    resources: Optional[Dict[str, Any]] = None
+    events: Optional[Dict[str, int]] = None
+    attempts = 0
+    if settings.replay and cached is None:
+        failures = ["no cached response for this case; run without --replay first"]
+        output_text = ""
+    else:
+        if cached is not None:
+            rc, output_text = cached.rc, cached.final
+            (case_dir / "stderr.txt").write_text(cached.stderr, encoding="utf-8")
+            (case_dir / "stdout.txt").write_text(cached.stdout, encoding="utf-8")
+            if jsonl_path:
+                jsonl_path.write_text(cached.stdout, encoding="utf-8")
+        else:
+            # stdout.txt / stderr.txt (and codex_events.jsonl) are written by the runner as output arrives.
+            res, attempts, progress = _invoke_with_retries(
+                settings, case, composed_prompt, output_path, jsonl_path, schema_path, case_dir
+            )
+            rc, resources = res.rc, res.resources()
+            events = progress.summary() if progress.events else None
+            output_text = output_path.read_text(encoding="utf-8") if output_path.exists() else ""
+            if cache is not None and rc == 0:
+                cache.put(
+                    key,
+                    settings.skill_name,
+                    case.name,
+                    CachedResponse(
+                        rc,
+                        _read_if_exists(case_dir / "stdout.txt") if res.stdout_bytes <= _CACHE_MAX_STREAM_BYTES else "",
+                        _read_if_exists(case_dir / "stderr.txt") if res.stderr_bytes <= _CACHE_MAX_STREAM_BYTES else "",
+                        output_text,
+                    ),
+                )
+        failures = grade_output(settings, case, rc, output_text, schema_path)
+
+    (case_dir / "final.txt").write_text(output_text, encoding="utf-8")
+
+    case_record = {
+        "name": case.name,
+        "passed": len(failures) == 0,
+        "failures": failures,
+        "dir": str(case_dir),
+        "used_schema": bool(schema_path),
+        "cached": cached is not None,
+        "response_key": key,
+        "exit_code": rc,
+        "wall_time_sec": round(time.monotonic() - started, 3),
+        # Final attempt only (no failed attempts or backoff sleeps); what latency history is built from.
+        "attempt_wall_sec": resources["wall_sec"] if resources else None,
+        "timeout_sec": case_timeout(settings, case),
+        "attempts": attempts,
+        "resources": resources,
+        "events": events,
+    }
+    (case_dir / "result.json").write_text(json.dumps(case_record, indent=2, ensure_ascii=False), encoding="utf-8")
+    return case_record
+
+
+_BREAKER_EXIT_CODES = (124, 127)  # timeout, CLI not found
+
+
+@dataclass(frozen=True)
+class AbortPolicy:
+    """When to stop scheduling further cases. Cases already running always finish."""
+
+    max_failures: Optional[int] = None  # --fail-fast is max_failures=1
+    breaker_threshold: int = 0  # consecutive 124/127 exits that mark the runner unhealthy; 0 disables
+
+
+class AbortTracker:
+    """Applies an AbortPolicy to case results as they complete (thread-safe)."""
+
+    def __init__(self, policy: AbortPolicy) -> None:
+        self.policy = policy
+        self.failures = 0
+        self.streak = 0
+        self.reason: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def record(self, rec: Dict[str, Any]) -> None:
+        with self._lock:
+            self._record(rec)
+
+    def _record(self, rec: Dict[str, Any]) -> None:
+        if not rec["passed"]:
+            self.failures += 1
+        self.streak = self.streak + 1 if rec.get("exit_code") in _BREAKER_EXIT_CODES else 0
+        if self.reason:
+            return
+        limit = self.policy.max_failures
+        if limit and self.failures >= limit:
+            self.reason = "fail-fast" if limit == 1 else f"max failures ({limit}) reached"
+        elif self.policy.breaker_threshold and self.streak >= self.policy.breaker_threshold:
+            self.reason = (
+                f"runner unhealthy: {self.streak} consecutive exits with "
+                f"{'/'.join(str(c) for c in _BREAKER_EXIT_CODES)} (timeout / CLI not found)"
+            )
 
-    output_last_message_path.write_text(proc.stdout or "", encoding="utf-8")
-    return proc.returncode, proc.stdout, proc.stderr
+
+def _skipped_record(case: EvalCase, case_dir: Path, schema_path: Optional[Path], reason: str) -> Dict[str, Any]:
+    case_dir.mkdir(parents=True, exist_ok=True)
+    rec = {
+        "name": case.name,
+        "passed": False,
+        "skipped": True,
+        "failures": [f"skipped: {reason}"],
+        "dir": str(case_dir),
+        "used_schema": bool(schema_path),
+        "cached": False,
+        "response_key": None,
+        "exit_code": None,
+        "wall_time_sec": 0.0,
+        "attempt_wall_sec": None,
+        "timeout_sec": None,
+        "attempts": 0,
+        "resources": None,
+        "events": None,
+    }
+    (case_dir / "result.json").write_text(json.dumps(rec, indent=2, ensure_ascii=False), encoding="utf-8")
+    return rec
+
+
+def run_case_guarded(
+    settings: EvalSettings,
+    case: EvalCase,
+    case_dir: Path,
+    schema_path: Optional[Path],
+    cache: Optional[ResponseCache],
+    tracker: AbortTracker,
+) -> Dict[str, Any]:
+    """run_case, unless `tracker` has already tripped; for callers that queue cases up front."""
+    if tracker.reason:
+        return _skipped_record(case, case_dir, schema_path, tracker.reason)
+    rec = run_case(settings, case, case_dir, schema_path, cache)
+    tracker.record(rec)
+    return rec
+
+
+def run_cases(
+    settings: EvalSettings,
+    cases: Sequence[EvalCase],
+    reports_base: Path,
+    *,
+    jobs: int = 1,
+    cache: Optional[ResponseCache] = None,
+    policy: AbortPolicy = AbortPolicy(),
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Run cases, up to `jobs` at a time; return (records in case order, abort reason).
+
+    Cases spend nearly all their time waiting on the CLI subprocess, so a
+    thread pool is enough. Cases are submitted lazily so that once `policy`
+    trips, the rest are recorded as skipped instead of each burning its
+    timeout. Schema paths are resolved before anything starts so a bad case
+    fails the run without leaving half-finished workers behind.
+    """
+    schema_paths = [resolve_schema_path(settings.skill_dir, c) for c in cases]
+    case_dirs = [reports_base / case_dir_name(idx, c) for idx, c in enumerate(cases, 1)]
+    records: List[Optional[Dict[str, Any]]] = [None] * len(cases)
+    tracker = AbortTracker(policy)
+
+    workers = max(1, min(jobs, len(cases)))
+    pending = iter(range(len(cases)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight: Dict[Future, int] = {}
+
+        def submit_next() -> None:
+            i = next(pending, None)
+            if i is not None:
+                in_flight[pool.submit(run_case, settings, cases[i], case_dirs[i], schema_paths[i], cache)] = i
+
+        for _ in range(workers):
+            submit_next()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i = in_flight.pop(fut)
+                records[i] = fut.result()
+                tracker.record(records[i])
+            while tracker.reason is None and len(in_flight) < workers:
+                before = len(in_flight)
+                submit_next()
+                if len(in_flight) == before:
+                    break
+
+    for i, rec in enumerate(records):
+        if rec is None:
+            records[i] = _skipped_record(cases[i], case_dirs[i], schema_paths[i], tracker.reason or "aborted")
+    return [r for r in records if r is not None], tracker.reason
+
+
+# -----------------------------
+# Run history
+# -----------------------------
+
+_HISTORY_FILENAME = "history.sqlite"
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100); None for an empty sequence."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class HistoryStore:
+    """
+    Indexed store of every eval run under a reports dir.
+
+    summary.json stays the per-run artifact; this is the cross-run index the
+    `history` subcommand queries, so trends never need the report tree re-globbed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                skill TEXT NOT NULL,
+                run_id TEXT NOT NULL,
+                started_at TEXT,
+                runner TEXT,
+                model TEXT,
+                replay INTEGER NOT NULL DEFAULT 0,
+                passed INTEGER NOT NULL,
+                PRIMARY KEY (skill, run_id)
+            );
+            CREATE TABLE IF NOT EXISTS cases (
+                skill TEXT NOT NULL,
+                run_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                passed INTEGER NOT NULL,
+                exit_code INTEGER,
+                wall_time_sec REAL,
+                attempt_wall_sec REAL,
+                cached INTEGER NOT NULL DEFAULT 0,
+                failures TEXT NOT NULL,
+                PRIMARY KEY (skill, run_id, name)
+            );
+            CREATE INDEX IF NOT EXISTS cases_by_name ON cases (skill, name, run_id);
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cases)")}
+        if "attempt_wall_sec" not in columns:
+            self._conn.execute("ALTER TABLE cases ADD COLUMN attempt_wall_sec REAL")
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def ingest(self, summary: Dict[str, Any]) -> None:
+        skill, run_id = summary["skill"], summary["run_id"]
+        with self._conn:
+            self._conn.execute("DELETE FROM cases WHERE skill = ? AND run_id = ?", (skill, run_id))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs (skill, run_id, started_at, runner, model, replay, passed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    skill,
+                    run_id,
+                    summary.get("started_at"),
+                    summary.get("runner"),
+                    summary.get("model"),
+                    int(bool(summary.get("replay"))),
+                    int(bool(summary.get("passed"))),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cases"
+                " (skill, run_id, idx, name, passed, exit_code, wall_time_sec, attempt_wall_sec, cached, failures)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        skill,
+                        run_id,
+                        i,
+                        c["name"],
+                        int(bool(c.get("passed"))),
+                        c.get("exit_code"),
+                        c.get("wall_time_sec"),
+                        _attempt_wall_sec(c),
+                        int(bool(c.get("cached"))),
+                        json.dumps(c.get("failures", []), ensure_ascii=False),
+                    )
+                    for i, c in enumerate(summary.get("cases", []), 1)
+                    if not c.get("skipped")
+                ],
+            )
+
+    def has_run(self, skill: str, run_id: str) -> bool:
+        row = self._conn.execute("SELECT 1 FROM runs WHERE skill = ? AND run_id = ?", (skill, run_id)).fetchone()
+        return row is not None
+
+    def skills(self) -> List[str]:
+        return [r[0] for r in self._conn.execute("SELECT DISTINCT skill FROM runs ORDER BY skill")]
+
+    def run_configs(
+        self,
+        skill: str,
+        *,
+        runner: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Distinct (runner, model) pairs the skill was run with, optionally narrowed to one runner/model."""
+        sql = "SELECT DISTINCT runner, model FROM runs WHERE skill = ?"
+        params: List[Any] = [skill]
+        if runner:
+            sql += " AND runner = ?"
+            params.append(runner)
+        if model:
+            sql += " AND model = ?"
+            params.append(model)
+        sql += " ORDER BY runner, model"
+        return [(r[0], r[1]) for r in self._conn.execute(sql, params)]
+
+    def recent_runs(
+        self,
+        skill: str,
+        *,
+        limit: int,
+        runner: Optional[str] = None,
+        model: Optional[str] = None,
+        exact: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Most recent first.
+
+        By default an unset runner/model matches any; with `exact`, both are
+        matched as given (model None = runs without a model override).
+        """
+        sql = "SELECT run_id, started_at, runner, model, replay, passed FROM runs WHERE skill = ?"
+        params: List[Any] = [skill]
+        if exact:
+            sql += " AND runner IS ? AND model IS ?"
+            params.extend([runner, model])
+        else:
+            if runner:
+                sql += " AND runner = ?"
+                params.append(runner)
+            if model:
+                sql += " AND model = ?"
+                params.append(model)
+        sql += " ORDER BY run_id DESC LIMIT ?"
+        params.append(limit)
+        cols = ("run_id", "started_at", "runner", "model", "replay", "passed")
+        runs = [dict(zip(cols, row)) for row in self._conn.execute(sql, params)]
+        for r in runs:
+            r["replay"], r["passed"] = bool(r["replay"]), bool(r["passed"])
+        return runs
+
+    def case_latencies(
+        self,
+        skill: str,
+        *,
+        runner: Optional[str],
+        model: Optional[str],
+        last: int = 20,
+    ) -> Dict[str, List[float]]:
+        """Final-attempt wall times of successful, non-replayed executions per case over the `last` matching runs."""
+        run_ids = [r["run_id"] for r in self.recent_runs(skill, limit=last, runner=runner, model=model)]
+        out: Dict[str, List[float]] = {}
+        for row in self.case_rows(skill, run_ids):
+            if _is_latency_sample(row):
+                out.setdefault(row["name"], []).append(row["attempt_wall_sec"])
+        return out
+
+    def case_rows(self, skill: str, run_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        if not run_ids:
+            return []
+        marks = ",".join("?" for _ in run_ids)
+        cols = ("run_id", "idx", "name", "passed", "exit_code", "wall_time_sec", "attempt_wall_sec", "cached")
+        rows = self._conn.execute(
+            f"SELECT {', '.join(cols)} FROM cases WHERE skill = ? AND run_id IN ({marks}) ORDER BY run_id, idx",
+            [skill, *run_ids],
+        )
+        return [dict(zip(cols, row)) for row in rows]
+
+
+_TIMEOUT_EXIT_CODE = 124
+
+
+def _is_latency_sample(row: Dict[str, Any]) -> bool:
+    """
+    Whether a history row's attempt time measures the case itself.
+
+    Failed and timed-out attempts are excluded (a timeout's wall time is just
+    the timeout cap), as are replayed responses.
+    """
+    return row["exit_code"] == 0 and not row["cached"] and row["attempt_wall_sec"] is not None
+
+
+def _attempt_wall_sec(case_record: Dict[str, Any]) -> Optional[float]:
+    """Final-attempt wall time; summaries written before it was recorded fall back to single-attempt wall time."""
+    if case_record.get("attempt_wall_sec") is not None:
+        return case_record["attempt_wall_sec"]
+    if "attempt_wall_sec" not in case_record and case_record.get("attempts", 1) <= 1:
+        return case_record.get("wall_time_sec")
+    return None
+
+
+def open_history(reports_dir: Path) -> Optional[HistoryStore]:
+    try:
+        return HistoryStore(reports_dir / _HISTORY_FILENAME)
+    except (OSError, sqlite3.Error) as e:
+        print(f"WARN: run history disabled ({e}).", file=sys.stderr)
+        return None
+
+
+_ADAPTIVE_MIN_SAMPLES = 3
+_ADAPTIVE_HEADROOM = 2.0  # timeout = p95 * headroom + slack
+_ADAPTIVE_SLACK_SEC = 5.0
+
+
+def adaptive_timeouts(
+    latencies: Dict[str, List[float]],
+    *,
+    floor_sec: float,
+    ceiling_sec: float,
+) -> Dict[str, float]:
+    """Per-case timeouts from recorded latency: cheap cases fail fast, heavy ones get headroom."""
+    out: Dict[str, float] = {}
+    for name, times in latencies.items():
+        if len(times) < _ADAPTIVE_MIN_SAMPLES:
+            continue
+        p95 = percentile(times, 95) or 0.0
+        out[name] = round(max(floor_sec, min(ceiling_sec, p95 * _ADAPTIVE_HEADROOM + _ADAPTIVE_SLACK_SEC)), 1)
+    return out
+
+
+def backfill_history(store: HistoryStore, reports_dir: Path) -> int:
+    """Ingest existing <skill>/<run_id>/summary.json files that are not in the store yet."""
+    added = 0
+    for summary_path in sorted(reports_dir.glob("*/*/summary.json")):
+        try:
+            summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if not isinstance(summary, dict) or "skill" not in summary or "run_id" not in summary:
+            continue
+        if store.has_run(summary["skill"], summary["run_id"]):
+            continue
+        store.ingest(summary)
+        added += 1
+    return added
+
+
+def history_report(
+    store: HistoryStore,
+    skill: str,
+    *,
+    last: int,
+    runner: Optional[str] = None,
+    model: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Latency, flakiness and regressions over a skill's `last` runs with one (runner, model).
+
+    Runs from other runners/models are never mixed in, so "previous run" is
+    the previous run of the same configuration.
+
+    - latency: p50/p95 of final-attempt case wall time over successful (exit 0),
+      non-replayed executions; timeouts are counted separately
+    - flaky: cases that both passed and failed within the window
+    - regressions: cases that passed in the previous run and fail in the latest
+    """
+    runs = store.recent_runs(skill, limit=last, runner=runner, model=model, exact=True)
+    rows = store.case_rows(skill, [r["run_id"] for r in runs])
+
+    by_case: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_case.setdefault(row["name"], []).append(row)
+
+    cases: List[Dict[str, Any]] = []
+    for name, case_rows in by_case.items():
+        times = [r["attempt_wall_sec"] for r in case_rows if _is_latency_sample(r)]
+        passes = sum(1 for r in case_rows if r["passed"])
+        cases.append(
+            {
+                "name": name,
+                "runs": len(case_rows),
+                "pass_rate": round(passes / len(case_rows), 3),
+                "p50_sec": percentile(times, 50),
+                "p95_sec": percentile(times, 95),
+                "timeouts": sum(1 for r in case_rows if r["exit_code"] == _TIMEOUT_EXIT_CODE),
+                "flaky": 0 < passes < len(case_rows),
+            }
+        )
+    cases.sort(key=lambda c: c["name"])
+
+    regressions: List[str] = []
+    fixed: List[str] = []
+    if len(runs) >= 2:
+        latest, previous = runs[0]["run_id"], runs[1]["run_id"]
+        state = {(r["run_id"], r["name"]): bool(r["passed"]) for r in rows}
+        for name in sorted(by_case):
+            before, after = state.get((previous, name)), state.get((latest, name))
+            if before is True and after is False:
+                regressions.append(name)
+            elif before is False and after is True:
+                fixed.append(name)
+
+    all_times = [r["attempt_wall_sec"] for r in rows if _is_latency_sample(r)]
+    return {
+        "skill": skill,
+        "runner": runner,
+        "model": model,
+        "runs": runs,
+        "p50_sec": percentile(all_times, 50),
+        "p95_sec": percentile(all_times, 95),
+        "timeouts": sum(c["timeouts"] for c in cases),
+        "cases": cases,
+        "flaky": [c["name"] for c in cases if c["flaky"]],
+        "regressions": regressions,
+        "fixed": fixed,
+    }
+
+
+def _fmt_sec(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v:.2f}s"
+
+
+def print_history_report(report: Dict[str, Any]) -> None:
+    runs = report["runs"]
+    print(f"Skill: {report['skill']}  runner: {report['runner'] or '-'}  model: {report['model'] or '-'}  runs: {len(runs)}")
+    if not runs:
+        return
+    latest = runs[0]
+    print(f"Latest: {latest['run_id']} ({'PASS' if latest['passed'] else 'FAIL'})")
+    timeouts = f"  timeouts {report['timeouts']}" if report["timeouts"] else ""
+    print(f"Case latency: p50 {_fmt_sec(report['p50_sec'])}  p95 {_fmt_sec(report['p95_sec'])}{timeouts}")
+    for c in report["cases"]:
+        flag = "  FLAKY" if c["flaky"] else ""
+        timeouts = f"  timeouts {c['timeouts']}" if c["timeouts"] else ""
+        print(
+            f"- {c['name']}: pass {c['pass_rate']:.0%} of {c['runs']}"
+            f"  p50 {_fmt_sec(c['p50_sec'])}  p95 {_fmt_sec(c['p95_sec'])}{timeouts}{flag}"
+        )
+    if report["regressions"]:
+        print("Regressions (passed in previous run, fail now): " + ", ".join(report["regressions"]))
+    if report["fixed"]:
+        print("Fixed since previous run: " + ", ".join(report["fixed"]))
+
+
+def build_history_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="run_skill_evals.py history",
+        description="Report case latency, flaky cases and regressions across recorded eval runs.",
+    )
+    p.add_argument("--skill", action="append", default=[], help="Skill name (repeatable; default: every skill in the store).")
+    p.add_argument("--reports-dir", default="artifacts/reports/skills", help="Base directory for eval reports.")
+    p.add_argument("--last", type=int, default=20, help="Number of most recent runs to consider (default: 20).")
+    p.add_argument("--runner", choices=["codex", "claude"], default=None, help="Only runs from this runner.")
+    p.add_argument("--model", default=None, help="Only runs with this model.")
+    p.add_argument(
+        "--backfill",
+        action="store_true",
+        help="First ingest summary.json files from runs recorded before the history store existed.",
+    )
+    p.add_argument("--format", choices=["text", "json"], default="text")
+    return p
+
+
+def history_main(argv: Sequence[str]) -> int:
+    args = build_history_arg_parser().parse_args(argv)
+    reports_dir = Path(args.reports_dir).expanduser().resolve()
+    if not args.backfill and not (reports_dir / _HISTORY_FILENAME).exists():
+        print(f"ERROR: no run history at {reports_dir / _HISTORY_FILENAME} (try --backfill).", file=sys.stderr)
+        return 1
+    store = open_history(reports_dir)
+    if store is None:
+        return 1
+    try:
+        if args.backfill:
+            added = backfill_history(store, reports_dir)
+            print(f"Backfilled {added} run(s).", file=sys.stderr)
+        skills = args.skill or store.skills()
+        # One report per (runner, model): a matrix sweep records a run per cell, and
+        # comparing cells with each other would show runner differences as regressions.
+        reports = [
+            history_report(store, s, last=max(1, args.last), runner=runner, model=model)
+            for s in skills
+            for runner, model in store.run_configs(s, runner=args.runner, model=args.model) or [(args.runner, args.model)]
+        ]
+    finally:
+        store.close()
+
+    if args.format == "json":
+        print(json.dumps({"skills": reports}, indent=2, ensure_ascii=False))
+    else:
+        for i, r in enumerate(reports):
+            if i:
+                print()
+            print_history_report(r)
+    return 0
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -366,6 +1709,20 @@ def build_arg_parser() -> argparse.ArgumentParser:
     )
     p.add_argument("path", help="Path to a skill directory or SKILL.md.")
     p.add_argument("--runner", choices=["codex", "claude"], default="claude", help="LLM runner to use.")
+    p.add_argument("--model", default=None, help="Override model (codex --model / claude --model).")
+    p.add_argument("--format", choices=["text", "json"], default="text")
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run up to N cases concurrently (default: 1). Avoid >1 with --sandbox workspace-write if cases edit the same files.",
+    )
+    add_run_arguments(p)
+    return p
+
+
+def add_run_arguments(p: argparse.ArgumentParser) -> None:
+    """Options shared by every eval run (also used by run_eval_matrix.py)."""
     p.add_argument("--workspace", default=None, help="Workspace root to run codex exec in (defaults to repo root guess).")
     p.add_argument("--sandbox", default="read-only", choices=["read-only", "workspace-write", "danger-full-access"])
     p.add_argument(
@@ -374,16 +1731,15 @@ def build_arg_parser() -> argparse.ArgumentParser:
         choices=["untrusted", "on-failure", "on-request", "never"],
         help="Codex approval mode (optional; older codex versions may not support this flag).",
     )
-    p.add_argument("--model", default=None, help="Override model for codex exec.")
     p.add_argument("--profile", default=None, help="Codex config profile name.")
     p.add_argument("--codex-home", default=None, help="Set CODEX_HOME (useful for repo-scoped .codex).")
     p.add_argument("--codex-bin", default=None, help="Override codex CLI path (e.g., ~/.local/share/mise/.../codex).")
     p.add_argument("--claude-bin", default=None, help="Override claude CLI path (e.g., ~/.local/bin/claude).")
     p.add_argument(
         "--claude-output-format",
-        choices=["text", "json"],
+        choices=["text", "json", "stream-json"],
         default="text",
-        help="Claude output format (default: text).",
+        help="Claude output format (default: text). stream-json enables live progress; assertions then see the raw event stream.",
     )
     p.add_argument(
         "--claude-arg",
@@ -392,15 +1748,72 @@ def build_arg_parser() -> argparse.ArgumentParser:
         help="Extra flag to pass to claude CLI (repeatable), e.g. --claude-arg='--model' --claude-arg=claude-3-5-sonnet",
     )
     p.add_argument("--capture-jsonl", action="store_true", help="Also capture Codex JSONL event stream (--json).")
+    p.add_argument(
+        "--progress",
+        action="store_true",
+        help="Print live turn/tool-call counts to stderr (needs --capture-jsonl or --claude-output-format stream-json).",
+    )
     p.add_argument("--reports-dir", default="artifacts/reports/skills", help="Base directory for eval reports.")
-    p.add_argument("--format", choices=["text", "json"], default="text")
+    p.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Default per-case timeout in seconds (default: $CODEX_EVAL_TIMEOUT_SEC or 60). evals.yaml `timeout_sec` wins.",
+    )
+    p.add_argument(
+        "--no-adaptive-timeout",
+        action="store_true",
+        help="Do not derive per-case timeouts from recorded latency in the run history.",
+    )
+    p.add_argument("--adaptive-floor", type=float, default=10.0, help="Lower bound for adaptive timeouts (default: 10s).")
+    p.add_argument("--adaptive-ceiling", type=float, default=600.0, help="Upper bound for adaptive timeouts (default: 600s).")
+    p.add_argument(
+        "--retries",
+        type=int,
+        default=0,
+        help="Retries for transient non-zero exits when a case sets no `retries` (default: 0).",
+    )
+    p.add_argument(
+        "--retry-backoff",
+        type=float,
+        default=1.0,
+        help="Initial retry delay in seconds; doubles per attempt, capped at 30s (default: 1).",
+    )
+    p.add_argument("--fail-fast", action="store_true", help="Stop scheduling cases after the first failure.")
+    p.add_argument(
+        "--max-failures",
+        type=int,
+        default=None,
+        help="Stop scheduling cases after N failures (remaining cases are reported as skipped).",
+    )
+    p.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=2,
+        help="Skip remaining cases after N consecutive timeouts (124) / missing CLI (127) exits (default: 2; 0 disables).",
+    )
+    p.add_argument(
+        "--cache",
+        default=None,
+        help=f"Response cache path (default: $SKILL_EVALS_CACHE or {_DEFAULT_CACHE_PATH}).",
+    )
+    p.add_argument("--no-cache", action="store_true", help="Do not store or read cached responses.")
+    p.add_argument(
+        "--no-history",
+        action="store_true",
+        help=f"Do not record this run in <reports-dir>/{_HISTORY_FILENAME}.",
+    )
+    p.add_argument(
+        "--replay",
+        action="store_true",
+        help="Grade cached responses only; never call the CLI. Cases without a cached response fail.",
+    )
     p.add_argument(
         "--codex-arg",
         action="append",
         default=[],
         help="Extra flag to pass to codex exec (repeatable), e.g. --codex-arg='--profile' --codex-arg=work",
     )
-    return p
 
 
 def _guess_repo_root(start: Path) -> Path:
@@ -414,148 +1827,189 @@ def _guess_repo_root(start: Path) -> Path:
     return start
 
 
-def main(argv: Optional[Sequence[str]] = None) -> int:
-    args = build_arg_parser().parse_args(argv)
-
-    skill_md = _resolve_skill_md_path(args.path)
-    if not skill_md.exists():
-        print(f"ERROR: SKILL.md not found at: {skill_md}", file=sys.stderr)
-        return 1
-
+def settings_from_args(
+    args: argparse.Namespace,
+    skill_md: Path,
+    skill_name: str,
+    *,
+    runner: str,
+    model: Optional[str],
+    reports_dir: Path,
+) -> EvalSettings:
+    """
+    EvalSettings for one skill/runner/model from the shared run options.
+
+    Raises FileNotFoundError for a missing --codex-bin/--claude-bin. Adaptive
+    timeouts are filled in from the history under `reports_dir`.
+    """
     skill_dir = skill_md.parent
-    skill_name = load_skill_name(skill_md)
-
-    evals_path = skill_dir / "references" / "evals.yaml"
-    if not evals_path.exists():
-        print(f"ERROR: Missing evals file: {evals_path}", file=sys.stderr)
-        return 1
-
-    cases = load_evals(evals_path)
-
     workspace_root = Path(args.workspace).expanduser().resolve() if args.workspace else _guess_repo_root(skill_dir)
     codex_home = Path(args.codex_home).expanduser().resolve() if args.codex_home else None
     codex_bin = Path(args.codex_bin).expanduser() if args.codex_bin else None
     if codex_bin and not codex_bin.exists():
-        print(f"ERROR: --codex-bin not found: {codex_bin}", file=sys.stderr)
-        return 1
+        raise FileNotFoundError(f"--codex-bin not found: {codex_bin}")
     claude_bin = Path(args.claude_bin).expanduser() if args.claude_bin else None
     if claude_bin and not claude_bin.exists():
-        print(f"ERROR: --claude-bin not found: {claude_bin}", file=sys.stderr)
-        return 1
-    if args.runner == "claude" and args.capture_jsonl:
-        print("WARN: --capture-jsonl is Codex-only; ignoring for Claude runner.", file=sys.stderr)
-        args.capture_jsonl = False
+        raise FileNotFoundError(f"--claude-bin not found: {claude_bin}")
+
+    settings = EvalSettings(
+        skill_name=skill_name,
+        skill_dir=skill_dir,
+        workspace_root=workspace_root,
+        runner=runner,
+        sandbox=args.sandbox,
+        ask_for_approval=args.ask_for_approval,
+        model=model,
+        profile=args.profile,
+        codex_home=codex_home,
+        codex_bin=codex_bin,
+        claude_bin=claude_bin,
+        claude_output_format=args.claude_output_format,
+        capture_jsonl=args.capture_jsonl and runner == "codex",
+        codex_args=tuple(args.codex_arg or ()),
+        claude_args=tuple(args.claude_arg or ()),
+        skill_md_hash=_sha256_bytes(skill_md.read_bytes()),
+        replay=args.replay,
+        timeout_sec=args.timeout if args.timeout else default_timeout_sec(),
+        retries=max(0, args.retries),
+        retry_backoff_sec=max(0.0, args.retry_backoff),
+        progress=args.progress,
+    )
+    if not args.replay and not args.no_adaptive_timeout and (reports_dir / _HISTORY_FILENAME).exists():
+        history = open_history(reports_dir)
+        if history is not None:
+            try:
+                latencies = history.case_latencies(skill_name, runner=settings.runner, model=effective_model(settings))
+            finally:
+                history.close()
+            settings = replace(
+                settings,
+                adaptive_timeouts=adaptive_timeouts(
+                    latencies, floor_sec=args.adaptive_floor, ceiling_sec=max(args.adaptive_floor, args.adaptive_ceiling)
+                ),
+            )
+    return settings
+
+
+def abort_policy_from_args(args: argparse.Namespace) -> AbortPolicy:
+    return AbortPolicy(
+        max_failures=1 if args.fail_fast else args.max_failures,
+        breaker_threshold=max(0, args.breaker_threshold),
+    )
 
-    run_id = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
-    reports_base = Path(args.reports_dir).expanduser().resolve() / skill_name / run_id
-    reports_base.mkdir(parents=True, exist_ok=True)
 
-    summary: Dict[str, Any] = {
-        "skill": skill_name,
-        "skill_path": str(skill_dir),
-        "workspace_root": str(workspace_root),
-        "runner": args.runner,
+def response_cache_from_args(args: argparse.Namespace) -> Tuple[Optional[ResponseCache], Optional[str]]:
+    """(cache, error); error is set when --replay cannot get a cache."""
+    if args.replay and args.no_cache:
+        return None, "--replay needs the response cache; drop --no-cache."
+    cache = None if args.no_cache else open_response_cache(
+        args.cache or os.environ.get("SKILL_EVALS_CACHE") or _DEFAULT_CACHE_PATH
+    )
+    if args.replay and cache is None:
+        return None, "--replay needs the response cache, which could not be opened."
+    return cache, None
+
+
+def build_summary(
+    settings: EvalSettings,
+    *,
+    run_id: str,
+    started_at: dt.datetime,
+    case_records: List[Dict[str, Any]],
+    aborted: Optional[str],
+) -> Dict[str, Any]:
+    return {
+        "skill": settings.skill_name,
+        "skill_path": str(settings.skill_dir),
+        "workspace_root": str(settings.workspace_root),
+        "runner": settings.runner,
+        "model": effective_model(settings),
         "run_id": run_id,
-        "cases": [],
-        "passed": True,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "replay": settings.replay,
+        "cases": case_records,
+        "passed": all(r["passed"] for r in case_records),
+        "aborted": aborted,
     }
 
-    any_failed = False
 
-    for idx, c in enumerate(cases, 1):
-        case_dir = reports_base / f"{idx:02d}-{re.sub(r'[^A-Za-z0-9_.-]+', '-', c.name).strip('-')}"
-        case_dir.mkdir(parents=True, exist_ok=True)
-
-        output_path = case_dir / "output_last_message.txt"
-        jsonl_path = (case_dir / "codex_events.jsonl") if args.capture_jsonl else None
+def record_run(summary: Dict[str, Any], reports_base: Path, reports_dir: Path, *, history: bool = True) -> None:
+    """Write summary.json and index the run in the history store."""
+    (reports_base / "summary.json").write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    if not history:
+        return
+    store = open_history(reports_dir)
+    if store is None:
+        return
+    try:
+        store.ingest(summary)
+    except sqlite3.Error as e:
+        print(f"WARN: could not record run history ({e}).", file=sys.stderr)
+    finally:
+        store.close()
 
-        schema_path: Optional[Path] = None
-        if c.output_schema:
-            schema_path = Path(c.output_schema)
-            if not schema_path.is_absolute():
-                schema_path = (skill_dir / schema_path).resolve()
-            if not schema_path.exists():
-                print(f"ERROR: Case {c.name}: output_schema not found: {schema_path}", file=sys.stderr)
-                return 1
 
-        composed_prompt = f"$" + skill_name + "\n\n" + c.prompt.strip() + "\n"
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["history"]:
+        return history_main(argv[1:])
+    args = build_arg_parser().parse_args(argv)
 
-        (case_dir / "prompt.txt").write_text(composed_prompt, encoding="utf-8")
+    skill_md = _resolve_skill_md_path(args.path)
+    if not skill_md.exists():
+        print(f"ERROR: SKILL.md not found at: {skill_md}", file=sys.stderr)
+        return 1
 
-        if args.runner == "claude":
-            rc, stdout, stderr = run_claude_exec(
-                workspace_root=workspace_root,
-                prompt=composed_prompt,
-                output_last_message_path=output_path,
-                claude_bin=claude_bin,
-                output_format=args.claude_output_format,
-                extra_claude_args=args.claude_arg or None,
-            )
-        else:
-            rc, stdout, stderr = run_codex_exec(
-                workspace_root=workspace_root,
-                prompt=composed_prompt,
-                output_last_message_path=output_path,
-                output_schema_path=schema_path,
-                sandbox=args.sandbox,
-                ask_for_approval=args.ask_for_approval,
-                model=args.model,
-                profile=args.profile,
-                codex_home=codex_home,
-                jsonl_path=jsonl_path,
-                codex_bin=codex_bin,
-                extra_codex_args=args.codex_arg or None,
-            )
+    skill_dir = skill_md.parent
+    skill_name = load_skill_name(skill_md)
 
-        (case_dir / "stderr.txt").write_text(stderr or "", encoding="utf-8")
-        (case_dir / "stdout.txt").write_text(stdout or "", encoding="utf-8")
+    evals_path = skill_dir / "references" / "evals.yaml"
+    if not evals_path.exists():
+        print(f"ERROR: Missing evals file: {evals_path}", file=sys.stderr)
+        return 1
 
-        output_text = output_path.read_text(encoding="utf-8") if output_path.exists() else ""
-        (case_dir / "final.txt").write_text(output_text, encoding="utf-8")
+    try:
+        cases = load_evals(evals_path)
+    except ValueError as e:
+        print(f"ERROR: {evals_path}: {e}", file=sys.stderr)
+        return 1
 
-        failures: List[str] = []
-        if rc != 0:
-            runner_label = "codex exec" if args.runner == "codex" else "claude headless"
-            failures.append(f"{runner_label} returned non-zero exit code: {rc}")
+    if args.runner == "claude" and args.capture_jsonl:
+        print("WARN: --capture-jsonl is Codex-only; ignoring for Claude runner.", file=sys.stderr)
 
-        if schema_path and args.runner == "claude":
-            failures.append("Claude runner does not support output_schema; use Codex or text-only assertions.")
+    started_at = dt.datetime.now()
+    run_id = started_at.strftime("%Y%m%d-%H%M%S")
+    reports_dir = Path(args.reports_dir).expanduser().resolve()
 
-        if args.runner == "claude" and args.claude_output_format == "json":
-            try:
-                parsed = json.loads(output_text)
-            except Exception as e:
-                failures.append(f"expected JSON output (Claude json format), but parsing failed: {e}")
-                parsed = None
-            if parsed is not None:
-                failures.extend(evaluate_assertions_json(parsed, c.acceptance))
-        elif schema_path and args.runner == "codex":
-            try:
-                parsed = json.loads(output_text)
-            except Exception as e:
-                failures.append(f"expected JSON output (schema used), but parsing failed: {e}")
-                parsed = None
-            if parsed is not None:
-                failures.extend(evaluate_assertions_json(parsed, c.acceptance))
-        else:
-            failures.extend(evaluate_assertions_text(output_text, c.acceptance))
+    try:
+        settings = settings_from_args(
+            args, skill_md, skill_name, runner=args.runner, model=args.model, reports_dir=reports_dir
+        )
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
 
-        passed = len(failures) == 0
-        any_failed = any_failed or (not passed)
+    reports_base = reports_dir / skill_name / run_id
+    reports_base.mkdir(parents=True, exist_ok=True)
 
-        case_record = {
-            "name": c.name,
-            "passed": passed,
-            "failures": failures,
-            "dir": str(case_dir),
-            "used_schema": bool(schema_path),
-        }
-        summary["cases"].append(case_record)
+    cache, cache_error = response_cache_from_args(args)
+    if cache_error:
+        print(f"ERROR: {cache_error}", file=sys.stderr)
+        return 1
 
-        (case_dir / "result.json").write_text(json.dumps(case_record, indent=2, ensure_ascii=False), encoding="utf-8")
+    try:
+        case_records, aborted = run_cases(
+            settings, cases, reports_base, jobs=args.jobs, cache=cache, policy=abort_policy_from_args(args)
+        )
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if cache is not None:
+            cache.close()
 
-    summary["passed"] = not any_failed
-    (reports_base / "summary.json").write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    summary = build_summary(settings, run_id=run_id, started_at=started_at, case_records=case_records, aborted=aborted)
+    record_run(summary, reports_base, reports_dir, history=not args.no_history)
 
     if args.format == "json":
         print(json.dumps(summary, indent=2, ensure_ascii=False))
@@ -563,10 +2017,12 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         print(f"Skill evals: {skill_name}")
         print(f"Reports: {reports_base}")
         for c in summary["cases"]:
-            status = "PASS" if c["passed"] else "FAIL"
-            print(f"- {status}: {c['name']}")
+            status = "SKIP" if c.get("skipped") else ("PASS" if c["passed"] else "FAIL")
+            print(f"- {status}: {c['name']}{' (replayed)' if c.get('cached') else ''}")
             for f in c["failures"]:
                 print(f"    - {f}")
+        if aborted:
+            print(f"ABORTED: {aborted}")
         print(f"RESULT: {'PASS' if summary['passed'] else 'FAIL'}")
 
     return 0 if summary["passed"] else 2
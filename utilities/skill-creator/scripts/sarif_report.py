@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+sarif_report.py
+
+Minimal SARIF 2.1.0 builders shared by the skill-creator scripts.
+
+Each tool converts its own findings into `sarif_result(...)` dicts; this
+module only knows the SARIF envelope (runs, rules, locations).
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# SARIF result levels.
+ERROR = "error"
+WARNING = "warning"
+NOTE = "note"
+
+
+def artifact_uri(path: Path) -> str:
+    """Repo-relative POSIX path when under the CWD, else an absolute file URI."""
+    p = Path(path).resolve()
+    try:
+        return p.relative_to(Path(os.getcwd()).resolve()).as_posix()
+    except ValueError:
+        return p.as_uri()
+
+
+def sarif_result(
+    rule_id: str,
+    level: str,
+    message: str,
+    path: Path,
+    *,
+    start_line: Optional[int] = None,
+    properties: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    physical: Dict[str, Any] = {"artifactLocation": {"uri": artifact_uri(path)}}
+    if start_line:
+        physical["region"] = {"startLine": int(start_line)}
+    result: Dict[str, Any] = {
+        "ruleId": rule_id,
+        "level": level,
+        "message": {"text": message},
+        "locations": [{"physicalLocation": physical}],
+    }
+    if properties:
+        result["properties"] = properties
+    return result
+
+
+def sarif_run(tool_name: str, results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    rule_ids = sorted({r["ruleId"] for r in results})
+    return {
+        "tool": {
+            "driver": {
+                "name": tool_name,
+                "rules": [{"id": rid} for rid in rule_ids],
+            }
+        },
+        "results": list(results),
+    }
+
+
+def sarif_log(runs: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"$schema": SARIF_SCHEMA, "version": SARIF_VERSION, "runs": list(runs)}
+
+
+def evidence_path(skill_md: Path, evidence: str) -> Path:
+    """Use `evidence` as the location when it names a file in the skill dir, else SKILL.md."""
+    if evidence:
+        candidate = skill_md.parent / evidence
+        try:
+            if candidate.is_file():
+                return candidate
+        except OSError:
+            pass
+    return skill_md
+
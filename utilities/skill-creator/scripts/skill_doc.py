@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+skill_doc.py
+
+Shared SKILL.md parsing for the skill-creator scripts.
+
+A SKILL.md is parsed once into an immutable `SkillDoc` carrying the
+frontmatter, body, H2 blocks, headings, code fences, a line index and a
+lowercased body. Results are memoized by (path, mtime, size), so a pipeline
+that runs gate + analyze + upgrade in one process parses each skill once.
+Because every caller shares the cached doc, its frontmatter is frozen
+(mappings become read-only proxies, lists become tuples).
+
+Parsing is deliberately lenient (frontmatter may start after blank lines and
+may contain tabs); callers that want stricter rules check `fm_start_line` /
+`frontmatter_has_tabs` themselves.
+
+Directory listings (`iter_files`) can be shared the same way: inside a
+`shared_walk()` block each (skill dir, subdir) is walked once.
+
+Usage:
+  from skill_doc import load_skill_doc
+  doc = load_skill_doc("path/to/skill-dir-or-SKILL.md")
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import functools
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import yaml
+
+
+_FM_DELIM = re.compile(r"^\s*---\s*$")
+_HEADING_RE = re.compile(r"(?m)^(#{1,6})\s+(.+?)\s*$")
+_H2_RE = re.compile(r"(?m)^##\s+(.+?)\s*$")
+_CODE_FENCE_RE = re.compile(r"```[^\n]*\n(.*?)\n```", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class SkillDoc:
+    path: Path
+    raw: str
+    frontmatter: Mapping[str, Any]  # read-only, see freeze()
+    body: str
+    fm_start_line: int  # 1-indexed
+    fm_end_line: int    # 1-indexed (line containing closing ---)
+    frontmatter_has_tabs: bool
+    body_lower: str
+    headings: Tuple[Tuple[int, str], ...]    # (level, title) for H1-H6, in order
+    h2_blocks: Tuple[Tuple[str, str], ...]   # (lowercased title, section text)
+    code_fences: Tuple[str, ...]
+    line_starts: Tuple[int, ...]             # offset of each line start in `raw`
+
+    @property
+    def skill_dir(self) -> Path:
+        return self.path.parent
+
+    @property
+    def h2_titles(self) -> List[str]:
+        return [t for (t, _) in self.h2_blocks]
+
+    @property
+    def body_offset(self) -> int:
+        """Offset of `body` within `raw` (the body is always a suffix of raw)."""
+        return len(self.raw) - len(self.body)
+
+    def find_section_text(self, aliases: Sequence[str]) -> str:
+        for title, text in self.h2_blocks:
+            for a in aliases:
+                if a.lower() in title:
+                    return text
+        return ""
+
+    def line_of(self, offset: int) -> int:
+        """1-indexed line number of a character offset in `raw`."""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def body_line_of(self, offset: int) -> int:
+        """1-indexed line number (in `raw`) of a character offset in `body`."""
+        return self.line_of(self.body_offset + offset)
+
+
+def resolve_skill_md_path(path_like: str) -> Path:
+    p = Path(path_like).expanduser().resolve()
+    return (p / "SKILL.md") if p.is_dir() else p
+
+
+def read_text(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8")
+    except UnicodeDecodeError:
+        return path.read_text(encoding="utf-8", errors="replace")
+
+
+def parse_frontmatter(raw: str) -> Tuple[Dict[str, Any], str, int, int, bool]:
+    """
+    Parse YAML frontmatter delimited by lines containing only `---`.
+
+    Returns: (frontmatter, body, fm_start_line, fm_end_line, has_tabs)
+    """
+    lines = raw.splitlines(keepends=True)
+    if not lines:
+        raise ValueError("SKILL.md is empty")
+
+    start_idx: Optional[int] = None
+    for i, line in enumerate(lines):
+        if line.strip():
+            start_idx = i
+            break
+    if start_idx is None:
+        raise ValueError("SKILL.md has no content")
+    if not _FM_DELIM.match(lines[start_idx]):
+        raise ValueError("Missing YAML frontmatter. Expected `---` as first non-empty line.")
+
+    end_idx: Optional[int] = None
+    for j in range(start_idx + 1, len(lines)):
+        if _FM_DELIM.match(lines[j]):
+            end_idx = j
+            break
+    if end_idx is None:
+        raise ValueError("Unterminated YAML frontmatter. Missing closing `---`.")
+
+    yaml_text = "".join(lines[start_idx + 1 : end_idx])
+    try:
+        fm_obj = yaml.safe_load(yaml_text)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML in frontmatter: {e}") from e
+
+    if fm_obj is None:
+        fm: Dict[str, Any] = {}
+    elif isinstance(fm_obj, dict):
+        fm = fm_obj
+    else:
+        raise ValueError("Frontmatter YAML must be a mapping/object.")
+
+    body = "".join(lines[end_idx + 1 :]).lstrip("\n")
+    return fm, body, start_idx + 1, end_idx + 1, "\t" in yaml_text
+
+
+def freeze(value: Any) -> Any:
+    """Read-only view of parsed YAML: mappings become MappingProxyType, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def _extract_h2_blocks(body: str) -> Tuple[Tuple[str, str], ...]:
+    matches = list(_H2_RE.finditer(body))
+    blocks: List[Tuple[str, str]] = []
+    for i, m in enumerate(matches):
+        title = m.group(1).strip().lower()
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(body)
+        blocks.append((title, body[m.end() : end].strip()))
+    return tuple(blocks)
+
+
+def _line_starts(raw: str) -> Tuple[int, ...]:
+    starts = [0]
+    pos = raw.find("\n")
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = raw.find("\n", pos + 1)
+    return tuple(starts)
+
+
+def build_skill_doc(path: Path, raw: str) -> SkillDoc:
+    fm, body, fm_start, fm_end, has_tabs = parse_frontmatter(raw)
+    return SkillDoc(
+        path=path,
+        raw=raw,
+        frontmatter=freeze(fm),
+        body=body,
+        fm_start_line=fm_start,
+        fm_end_line=fm_end,
+        frontmatter_has_tabs=has_tabs,
+        body_lower=body.lower(),
+        headings=tuple((len(m.group(1)), m.group(2).strip()) for m in _HEADING_RE.finditer(body)),
+        h2_blocks=_extract_h2_blocks(body),
+        code_fences=tuple(m.group(1) for m in _CODE_FENCE_RE.finditer(body)),
+        line_starts=_line_starts(raw),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _load_cached(path_str: str, mtime_ns: int, size: int) -> SkillDoc:
+    path = Path(path_str)
+    return build_skill_doc(path, read_text(path))
+
+
+def load_skill_doc(path_like: str) -> SkillDoc:
+    """Load and parse a SKILL.md (or skill dir), memoized by (path, mtime, size)."""
+    path = resolve_skill_md_path(str(path_like))
+    if not path.exists():
+        raise FileNotFoundError(f"SKILL.md not found at: {path}")
+    st = path.stat()
+    return _load_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
+_walk_memo: Optional[Dict[Tuple[str, str], Tuple[Path, ...]]] = None
+
+
+@contextlib.contextmanager
+def shared_walk() -> Iterator[None]:
+    """Memoize `iter_files` listings for the duration of the block."""
+    global _walk_memo
+    outer = _walk_memo
+    if outer is None:
+        _walk_memo = {}
+    try:
+        yield
+    finally:
+        if outer is None:
+            _walk_memo = None
+
+
+def iter_files(skill_dir: Path, rel_dir: str = "") -> List[Path]:
+    """Sorted files under `skill_dir / rel_dir` (the whole skill dir when rel_dir is empty)."""
+    key = (str(skill_dir), rel_dir)
+    if _walk_memo is not None and key in _walk_memo:
+        return list(_walk_memo[key])
+    p = skill_dir / rel_dir if rel_dir else skill_dir
+    files: Tuple[Path, ...] = ()
+    if p.exists() and p.is_dir():
+        files = tuple(sorted(c for c in p.rglob("*") if c.is_file()))
+    if _walk_memo is not None:
+        _walk_memo[key] = files
+    return list(files)
+
+
+def _skip_discovery_dir(name: str) -> bool:
+    return name in {".git", "node_modules", "__pycache__", ".venv", "venv"}
+
+
+def discover_skills(roots: Sequence[str]) -> List[Path]:
+    """
+    Find every SKILL.md under the given roots.
+
+    Symlinked directories are not followed (the flat `skills/` view would
+    otherwise duplicate every skill), and results are de-duplicated by
+    resolved path so overlapping roots are safe.
+    """
+    seen: Dict[str, Path] = {}
+    for root_like in roots:
+        root = Path(root_like).expanduser().resolve()
+        if root.is_file():
+            seen.setdefault(str(root), root)
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if not _skip_discovery_dir(d))
+            if "SKILL.md" in filenames:
+                p = (Path(dirpath) / "SKILL.md").resolve()
+                seen.setdefault(str(p), p)
+    return [seen[k] for k in sorted(seen)]
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+skill_doctor.py
+
+Run skill_gate, analyze_skill and upgrade_skill against each skill in one
+process, loading every SKILL.md (and walking its directory) once.
+
+Usage:
+  python scripts/skill_doctor.py <path/to/skill-dir-or-SKILL.md> [...]
+  python scripts/skill_doctor.py --all [root ...] [--jobs N] --format json|sarif
+
+Exit codes:
+  0  gate passed and analyze score >= --min-pass for every skill
+  1  parsing/IO error (any skill)
+  2  gate failed or score < --min-pass (any skill)
+
+Notes:
+- upgrade_skill suggestions are reported but never fail the run.
+- Gate options and the gate findings cache are the same as skill_gate.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import analyze_skill
+import sarif_report
+import skill_gate
+import upgrade_skill
+from skill_doc import discover_skills, resolve_skill_md_path, shared_walk
+
+
+def doctor_skill(
+    path_like: str,
+    strict_line1: bool,
+    gate_options: Dict[str, Any],
+    min_pass: int,
+    cache_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Load one skill once and run all three analyses. Top-level so it can run in a worker process."""
+    try:
+        doc = skill_gate.load_skill(path_like, strict_line1=strict_line1)
+    except Exception as e:
+        return {
+            "skill": str(resolve_skill_md_path(path_like)),
+            "name": None,
+            "failed": True,
+            "error": str(e),
+        }
+
+    cache = skill_gate.open_cache(cache_path)
+    try:
+        with shared_walk():
+            gate_findings = skill_gate.run_gate(doc, cache=cache, **gate_options)
+            total, max_total, results = analyze_skill.analyze(doc)
+            suggestions = upgrade_skill.generate_suggestions(doc, min_description_len=gate_options["min_desc_len"])
+    finally:
+        if cache is not None:
+            cache.close()
+
+    gate = skill_gate.findings_payload(doc, gate_findings)
+    analysis = analyze_skill.build_machine_payload(doc, results, total, max_total)
+    analysis["passed"] = total >= min_pass
+    return {
+        "skill": str(doc.path),
+        "name": doc.frontmatter.get("name"),
+        "failed": gate["failed"] or not analysis["passed"],
+        "gate": {"failed": gate["failed"], "findings": gate["findings"]},
+        "analyze": analysis,
+        "upgrade": {"suggestions": upgrade_skill.build_machine_payload(suggestions)},
+    }
+
+
+def run_doctor(
+    paths: Sequence[Path],
+    *,
+    strict_line1: bool,
+    gate_options: Dict[str, Any],
+    min_pass: int,
+    jobs: Optional[int],
+    cache_path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    if not paths:
+        return []
+    workers = jobs if jobs and jobs > 0 else (os.cpu_count() or 1)
+    workers = min(workers, len(paths))
+    args = (strict_line1, gate_options, min_pass, cache_path)
+    if workers == 1:
+        return [doctor_skill(str(p), *args) for p in paths]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(doctor_skill, str(p), *args) for p in paths]
+        return [f.result() for f in futures]
+
+
+def _exit_code(results: Sequence[Dict[str, Any]]) -> int:
+    if any(r.get("error") for r in results):
+        return 1
+    if any(r["failed"] for r in results):
+        return 2
+    return 0
+
+
+def build_sarif(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    gate_results: List[Dict[str, Any]] = []
+    analyze_results: List[Dict[str, Any]] = []
+    upgrade_results: List[Dict[str, Any]] = []
+    for r in results:
+        if r.get("error"):
+            gate_results.extend(skill_gate.sarif_results({"skill": r["skill"], "error": r["error"]}))
+            continue
+        gate_results.extend(skill_gate.sarif_results({"skill": r["skill"], **r["gate"]}))
+        analyze_results.extend(analyze_skill.sarif_results(r["analyze"]))
+        upgrade_results.extend(upgrade_skill.sarif_results(Path(r["skill"]), r["upgrade"]["suggestions"]))
+    return sarif_report.sarif_log([
+        sarif_report.sarif_run("skill_gate", gate_results),
+        sarif_report.sarif_run("analyze_skill", analyze_results),
+        sarif_report.sarif_run("upgrade_skill", upgrade_results),
+    ])
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="skill_doctor.py",
+        description="Run gate, analyze and upgrade checks for one or more skills in a single process.",
+    )
+    p.add_argument(
+        "path",
+        nargs="*",
+        help="Path(s) to a skill directory or SKILL.md file. With --all, root directories to search (default: .).",
+    )
+    p.add_argument("--all", action="store_true", help="Discover and check every SKILL.md under the given root(s).")
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for multi-skill runs (default: CPU count; 1 disables the pool).",
+    )
+    p.add_argument("--format", choices=["text", "json", "sarif"], default="text")
+    p.add_argument(
+        "--min-pass",
+        type=int,
+        default=60,
+        help="Fail a skill whose analyze_skill score is below this (default: 60).",
+    )
+    skill_gate.add_gate_arguments(p)
+    return p
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    if args.all:
+        skill_paths = discover_skills(args.path or ["."])
+    elif args.path:
+        skill_paths = [resolve_skill_md_path(p) for p in args.path]
+    else:
+        parser.error("a skill path is required (or use --all)")
+
+    results = run_doctor(
+        skill_paths,
+        strict_line1=args.strict_frontmatter_line1,
+        gate_options=skill_gate.gate_options_from_args(args),
+        min_pass=args.min_pass,
+        jobs=args.jobs,
+        cache_path=skill_gate.cache_path_from_args(args),
+    )
+    rc = _exit_code(results)
+
+    if args.format == "json":
+        print(json.dumps({"failed": rc != 0, "skills": results}, indent=2, ensure_ascii=False))
+    elif args.format == "sarif":
+        print(json.dumps(build_sarif(results), indent=2, ensure_ascii=False))
+    else:
+        for r in results:
+            if r.get("error"):
+                print(f"ERROR {r['skill']}: {r['error']}")
+                continue
+            gate_fails = sum(1 for f in r["gate"]["findings"] if f["level"] == "FAIL")
+            gate_warns = sum(1 for f in r["gate"]["findings"] if f["level"] == "WARN")
+            high = sum(1 for s in r["upgrade"]["suggestions"] if s["priority"] == "HIGH")
+            print(f"{'FAIL' if r['failed'] else 'PASS'} {r.get('name') or 'unknown'} | {r['skill']}")
+            print(f"    gate:    {'FAIL' if r['gate']['failed'] else 'PASS'} ({gate_fails} fail, {gate_warns} warn)")
+            print(f"    analyze: {r['analyze']['total_score']}/{r['analyze']['max_total']}")
+            print(f"    upgrade: {len(r['upgrade']['suggestions'])} suggestion(s), {high} high priority")
+        print(f"\nSkills: {len(results)}")
+        print("RESULT:", "PASS" if rc == 0 else "FAIL")
+
+    return rc
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
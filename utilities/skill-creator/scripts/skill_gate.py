@@ -13,31 +13,56 @@ Enforces:
 
 Usage:
   python scripts/skill_gate.py <path/to/skill-dir-or-SKILL.md>
+  python scripts/skill_gate.py <skill-a> <skill-b> ...
+  python scripts/skill_gate.py --all [root ...] [--jobs N]
+  python scripts/skill_gate.py --all [root ...] --format jsonl|sarif
 
 Exit codes:
   0  pass
-  1  parsing/IO error
+  1  parsing/IO error (any skill, in batch mode)
   2  gate failed (one or more FAIL findings)
 
 Recommended CI:
   python scripts/skill_gate.py ~/dev/agent-skills/skills/<skill-name> --format json
+  python scripts/skill_gate.py --all ~/dev/agent-skills --format json
+
+Caching:
+  Findings are cached in `.cache/skill_gate.sqlite` (override with --cache or
+  SKILL_GATE_CACHE; disable with --no-cache). The key covers SKILL.md, every
+  scanned file, the prompt-pattern + allow/block configs, gate options and this
+  script itself, so any relevant change forces a re-scan.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import re
+import sqlite3
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from enum import IntEnum
 import fnmatch
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import yaml
 
+import sarif_report
+from skill_doc import (
+    SkillDoc,
+    discover_skills,
+    iter_files,
+    load_skill_doc,
+    read_text as _read_text,
+    resolve_skill_md_path as _resolve_skill_md_path,
+    shared_walk,
+)
+
 
 class Level(IntEnum):
     INFO = 1
@@ -53,87 +78,13 @@ class Finding:
     evidence: str = ""
 
 
-@dataclass(frozen=True)
-class SkillDoc:
-    path: Path
-    raw: str
-    frontmatter: Dict[str, Any]
-    body: str
-    fm_start_line: int
-    fm_end_line: int
-
-
-_FM_DELIM = re.compile(r"^\s*---\s*$")
-
-
-def _resolve_skill_md_path(path_like: str) -> Path:
-    p = Path(path_like).expanduser().resolve()
-    return (p / "SKILL.md") if p.is_dir() else p
-
-
-def _read_text(path: Path) -> str:
-    try:
-        return path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        return path.read_text(encoding="utf-8", errors="replace")
-
-
-def _parse_frontmatter(raw: str, strict_line1: bool) -> Tuple[Dict[str, Any], str, int, int]:
-    lines = raw.splitlines(keepends=True)
-    if not lines:
-        raise ValueError("SKILL.md is empty")
-
-    if strict_line1:
-        if not _FM_DELIM.match(lines[0]):
-            raise ValueError("Strict mode: frontmatter must start on line 1 with `---`.")
-        start_idx = 0
-    else:
-        start_idx: Optional[int] = None
-        for i, line in enumerate(lines):
-            if line.strip():
-                start_idx = i
-                break
-        if start_idx is None:
-            raise ValueError("SKILL.md has no content")
-        if not _FM_DELIM.match(lines[start_idx]):
-            raise ValueError("Missing YAML frontmatter. Expected `---` as first non-empty line.")
-
-    end_idx: Optional[int] = None
-    for j in range(start_idx + 1, len(lines)):
-        if _FM_DELIM.match(lines[j]):
-            end_idx = j
-            break
-    if end_idx is None:
-        raise ValueError("Unterminated YAML frontmatter. Missing closing `---`.")
-
-    yaml_text = "".join(lines[start_idx + 1 : end_idx])
-    if "\t" in yaml_text:
-        raise ValueError("Frontmatter YAML must use spaces (tabs found).")
-
-    try:
-        fm_obj = yaml.safe_load(yaml_text)
-    except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML in frontmatter: {e}") from e
-
-    if fm_obj is None:
-        fm: Dict[str, Any] = {}
-    elif isinstance(fm_obj, dict):
-        fm = fm_obj
-    else:
-        raise ValueError("Frontmatter YAML must be a mapping/object.")
-
-    body = "".join(lines[end_idx + 1 :]).lstrip("\n")
-    return fm, body, start_idx + 1, end_idx + 1
-
-
 def load_skill(path_like: str, strict_line1: bool) -> SkillDoc:
-    path = _resolve_skill_md_path(path_like)
-    if not path.exists():
-        raise FileNotFoundError(f"SKILL.md not found at: {path}")
-
-    raw = _read_text(path)
-    fm, body, fm_start, fm_end = _parse_frontmatter(raw, strict_line1=strict_line1)
-    return SkillDoc(path=path, raw=raw, frontmatter=fm, body=body, fm_start_line=fm_start, fm_end_line=fm_end)
+    doc = load_skill_doc(path_like)
+    if strict_line1 and doc.fm_start_line != 1:
+        raise ValueError("Strict mode: frontmatter must start on line 1 with `---`.")
+    if doc.frontmatter_has_tabs:
+        raise ValueError("Frontmatter YAML must use spaces (tabs found).")
+    return doc
 
 
 def _has_any(text: str, needles: Sequence[str]) -> bool:
@@ -154,43 +105,8 @@ def _read_yaml_mapping(path: Path) -> Dict[str, Any]:
     return obj
 
 
-def _extract_h2_blocks(body: str) -> List[Tuple[str, str]]:
-    matches = list(re.finditer(r"(?m)^##\s+(.+?)\s*$", body))
-    blocks: List[Tuple[str, str]] = []
-
-    for i, m in enumerate(matches):
-        title = m.group(1).strip().lower()
-        start = m.end()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(body)
-        section_text = body[start:end].strip()
-        blocks.append((title, section_text))
-    return blocks
-
-
-def _h2_titles(body: str) -> List[str]:
-    return [t for (t, _) in _extract_h2_blocks(body)]
-
-
-def _find_section_text(body: str, aliases: Sequence[str]) -> str:
-    for title, text in _extract_h2_blocks(body):
-        for a in aliases:
-            if a.lower() in title:
-                return text
-    return ""
-
-
-def _code_fence_blocks(body: str) -> List[str]:
-    blocks: List[str] = []
-    for m in re.finditer(r"```[^\n]*\n(.*?)\n```", body, flags=re.DOTALL):
-        blocks.append(m.group(1))
-    return blocks
-
-
 def _iter_files(skill_dir: Path, rel_dir: str) -> List[Path]:
-    p = skill_dir / rel_dir
-    if not p.exists() or not p.is_dir():
-        return []
-    return sorted([c for c in p.rglob("*") if c.is_file()])
+    return iter_files(skill_dir, rel_dir)
 
 
 _TEXT_EXTENSIONS = {
@@ -296,11 +212,80 @@ def _load_allow_block_patterns() -> Tuple[List[re.Pattern[str]], List[Tuple[re.P
     return allowlist, blocklist, findings
 
 
+_STANDALONE_PATTERN_RE = re.compile(r"\\[1-9]|\(\?P=|^\(\?[aiLmsux]+\)")
+
+
+class ScanEngine:
+    """
+    Answer "which of these patterns match anywhere in `text`" with one regex.
+
+    All mergeable patterns are joined into a single alternation of named
+    groups. Each `search` reports the leftmost match and its branch; that branch
+    is then dropped and the search repeats, so a file costs (matched + 1) passes
+    instead of one pass per pattern, and overlapping matches are never hidden by
+    an earlier branch. Patterns using backreferences or leading inline flags
+    cannot be safely renumbered/merged and are searched individually.
+    """
+
+    def __init__(self, patterns: Sequence[re.Pattern[str]]) -> None:
+        self._patterns = list(patterns)
+        self._merged: List[int] = []
+        self._standalone: List[int] = []
+        for idx, pattern in enumerate(self._patterns):
+            if _STANDALONE_PATTERN_RE.search(pattern.pattern):
+                self._standalone.append(idx)
+            else:
+                self._merged.append(idx)
+        self._combined: Dict[frozenset, Optional[re.Pattern[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _combined_for(self, indices: frozenset) -> Optional[re.Pattern[str]]:
+        if indices not in self._combined:
+            source = "|".join(f"(?P<_p{i}>{self._patterns[i].pattern})" for i in sorted(indices))
+            try:
+                compiled: Optional[re.Pattern[str]] = re.compile(source, re.IGNORECASE | re.DOTALL)
+            except re.error:
+                compiled = None
+            self._combined[indices] = compiled
+        return self._combined[indices]
+
+    def matches(self, text: str, candidates: Optional[Sequence[int]] = None) -> List[int]:
+        """Return the sorted indices of `candidates` (default: all) that match `text`."""
+        wanted = set(range(len(self._patterns)) if candidates is None else candidates)
+        found: List[int] = []
+
+        remaining = frozenset(i for i in self._merged if i in wanted)
+        while remaining:
+            combined = self._combined_for(remaining)
+            if combined is None:
+                found.extend(i for i in remaining if self._patterns[i].search(text))
+                break
+            m = combined.search(text)
+            if not m or m.lastgroup is None:
+                break
+            hit = int(m.lastgroup[2:])
+            found.append(hit)
+            remaining = remaining - {hit}
+
+        found.extend(i for i in self._standalone if i in wanted and self._patterns[i].search(text))
+        return sorted(found)
+
+
+_SNIFF_BYTES = 4096
+# Same threshold the skill installer uses to skip large files from its risk scan.
+_DEFAULT_MAX_SCAN_BYTES = 1_000_000
+_SCAN_CHUNK_CHARS = 256 * 1024
+_SCAN_OVERLAP_CHARS = 4096
+
+
 def _is_text_file(path: Path) -> bool:
     if path.suffix.lower() in _TEXT_EXTENSIONS or path.name == "SKILL.md":
         return True
     try:
-        chunk = path.read_bytes()[:4096]
+        with path.open("rb") as fh:
+            chunk = fh.read(_SNIFF_BYTES)
     except OSError:
         return False
     if b"\x00" in chunk:
@@ -312,6 +297,42 @@ def _is_text_file(path: Path) -> bool:
         return False
 
 
+# skill-installer/scripts/install-skill-from-github.py keeps a standalone copy of this.
+def _iter_text_windows(
+    path: Path,
+    *,
+    chunk_chars: int = _SCAN_CHUNK_CHARS,
+    overlap_chars: int = _SCAN_OVERLAP_CHARS,
+) -> Iterator[str]:
+    """
+    Yield a text file as overlapping windows of at most chunk + overlap chars.
+
+    Each window repeats the last `overlap_chars` of the previous one, so any
+    match no longer than the overlap is seen whole in at least one window.
+    """
+    with path.open("r", encoding="utf-8", errors="replace") as fh:
+        tail = ""
+        while True:
+            chunk = fh.read(chunk_chars)
+            if not chunk:
+                return
+            window = tail + chunk
+            yield window
+            tail = window[-overlap_chars:] if overlap_chars else ""
+
+
+def _scan_file_streaming(engine: ScanEngine, path: Path, candidates: Optional[Sequence[int]] = None) -> List[int]:
+    pending = list(range(len(engine)) if candidates is None else candidates)
+    found: List[int] = []
+    for window in _iter_text_windows(path):
+        if not pending:
+            break
+        hits = engine.matches(window, pending)
+        found.extend(hits)
+        pending = [i for i in pending if i not in hits]
+    return sorted(found)
+
+
 def _load_prompt_patterns(
     skill_dir: Path,
 ) -> Tuple[List[Tuple[str, re.Pattern[str], str, str]], List[Finding]]:
@@ -385,9 +406,7 @@ def _is_ignored(path: Path, skill_dir: Path, patterns: Sequence[str]) -> bool:
 def _iter_scan_targets(skill_dir: Path) -> List[Tuple[Path, bool]]:
     ignore_patterns = _load_skillignore(skill_dir)
     targets: List[Tuple[Path, bool]] = []
-    for path in skill_dir.rglob("*"):
-        if not path.is_file():
-            continue
+    for path in iter_files(skill_dir):
         if ".git" in path.parts:
             continue
         if _is_ignored(path, skill_dir, ignore_patterns):
@@ -467,8 +486,7 @@ def check_progressive_disclosure(doc: SkillDoc, *, max_lines: int, max_codeblock
             f"SKILL.md exceeds line budget ({total_lines} > {max_lines}). Move bulk content to references/ and scripts/.",
         ))
 
-    blocks = _code_fence_blocks(doc.body)
-    for i, b in enumerate(blocks, 1):
+    for i, b in enumerate(doc.code_fences, 1):
         blines = _count_lines(b)
         if blines > max_codeblock_lines:
             out.append(Finding(
@@ -483,7 +501,7 @@ def check_progressive_disclosure(doc: SkillDoc, *, max_lines: int, max_codeblock
 
 def check_required_sections(doc: SkillDoc, *, require_philosophy: bool) -> List[Finding]:
     out: List[Finding] = []
-    h2s = _h2_titles(doc.body)
+    h2s = doc.h2_titles
 
     required: Dict[str, List[str]] = {
         "when_to_use": ["when to use", "usage", "triggers", "invocation"],
@@ -527,7 +545,7 @@ def check_required_sections(doc: SkillDoc, *, require_philosophy: bool) -> List[
 def check_workflow_fail_fast(doc: SkillDoc, *, require_fail_fast: bool) -> List[Finding]:
     out: List[Finding] = []
 
-    validation_text = _find_section_text(doc.body, ["validation", "checks", "verify", "gates", "acceptance"])
+    validation_text = doc.find_section_text(["validation", "checks", "verify", "gates", "acceptance"])
     if not validation_text:
         return out
 
@@ -553,7 +571,7 @@ def check_workflow_fail_fast(doc: SkillDoc, *, require_fail_fast: bool) -> List[
 def check_redaction_language(doc: SkillDoc, *, require_redaction: bool) -> List[Finding]:
     out: List[Finding] = []
 
-    constraints_text = _find_section_text(doc.body, ["constraints", "safety"])
+    constraints_text = doc.find_section_text(["constraints", "safety"])
     corpus = constraints_text if constraints_text else doc.body
 
     redaction_signals = [
@@ -581,7 +599,7 @@ def check_redaction_language(doc: SkillDoc, *, require_redaction: bool) -> List[
 def check_schema_version_signal(doc: SkillDoc) -> List[Finding]:
     out: List[Finding] = []
 
-    body = doc.body.lower()
+    body = doc.body_lower
     schema_signals = [
         "output schema", "schema.json", "json schema", "zod", "schema_version", "strict json",
         "machine-checkable", "validator", "contract",
@@ -635,7 +653,7 @@ def check_script_security(skill_dir: Path, doc: SkillDoc) -> List[Finding]:
     if not script_files:
         return out
 
-    body_l = doc.body.lower()
+    body_l = doc.body_lower
     mentions_network = _has_any(body_l, ["network", "internet", "offline", "allow-network", "no network"])
     mentions_confirm = _has_any(body_l, ["--confirm", "--force", "dry-run", "destructive"])
 
@@ -708,7 +726,12 @@ def check_script_security(skill_dir: Path, doc: SkillDoc) -> List[Finding]:
     return out
 
 
-def check_prompt_injection_signals(skill_dir: Path, doc: SkillDoc) -> List[Finding]:
+def check_prompt_injection_signals(
+    skill_dir: Path,
+    doc: SkillDoc,
+    *,
+    max_scan_bytes: int = _DEFAULT_MAX_SCAN_BYTES,
+) -> List[Finding]:
     out: List[Finding] = []
 
     patterns, config_findings = _load_prompt_patterns(skill_dir)
@@ -716,18 +739,24 @@ def check_prompt_injection_signals(skill_dir: Path, doc: SkillDoc) -> List[Findi
     allowlist, blocklist, local_findings = _load_allow_block_patterns()
     out.extend(local_findings)
 
-    def _scan(text: str, evidence: str) -> None:
-        for pattern, message, severity in blocklist:
-            if pattern.search(text):
-                out.append(Finding(Level.WARN, "PI_BLOCKLIST", f"[{severity}] {message}", evidence=evidence))
+    # Blocklist entries first, then prompt patterns, in one engine.
+    engine = ScanEngine([p for p, _, _ in blocklist] + [p for _, p, _, _ in patterns])
+    block_only = list(range(len(blocklist)))
+    n_block = len(blocklist)
 
-        for code, pattern, message, severity in patterns:
-            if any(allow.search(evidence) for allow in allowlist):
-                continue
-            if pattern.search(text):
+    def _report(hits: Sequence[int], evidence: str) -> None:
+        for idx in hits:
+            if idx < n_block:
+                _, message, severity = blocklist[idx]
+                out.append(Finding(Level.WARN, "PI_BLOCKLIST", f"[{severity}] {message}", evidence=evidence))
+            else:
+                code, _, message, severity = patterns[idx - n_block]
                 out.append(Finding(Level.WARN, code, f"[{severity}] {message}", evidence=evidence))
 
-    _scan(doc.raw, "SKILL.md")
+    def _candidates(evidence: str) -> Optional[List[int]]:
+        return block_only if any(allow.search(evidence) for allow in allowlist) else None
+
+    _report(engine.matches(doc.raw, _candidates("SKILL.md")), "SKILL.md")
 
     for path, is_text in _iter_scan_targets(skill_dir):
         rel_path = str(path.relative_to(skill_dir))
@@ -741,7 +770,19 @@ def check_prompt_injection_signals(skill_dir: Path, doc: SkillDoc) -> List[Findi
             continue
         if path.name == "SKILL.md":
             continue
-        _scan(_read_text(path), rel_path)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = -1
+        if max_scan_bytes > 0 and size > max_scan_bytes:
+            out.append(Finding(
+                Level.WARN,
+                "PI_LARGE_FILE_SKIPPED",
+                f"File exceeds scan budget ({size} > {max_scan_bytes} bytes); manual review required (prompt scan skipped).",
+                evidence=rel_path,
+            ))
+            continue
+        _report(_scan_file_streaming(engine, path, _candidates(rel_path)), rel_path)
 
     return out
 
@@ -826,6 +867,139 @@ def check_repo_references(doc: SkillDoc) -> List[Finding]:
     return out
 
 
+_CACHE_SCHEMA_VERSION = 1
+_DEFAULT_CACHE_PATH = ".cache/skill_gate.sqlite"
+
+
+def _sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _optional_file_hash(path: Path) -> str:
+    try:
+        return _sha256_file(path)
+    except OSError:
+        return "absent"
+
+
+class GateCache:
+    """
+    Persistent findings cache keyed on content hashes.
+
+    File hashes are memoized by (path, mtime_ns, size) so unchanged files are
+    not re-read on every run; the findings themselves are keyed on the combined
+    content key from `key_for`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS findings (
+                key TEXT PRIMARY KEY,
+                skill TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                payload TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def file_hash(self, path: Path) -> str:
+        try:
+            st = path.stat()
+        except OSError:
+            return "absent"
+        row = self._conn.execute(
+            "SELECT mtime_ns, size, sha256 FROM file_hashes WHERE path = ?", (str(path),)
+        ).fetchone()
+        if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+            return row[2]
+        digest = _sha256_file(path)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO file_hashes (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+            (str(path), st.st_mtime_ns, st.st_size, digest),
+        )
+        return digest
+
+    def key_for(self, doc: SkillDoc, options: Dict[str, Any]) -> str:
+        skill_dir = doc.path.parent
+        files = [
+            (str(p.relative_to(skill_dir)), self.file_hash(p))
+            for p, _ in _iter_scan_targets(skill_dir)
+        ]
+        # Release the write lock taken by new file_hashes rows right away, so
+        # parallel workers are not blocked and the rows survive a cache hit.
+        self._conn.commit()
+        # check_repo_references lists these dirs without applying .skillignore.
+        listed = [
+            str(p.relative_to(skill_dir))
+            for rel_dir in ("scripts", "references", "assets")
+            for p in _iter_files(skill_dir, rel_dir)
+        ]
+        material = {
+            "schema": _CACHE_SCHEMA_VERSION,
+            "gate": [_optional_file_hash(Path(__file__)), _optional_file_hash(Path(__file__).with_name("skill_doc.py"))],
+            "skill_md": _sha256_bytes(doc.raw.encode("utf-8")),
+            "files": files,
+            "listed": listed,
+            "prompt_patterns": _optional_file_hash(skill_dir / "references" / "prompt-injection-patterns.json"),
+            "allow_block": _optional_file_hash(_local_security_config_path()),
+            "options": options,
+        }
+        return _sha256_bytes(json.dumps(material, sort_keys=True).encode("utf-8"))
+
+    def get(self, key: str) -> Optional[List[Finding]]:
+        row = self._conn.execute("SELECT payload FROM findings WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        return [
+            Finding(Level(item["level"]), item["code"], item["message"], item["evidence"])
+            for item in json.loads(row[0])
+        ]
+
+    def put(self, key: str, skill: Path, findings: Sequence[Finding]) -> None:
+        payload = json.dumps(
+            [{"level": int(f.level), "code": f.code, "message": f.message, "evidence": f.evidence} for f in findings],
+            ensure_ascii=False,
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO findings (key, skill, created_at, payload) VALUES (?, ?, ?, ?)",
+            (key, str(skill), time.time(), payload),
+        )
+        self._conn.commit()
+
+
+def open_cache(cache_path: Optional[str]) -> Optional[GateCache]:
+    if not cache_path:
+        return None
+    try:
+        return GateCache(Path(cache_path).expanduser())
+    except (OSError, sqlite3.Error) as e:
+        print(f"WARN: findings cache disabled ({e}).", file=sys.stderr)
+        return None
+
+
 def _lvl_name(l: Level) -> str:
     return {Level.INFO: "INFO", Level.WARN: "WARN", Level.FAIL: "FAIL"}[l]
 
@@ -841,34 +1015,234 @@ def run_gate(
     require_philosophy: bool,
     require_redaction: bool,
     require_fail_fast: bool,
+    max_scan_bytes: int = _DEFAULT_MAX_SCAN_BYTES,
+    cache: Optional[GateCache] = None,
 ) -> List[Finding]:
-    findings: List[Finding] = []
+    options: Dict[str, Any] = {
+        "max_lines": max_lines,
+        "max_codeblock_lines": max_codeblock_lines,
+        "min_desc_len": min_desc_len,
+        "require_contract": require_contract,
+        "require_evals": require_evals,
+        "require_philosophy": require_philosophy,
+        "require_redaction": require_redaction,
+        "require_fail_fast": require_fail_fast,
+        "max_scan_bytes": max_scan_bytes,
+    }
+    # The cache key and the prompt scan both walk the skill dir; do it once.
+    with shared_walk():
+        cache_key: Optional[str] = None
+        if cache is not None:
+            cache_key = cache.key_for(doc, options)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        findings: List[Finding] = []
+
+        findings.extend(check_codex_frontmatter(doc, min_desc_len=min_desc_len))
+        findings.extend(check_progressive_disclosure(doc, max_lines=max_lines, max_codeblock_lines=max_codeblock_lines))
+        findings.extend(check_required_sections(doc, require_philosophy=require_philosophy))
+        findings.extend(check_workflow_fail_fast(doc, require_fail_fast=require_fail_fast))
+        findings.extend(check_redaction_language(doc, require_redaction=require_redaction))
+        findings.extend(check_schema_version_signal(doc))
+        findings.extend(check_path_safety(doc))
+
+        skill_dir = doc.path.parent
+        findings.extend(check_prompt_injection_signals(skill_dir, doc, max_scan_bytes=max_scan_bytes))
+        findings.extend(check_contract_and_evals(skill_dir, require_contract=require_contract, require_evals=require_evals))
+        findings.extend(check_repo_references(doc))
+
+        findings.sort(key=lambda f: (-int(f.level), f.code))
+        if cache is not None and cache_key is not None:
+            cache.put(cache_key, doc.path, findings)
+        return findings
+
+
+def findings_payload(doc: SkillDoc, findings: Sequence[Finding]) -> Dict[str, Any]:
+    return {
+        "skill": str(doc.path),
+        "name": doc.frontmatter.get("name"),
+        "failed": any(f.level == Level.FAIL for f in findings),
+        "findings": [
+            {"level": _lvl_name(f.level), "code": f.code, "message": f.message, "evidence": f.evidence}
+            for f in findings
+        ],
+    }
 
-    findings.extend(check_codex_frontmatter(doc, min_desc_len=min_desc_len))
-    findings.extend(check_progressive_disclosure(doc, max_lines=max_lines, max_codeblock_lines=max_codeblock_lines))
-    findings.extend(check_required_sections(doc, require_philosophy=require_philosophy))
-    findings.extend(check_workflow_fail_fast(doc, require_fail_fast=require_fail_fast))
-    findings.extend(check_redaction_language(doc, require_redaction=require_redaction))
-    findings.extend(check_schema_version_signal(doc))
-    findings.extend(check_path_safety(doc))
 
-    skill_dir = doc.path.parent
-    findings.extend(check_prompt_injection_signals(skill_dir, doc))
-    findings.extend(check_contract_and_evals(skill_dir, require_contract=require_contract, require_evals=require_evals))
-    findings.extend(check_repo_references(doc))
+def sarif_results(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    skill_md = Path(payload["skill"])
+    if payload.get("error"):
+        return [sarif_report.sarif_result("GATE_LOAD_ERROR", sarif_report.ERROR, payload["error"], skill_md)]
+    levels = {"FAIL": sarif_report.ERROR, "WARN": sarif_report.WARNING, "INFO": sarif_report.NOTE}
+    return [
+        sarif_report.sarif_result(
+            f["code"],
+            levels[f["level"]],
+            f"{f['message']} | {f['evidence']}" if f["evidence"] else f["message"],
+            sarif_report.evidence_path(skill_md, f["evidence"]),
+        )
+        for f in payload["findings"]
+    ]
+
+
+def gate_options_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "max_lines": args.max_lines,
+        "max_codeblock_lines": args.max_codeblock_lines,
+        "min_desc_len": args.min_description_len,
+        "require_contract": not args.no_require_contract,
+        "require_evals": not args.no_require_evals,
+        "require_philosophy": not args.no_require_philosophy,
+        "require_redaction": not args.no_require_redaction,
+        "require_fail_fast": bool(args.require_fail_fast),
+        "max_scan_bytes": args.max_scan_bytes,
+    }
+
+
+def run_gate_cached(doc: SkillDoc, options: Dict[str, Any], cache_path: Optional[str]) -> List[Finding]:
+    """Run the gate through the findings cache, falling back to an uncached scan if the cache fails."""
+    cache = open_cache(cache_path)
+    try:
+        return run_gate(doc, cache=cache, **options)
+    except sqlite3.Error as e:
+        print(f"WARN: findings cache failed for {doc.path} ({e}); scanning uncached.", file=sys.stderr)
+        return run_gate(doc, **options)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def gate_skill_path(
+    path_like: str,
+    strict_line1: bool,
+    options: Dict[str, Any],
+    cache_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Load + gate one skill and return its JSON payload.
+
+    Top-level (picklable) so it can run in a worker process. Load errors are
+    reported in the payload (`error`) instead of raised, so one broken skill
+    does not abort a batch run.
+    """
+    try:
+        doc = load_skill(path_like, strict_line1=strict_line1)
+    except Exception as e:
+        return {
+            "skill": str(_resolve_skill_md_path(path_like)),
+            "name": None,
+            "failed": True,
+            "error": str(e),
+            "findings": [],
+        }
+    return findings_payload(doc, run_gate_cached(doc, options, cache_path))
+
+
+def iter_batch(
+    paths: Sequence[Path],
+    *,
+    strict_line1: bool,
+    options: Dict[str, Any],
+    jobs: Optional[int],
+    cache_path: Optional[str] = None,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Gate many skills across a process pool, yielding (input index, payload) as each skill completes."""
+    if not paths:
+        return
+    workers = jobs if jobs and jobs > 0 else (os.cpu_count() or 1)
+    workers = min(workers, len(paths))
+    if workers == 1:
+        for idx, p in enumerate(paths):
+            yield idx, gate_skill_path(str(p), strict_line1, options, cache_path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(gate_skill_path, str(p), strict_line1, options, cache_path): idx
+            for idx, p in enumerate(paths)
+        }
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+
+
+def run_batch(
+    paths: Sequence[Path],
+    *,
+    strict_line1: bool,
+    options: Dict[str, Any],
+    jobs: Optional[int],
+    cache_path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Gate many skills, fanning out across a process pool. Results keep input order."""
+    results: List[Dict[str, Any]] = [{} for _ in paths]
+    for idx, payload in iter_batch(
+        paths, strict_line1=strict_line1, options=options, jobs=jobs, cache_path=cache_path
+    ):
+        results[idx] = payload
+    return results
+
+
+def _batch_summary(results: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+    return {
+        "total": len(results),
+        "passed": sum(1 for r in results if not r["failed"]),
+        "failed": sum(1 for r in results if r["failed"] and not r.get("error")),
+        "errors": sum(1 for r in results if r.get("error")),
+    }
+
 
-    findings.sort(key=lambda f: (-int(f.level), f.code))
-    return findings
+def _batch_exit_code(results: Sequence[Dict[str, Any]]) -> int:
+    if any(r.get("error") for r in results):
+        return 1
+    if any(r["failed"] for r in results):
+        return 2
+    return 0
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="skill_gate.py", description="Gold-standard gate for Codex SKILL.md quality.")
-    p.add_argument("path", help="Path to a skill directory or SKILL.md file.")
-    p.add_argument("--format", choices=["text", "json"], default="text")
+    p.add_argument(
+        "path",
+        nargs="*",
+        help="Path(s) to a skill directory or SKILL.md file. With --all, root directories to search (default: .).",
+    )
+    p.add_argument("--all", action="store_true", help="Discover and gate every SKILL.md under the given root(s).")
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for multi-skill runs (default: CPU count; 1 disables the pool).",
+    )
+    p.add_argument(
+        "--format",
+        choices=["text", "json", "jsonl", "sarif"],
+        default="text",
+        help="Output format. jsonl streams one line per skill as it completes; sarif emits SARIF 2.1.0.",
+    )
+    add_gate_arguments(p)
+    return p
+
+
+def add_gate_arguments(p: argparse.ArgumentParser) -> None:
+    """Gate tuning + cache flags, shared with skill_doctor.py."""
+    p.add_argument(
+        "--cache",
+        default=None,
+        help=f"Findings cache path (default: $SKILL_GATE_CACHE or {_DEFAULT_CACHE_PATH}).",
+    )
+    p.add_argument("--no-cache", action="store_true", help="Disable the findings cache (always re-scan).")
 
     p.add_argument("--max-lines", type=int, default=500, help="Max allowed lines in SKILL.md (default: 500).")
     p.add_argument("--max-codeblock-lines", type=int, default=120, help="Warn if a code block exceeds this (default: 120).")
     p.add_argument("--min-description-len", type=int, default=120, help="Warn if description shorter than this (default: 120).")
+    p.add_argument(
+        "--max-scan-bytes",
+        type=int,
+        default=_DEFAULT_MAX_SCAN_BYTES,
+        help=f"Skip prompt scanning of files larger than this (default: {_DEFAULT_MAX_SCAN_BYTES}; 0 = no limit).",
+    )
 
     p.add_argument(
         "--strict-frontmatter-line1",
@@ -882,43 +1256,105 @@ def build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--no-require-redaction", action="store_true", help="Do not require redaction language in Constraints/Safety.")
     p.add_argument("--require-fail-fast", action="store_true", help="Require fail-fast language in Validation section (FAIL if absent).")
 
-    return p
+
+def cache_path_from_args(args: argparse.Namespace) -> Optional[str]:
+    if args.no_cache:
+        return None
+    return args.cache or os.environ.get("SKILL_GATE_CACHE") or _DEFAULT_CACHE_PATH
+
+
+def _stream_jsonl(args: argparse.Namespace, skill_paths: Sequence[Path]) -> int:
+    """Print one JSON line per skill as it completes, then a summary line."""
+    results: List[Dict[str, Any]] = []
+    for _, payload in iter_batch(
+        skill_paths,
+        strict_line1=args.strict_frontmatter_line1,
+        options=gate_options_from_args(args),
+        jobs=args.jobs,
+        cache_path=cache_path_from_args(args),
+    ):
+        results.append(payload)
+        print(json.dumps({"type": "skill", **payload}, ensure_ascii=False), flush=True)
+    rc = _batch_exit_code(results)
+    print(json.dumps({"type": "summary", "failed": rc != 0, "summary": _batch_summary(results)}), flush=True)
+    return rc
+
+
+def build_sarif(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    run_results: List[Dict[str, Any]] = []
+    for r in results:
+        run_results.extend(sarif_results(r))
+    return sarif_report.sarif_log([sarif_report.sarif_run("skill_gate", run_results)])
+
+
+def _main_batch(args: argparse.Namespace) -> int:
+    if args.all:
+        skill_paths = discover_skills(args.path or ["."])
+    else:
+        skill_paths = [_resolve_skill_md_path(p) for p in args.path]
+
+    if args.format == "jsonl":
+        return _stream_jsonl(args, skill_paths)
+
+    results = run_batch(
+        skill_paths,
+        strict_line1=args.strict_frontmatter_line1,
+        options=gate_options_from_args(args),
+        jobs=args.jobs,
+        cache_path=cache_path_from_args(args),
+    )
+    rc = _batch_exit_code(results)
+
+    if args.format == "sarif":
+        print(json.dumps(build_sarif(results), indent=2, ensure_ascii=False))
+        return rc
+    if args.format == "json":
+        payload = {
+            "failed": rc != 0,
+            "summary": _batch_summary(results),
+            "skills": results,
+        }
+        print(json.dumps(payload, indent=2, ensure_ascii=False))
+    else:
+        for r in results:
+            if r.get("error"):
+                print(f"ERROR {r['skill']}: {r['error']}")
+                continue
+            fails = sum(1 for f in r["findings"] if f["level"] == "FAIL")
+            warns = sum(1 for f in r["findings"] if f["level"] == "WARN")
+            status = "FAIL" if r["failed"] else "PASS"
+            print(f"{status} {r.get('name') or 'unknown'} ({fails} fail, {warns} warn) | {r['skill']}")
+            for f in r["findings"]:
+                if f["level"] == "FAIL":
+                    ev = f" | {f['evidence']}" if f["evidence"] else ""
+                    print(f"    FAIL {f['code']}: {f['message']}{ev}")
+        print(f"\nSkills: {len(results)}")
+        print("RESULT:", "PASS" if rc == 0 else "FAIL")
+
+    return rc
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
-    args = build_arg_parser().parse_args(argv)
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    if not args.all and not args.path:
+        parser.error("a skill path is required (or use --all)")
+    if args.all or len(args.path) > 1 or args.format in ("jsonl", "sarif"):
+        return _main_batch(args)
 
     try:
-        doc = load_skill(args.path, strict_line1=args.strict_frontmatter_line1)
+        doc = load_skill(args.path[0], strict_line1=args.strict_frontmatter_line1)
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
         return 1
 
-    findings = run_gate(
-        doc,
-        max_lines=args.max_lines,
-        max_codeblock_lines=args.max_codeblock_lines,
-        min_desc_len=args.min_description_len,
-        require_contract=not args.no_require_contract,
-        require_evals=not args.no_require_evals,
-        require_philosophy=not args.no_require_philosophy,
-        require_redaction=not args.no_require_redaction,
-        require_fail_fast=bool(args.require_fail_fast),
-    )
+    findings = run_gate_cached(doc, gate_options_from_args(args), cache_path_from_args(args))
 
     failed = any(f.level == Level.FAIL for f in findings)
 
     if args.format == "json":
-        payload = {
-            "skill": str(doc.path),
-            "name": doc.frontmatter.get("name"),
-            "failed": failed,
-            "findings": [
-                {"level": _lvl_name(f.level), "code": f.code, "message": f.message, "evidence": f.evidence}
-                for f in findings
-            ],
-        }
-        print(json.dumps(payload, indent=2, ensure_ascii=False))
+        print(json.dumps(findings_payload(doc, findings), indent=2, ensure_ascii=False))
     else:
         print(f"Skill: {doc.frontmatter.get('name', 'unknown')}")
         print(f"Path:  {doc.path}\n")
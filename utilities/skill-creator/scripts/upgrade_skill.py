@@ -32,10 +32,13 @@ import textwrap
 from dataclasses import dataclass
 from enum import IntEnum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
 import yaml
 
+import sarif_report
+from skill_doc import SkillDoc, iter_files, load_skill_doc
+
 
 # -----------------------------
 # Data model
@@ -57,112 +60,18 @@ class Suggestion:
     example: str = ""
 
 
-@dataclass(frozen=True)
-class SkillDoc:
-    skill_md_path: Path
-    raw_text: str
-    frontmatter: Dict[str, Any]
-    body: str
-    fm_start_line: int  # 1-indexed
-    fm_end_line: int    # 1-indexed (line containing closing ---)
-
-
 # -----------------------------
-# Frontmatter parsing
+# Parsing
 # -----------------------------
 
-_FRONTMATTER_DELIM_RE = re.compile(r"^\s*---\s*$")
-
-
-def _resolve_skill_md_path(path_like: str) -> Path:
-    p = Path(path_like).expanduser().resolve()
-    if p.is_dir():
-        return p / "SKILL.md"
-    return p
-
-
-def _read_text(path: Path) -> str:
-    try:
-        return path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        return path.read_text(encoding="utf-8", errors="replace")
-
-
-def _parse_frontmatter(raw_text: str, *, path: Path) -> Tuple[Dict[str, Any], str, int, int]:
-    """
-    Parse YAML frontmatter delimited by lines containing only `---`.
-
-    Returns: (frontmatter_dict, body_text, fm_start_line, fm_end_line)
-    """
-    lines = raw_text.splitlines(keepends=True)
-
-    # Find first non-empty line; frontmatter must start there.
-    first_nonempty_idx: Optional[int] = None
-    for i, line in enumerate(lines):
-        if line.strip() != "":
-            first_nonempty_idx = i
-            break
-
-    if first_nonempty_idx is None:
-        raise ValueError("SKILL.md is empty")
-
-    if not _FRONTMATTER_DELIM_RE.match(lines[first_nonempty_idx]):
-        raise ValueError("Missing YAML frontmatter. Expected `---` as the first non-empty line.")
-
-    # Find closing delimiter
-    end_idx: Optional[int] = None
-    for j in range(first_nonempty_idx + 1, len(lines)):
-        if _FRONTMATTER_DELIM_RE.match(lines[j]):
-            end_idx = j
-            break
-
-    if end_idx is None:
-        raise ValueError("Unterminated YAML frontmatter. Missing closing `---`.")
-
-    yaml_text = "".join(lines[first_nonempty_idx + 1 : end_idx])
-    try:
-        fm_obj = yaml.safe_load(yaml_text)
-    except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML in frontmatter: {e}") from e
-
-    if fm_obj is None:
-        fm: Dict[str, Any] = {}
-    elif isinstance(fm_obj, dict):
-        fm = fm_obj
-    else:
-        raise ValueError("Frontmatter YAML must be a mapping/object (key: value pairs).")
-
-    body = "".join(lines[end_idx + 1 :]).lstrip("\n")
-    fm_start_line = first_nonempty_idx + 1  # 1-indexed
-    fm_end_line = end_idx + 1               # 1-indexed
-    return fm, body, fm_start_line, fm_end_line
-
-
 def load_skill(path_like: str) -> SkillDoc:
-    skill_md_path = _resolve_skill_md_path(path_like)
-
-    if not skill_md_path.exists():
-        raise FileNotFoundError(f"SKILL.md not found at: {skill_md_path}")
-
-    raw_text = _read_text(skill_md_path)
-    fm, body, fm_start, fm_end = _parse_frontmatter(raw_text, path=skill_md_path)
-    return SkillDoc(
-        skill_md_path=skill_md_path,
-        raw_text=raw_text,
-        frontmatter=fm,
-        body=body,
-        fm_start_line=fm_start,
-        fm_end_line=fm_end,
-    )
+    return load_skill_doc(path_like)
 
 
 # -----------------------------
 # Heuristics
 # -----------------------------
 
-_H2_RE = re.compile(r"(?m)^##\s+(.+?)\s*$")
-
-
 def _norm(s: str) -> str:
     return re.sub(r"\s+", " ", s.strip().lower())
 
@@ -172,23 +81,16 @@ def _has_any(text: str, needles: Sequence[str]) -> bool:
     return any(n.lower() in t for n in needles)
 
 
-def _extract_h2_headings(body: str) -> List[str]:
-    return [_norm(m.group(1)) for m in _H2_RE.finditer(body)]
-
-
 def _iter_files(skill_dir: Path, rel_dir: str) -> List[Path]:
-    p = skill_dir / rel_dir
-    if not p.exists() or not p.is_dir():
-        return []
-    return sorted([c for c in p.rglob("*") if c.is_file()])
+    return iter_files(skill_dir, rel_dir)
 
 
 def generate_suggestions(doc: SkillDoc, *, min_description_len: int = 120) -> List[Suggestion]:
     fm = doc.frontmatter
     body = doc.body
-    headings = _extract_h2_headings(body)
+    headings = [_norm(t) for t in doc.h2_titles]
 
-    skill_dir = doc.skill_md_path.parent
+    skill_dir = doc.path.parent
 
     suggestions: List[Suggestion] = []
 
@@ -320,7 +222,7 @@ def generate_suggestions(doc: SkillDoc, *, min_description_len: int = 120) -> Li
 
     # Optional metadata.short-description
     metadata = fm.get("metadata")
-    if metadata is None or not isinstance(metadata, dict) or not isinstance(metadata.get("short-description"), str):
+    if metadata is None or not isinstance(metadata, Mapping) or not isinstance(metadata.get("short-description"), str):
         add(
             rule="frontmatter.metadata.short_description",
             category="Frontmatter",
@@ -376,7 +278,7 @@ def generate_suggestions(doc: SkillDoc, *, min_description_len: int = 120) -> Li
         # Anti-patterns check with the original heuristic:
         # - If no anti-pattern wording exists anywhere
         # - AND 'avoid' isn't present in the first 500 chars
-        body_lc = body.lower()
+        body_lc = doc.body_lower
         antipattern_signals = ["anti-pattern", "anti pattern", "anti patterns", "pitfalls", "what to avoid"]
         has_antipattern_anywhere = _has_any(body, antipattern_signals)
         avoid_in_first_500 = "avoid" in body_lc[:500]
@@ -529,7 +431,7 @@ def _priority_icon(p: Priority, *, emoji: bool) -> str:
 def print_text_report(doc: SkillDoc, suggestions: Sequence[Suggestion], *, emoji: bool = True) -> None:
     title = doc.frontmatter.get("name") if isinstance(doc.frontmatter.get("name"), str) else "unknown"
     print(f"\nSkill: {title}")
-    print(f"Path:  {doc.skill_md_path}\n")
+    print(f"Path:  {doc.path}\n")
     print("=" * 78)
 
     if not suggestions:
@@ -570,8 +472,8 @@ def print_text_report(doc: SkillDoc, suggestions: Sequence[Suggestion], *, emoji
     print("")
 
 
-def print_machine_report(suggestions: Sequence[Suggestion], *, fmt: str) -> None:
-    payload = [
+def build_machine_payload(suggestions: Sequence[Suggestion]) -> List[Dict[str, str]]:
+    return [
         {
             "rule": s.rule,
             "category": s.category,
@@ -583,6 +485,25 @@ def print_machine_report(suggestions: Sequence[Suggestion], *, fmt: str) -> None
         for s in suggestions
     ]
 
+
+def sarif_results(skill_md: Path, payload: Sequence[Dict[str, str]]) -> List[Dict[str, Any]]:
+    # Suggestions are advisory, so even HIGH maps to a warning rather than an error.
+    levels = {"HIGH": sarif_report.WARNING, "MEDIUM": sarif_report.NOTE, "LOW": sarif_report.NOTE}
+    return [
+        sarif_report.sarif_result(
+            s["rule"],
+            levels[s["priority"]],
+            s["message"],
+            skill_md,
+            properties={"priority": s["priority"], "category": s["category"]},
+        )
+        for s in payload
+    ]
+
+
+def print_machine_report(suggestions: Sequence[Suggestion], *, fmt: str) -> None:
+    payload = build_machine_payload(suggestions)
+
     if fmt == "json":
         print(json.dumps(payload, indent=2, ensure_ascii=False))
     elif fmt == "yaml":
@@ -17,9 +17,14 @@ import urllib.error
 import urllib.parse
 import zipfile
 from pathlib import Path
+from typing import Iterator
 
 from github_utils import github_request
 DEFAULT_REF = "main"
+MAX_SCAN_BYTES = 1_000_000
+SNIFF_BYTES = 4096
+SCAN_CHUNK_CHARS = 256 * 1024
+SCAN_OVERLAP_CHARS = 4096
 CATEGORIES = {"github", "frontend", "apple", "backend", "product", "utilities"}
 TEXT_EXTENSIONS = {
     ".md",
@@ -79,6 +84,7 @@ class Args:
     name: str | None = None
     method: str = "auto"
     on_warning: str = "prompt"
+    max_scan_bytes: int = MAX_SCAN_BYTES
 
 
 @dataclass
@@ -227,19 +233,13 @@ def _validate_skill(path: str) -> None:
         raise InstallError("SKILL.md not found in selected skill directory.")
 
 
-def _read_text(path: str) -> str:
-    try:
-        return Path(path).read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        return Path(path).read_text(encoding="utf-8", errors="replace")
-
-
 def _is_text_file(path: str) -> bool:
     ext = os.path.splitext(path)[1].lower()
     if os.path.basename(path) == "SKILL.md" or ext in TEXT_EXTENSIONS:
         return True
     try:
-        chunk = Path(path).read_bytes()[:4096]
+        with open(path, "rb") as fh:
+            chunk = fh.read(SNIFF_BYTES)
     except OSError:
         return False
     if b"\x00" in chunk:
@@ -251,6 +251,22 @@ def _is_text_file(path: str) -> bool:
         return False
 
 
+# Mirrors _iter_text_windows in skill-creator/scripts/skill_gate.py. The installer
+# ships as a standalone script (only github_utils alongside it), so it cannot import
+# the gate; keep the two in step.
+def _iter_text_windows(path: str) -> Iterator[str]:
+    """Yield overlapping text windows so matches across chunk boundaries are kept."""
+    with open(path, "r", encoding="utf-8", errors="replace") as fh:
+        tail = ""
+        while True:
+            chunk = fh.read(SCAN_CHUNK_CHARS)
+            if not chunk:
+                return
+            window = tail + chunk
+            yield window
+            tail = window[-SCAN_OVERLAP_CHARS:]
+
+
 def _load_skillignore(root: str) -> list[str]:
     ignore_path = os.path.join(root, ".skillignore")
     if not os.path.isfile(ignore_path):
@@ -367,7 +383,7 @@ def _iter_scan_targets(root: str) -> list[tuple[str, bool]]:
     return targets
 
 
-def _scan_skill_for_risks(skill_path: str) -> list[str]:
+def _scan_skill_for_risks(skill_path: str, *, max_scan_bytes: int = MAX_SCAN_BYTES) -> list[str]:
     warnings: list[str] = []
     patterns, config_warnings = _load_risk_patterns()
     warnings.extend(config_warnings)
@@ -376,8 +392,8 @@ def _scan_skill_for_risks(skill_path: str) -> list[str]:
     for file_path, is_text in _iter_scan_targets(skill_path):
         rel_path = os.path.relpath(file_path, skill_path)
         try:
-            if os.path.getsize(file_path) > 1_000_000:
-                warnings.append(f"{rel_path}: skipped large file (>1MB) from risk scan")
+            if max_scan_bytes > 0 and os.path.getsize(file_path) > max_scan_bytes:
+                warnings.append(f"{rel_path}: skipped large file (>{max_scan_bytes} bytes) from risk scan")
                 continue
         except OSError:
             warnings.append(f"{rel_path}: unable to determine file size for risk scan")
@@ -387,15 +403,24 @@ def _scan_skill_for_risks(skill_path: str) -> list[str]:
             warnings.append(f"{rel_path}: non-text attachment (manual review required)")
             continue
 
-        text = _read_text(file_path)
-        for pattern, message, severity in blocklist:
-            if pattern.search(text):
-                warnings.append(f"{rel_path}: blocklist match - {message} (severity: {severity})")
-        if any(allow.search(rel_path) for allow in allowlist):
-            continue
-        for label, pattern, severity in patterns:
-            if pattern.search(text):
-                warnings.append(f"{rel_path}: {label} (severity: {severity})")
+        pending_block = list(range(len(blocklist)))
+        pending_patterns = [] if any(allow.search(rel_path) for allow in allowlist) else list(range(len(patterns)))
+        block_hits: set[int] = set()
+        pattern_hits: set[int] = set()
+        for window in _iter_text_windows(file_path):
+            if not pending_block and not pending_patterns:
+                break
+            block_hits.update(i for i in pending_block if blocklist[i][0].search(window))
+            pattern_hits.update(i for i in pending_patterns if patterns[i][1].search(window))
+            pending_block = [i for i in pending_block if i not in block_hits]
+            pending_patterns = [i for i in pending_patterns if i not in pattern_hits]
+
+        for i in sorted(block_hits):
+            _, message, severity = blocklist[i]
+            warnings.append(f"{rel_path}: blocklist match - {message} (severity: {severity})")
+        for i in sorted(pattern_hits):
+            label, _, severity = patterns[i]
+            warnings.append(f"{rel_path}: {label} (severity: {severity})")
     return warnings
 
 
@@ -606,6 +631,12 @@ def _parse_args(argv: list[str]) -> Args:
         default="prompt",
         help="Behavior when warnings are detected (prompt, continue, stop).",
     )
+    parser.add_argument(
+        "--max-scan-bytes",
+        type=int,
+        default=MAX_SCAN_BYTES,
+        help=f"Skip risk scanning of files larger than this (default: {MAX_SCAN_BYTES}; 0 = no limit).",
+    )
     return parser.parse_args(argv, namespace=Args())
 
 
@@ -639,7 +670,7 @@ def main(argv: list[str]) -> int:
                     raise InstallError(f"Destination already exists: {dest_dir}")
                 skill_src = os.path.join(repo_root, path)
                 _validate_skill(skill_src)
-                warnings = _scan_skill_for_risks(skill_src)
+                warnings = _scan_skill_for_risks(skill_src, max_scan_bytes=args.max_scan_bytes)
                 if warnings:
                     if not _should_continue_after_warning(
                         warnings,